@@ -0,0 +1,208 @@
+"""
+API load test for IT Asset Management System
+Drives the HTTP API with concurrent keep-alive clients and reports throughput and latency
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# Add the benchmarks directory to the Python path
+sys.path.append(BENCHMARKS_DIR)
+
+from fixtures import fixture_path
+
+# Share of each kind of request in the mix
+DEFAULT_MIX = "search=50,get=30,stats=10,update=10"
+
+# Runs the server with its journal and logs in the scratch directory, like the benchmark suite
+SERVER_BOOTSTRAP = """
+import sys
+from src.utils.change_journal import change_journal
+from src.utils.query_stats import query_stats
+from src.api_server import main
+change_journal.journal_dir = sys.argv[1] + '/journal'
+query_stats.log_dir = sys.argv[1] + '/logs'
+sys.exit(main(sys.argv[2:]))
+"""
+
+def start_server(assets, readers):
+    """
+    Start the API server on a scratch copy of a seeded fixture
+    
+    Returns:
+        subprocess.Popen: The server process
+        str: Base URL of the API
+        str: Scratch directory to remove afterwards
+    """
+    scratch = tempfile.mkdtemp(prefix="api_load_")
+    database = os.path.join(scratch, "assets.db")
+    shutil.copyfile(fixture_path(assets), database)
+    
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER_BOOTSTRAP, scratch,
+         "--database", database, "--port", "0", "--readers", str(readers)],
+        cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        env=dict(os.environ, ITAM_METRICS="0")
+    )
+    for line in server.stderr:
+        if "API listening on " in line:
+            # Keep reading so error output can never fill the pipe and block the server
+            threading.Thread(target=server.stderr.read, daemon=True).start()
+            return server, line.split("API listening on ")[1].strip(), scratch
+    raise RuntimeError("API server did not start")
+
+class Client:
+    def __init__(self, host, port, token=None):
+        """
+        One keep-alive HTTP connection
+        
+        Args:
+            host (str): Server address
+            port (int): Server port
+            token (str, optional): Bearer token sent with every request
+        """
+        self.host = host
+        self.port = port
+        self.token = token
+        self.reader = None
+        self.writer = None
+    
+    async def request(self, method, path, payload=None):
+        """
+        Send a request and read the response
+        
+        Returns:
+            int: HTTP status
+            dict: Decoded JSON body
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+        if self.token:
+            head += f"Authorization: Bearer {self.token}\r\n"
+        self.writer.write(head.encode() + b"\r\n" + body)
+        
+        response_head = (await self.reader.readuntil(b"\r\n\r\n")).decode('latin-1')
+        status = int(response_head.split(" ", 2)[1])
+        length = 0
+        for line in response_head.split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+async def run(base_url, connections, duration, mix, assets, username, password):
+    """
+    Send requests from concurrent connections for a fixed time
+    
+    Returns:
+        dict: kind: list of (status, latency in seconds)
+    """
+    host, port = base_url.split("//")[1].split("/")[0].rsplit(":", 1)
+    port = int(port)
+    
+    login = Client(host, port)
+    status, body = await login.request("POST", "/api/login", {'username': username, 'password': password})
+    login.close()
+    if status != 200:
+        raise RuntimeError(f"Login failed: {body}")
+    token = body['token']
+    
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    results = {kind: [] for kind in kinds}
+    deadline = time.perf_counter() + duration
+    
+    async def worker(seed):
+        rnd = random.Random(seed)
+        client = Client(host, port, token)
+        try:
+            while time.perf_counter() < deadline:
+                kind = rnd.choices(kinds, weights)[0]
+                asset_id = rnd.randint(1, assets)
+                if kind == "search":
+                    request = ("GET", f"/api/assets?status=Active&limit=50&after={rnd.randint(0, assets // 2)}", None)
+                elif kind == "get":
+                    request = ("GET", f"/api/assets/{asset_id}", None)
+                elif kind == "stats":
+                    request = ("GET", "/api/stats?group_by=location", None)
+                else:
+                    request = ("PATCH", f"/api/assets/{asset_id}", {'remarks': f"load test {rnd.random():.6f}"})
+                
+                started = time.perf_counter()
+                status, _ = await client.request(*request)
+                results[kind].append((status, time.perf_counter() - started))
+        finally:
+            client.close()
+    
+    await asyncio.gather(*(worker(seed) for seed in range(connections)))
+    return results
+
+def percentile(values, fraction):
+    """Value below which a fraction of the sorted values fall"""
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+def report(results, duration):
+    """Print requests per second, latency percentiles and failures per kind of request"""
+    print(f"{'request':>10} {'count':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    everything = []
+    for kind, samples in list(results.items()) + [("total", None)]:
+        if samples is None:
+            samples = everything
+        else:
+            everything.extend(samples)
+        latencies = sorted(latency for _, latency in samples)
+        errors = sum(1 for status, _ in samples if status >= 400)
+        print(
+            f"{kind:>10} {len(samples):>8} {len(samples) / duration:>9.1f} "
+            f"{percentile(latencies, 0.5) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f} {errors:>7}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the HTTP API")
+    parser.add_argument("--url", help="Base URL of a running server, e.g. http://127.0.0.1:8080/api "
+                                      "(default: start one on a copy of a seeded fixture)")
+    parser.add_argument("--assets", type=int, default=10000, help="Fixture size, and range of asset IDs requested")
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads of the started server")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 10, 50], help="Concurrent connections to test")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Request mix as kind=weight (default: {DEFAULT_MIX})")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    args = parser.parse_args()
+    
+    mix = {kind: float(weight) for kind, weight in (pair.split("=") for pair in args.mix.split(","))}
+    
+    server = scratch = None
+    base_url = args.url
+    if not base_url:
+        server, base_url, scratch = start_server(args.assets, args.readers)
+    
+    try:
+        for connections in args.connections:
+            print(f"\n{connections} connection(s), {args.duration:g} s against {base_url}")
+            results = asyncio.run(run(base_url, connections, args.duration, mix, args.assets, args.username, args.password))
+            report(results, args.duration)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+            shutil.rmtree(scratch, ignore_errors=True)
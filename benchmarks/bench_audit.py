@@ -0,0 +1,62 @@
+"""
+Audit logging benchmark for IT Asset Management System
+Compares mutations per second with the audit entry written separately
+versus in the same transaction as the asset update
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.database import db_config
+from src.utils.change_journal import change_journal
+from src.models.asset_model import AssetModel
+
+def setup_database(asset_count):
+    """Create a scratch database with a number of assets"""
+    scratch_dir = tempfile.mkdtemp()
+    db_config.db_path = os.path.join(scratch_dir, "bench_audit.db")
+    change_journal.journal_dir = os.path.join(scratch_dir, "journal")
+    db_config.initialize_database()
+    
+    asset_model = AssetModel()
+    for i in range(asset_count):
+        asset_model.add_asset({"serial_number": f"BENCH{i:06d}", "category": "Laptop"})
+
+def run_separate(asset_model, mutations, asset_count):
+    """Update, then log with a second connection and commit (previous behaviour)"""
+    for i in range(mutations):
+        asset_id = i % asset_count + 1
+        asset_model.update_asset(asset_id, {"remarks": f"separate {i}"})
+        asset_model.log_asset_action(asset_id, "update", "Asset updated by bench", 1)
+
+def run_same_transaction(asset_model, mutations, asset_count):
+    """Update and log in a single transaction"""
+    for i in range(mutations):
+        asset_id = i % asset_count + 1
+        asset_model.update_asset(
+            asset_id,
+            {"remarks": f"same {i}"},
+            {"action": "update", "details": "Asset updated by bench", "user_id": 1}
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark audited asset mutations")
+    parser.add_argument("--assets", type=int, default=100, help="Number of assets to spread updates over")
+    parser.add_argument("--mutations", type=int, default=1000, help="Mutations per run")
+    args = parser.parse_args()
+    
+    setup_database(args.assets)
+    asset_model = AssetModel()
+    
+    for name, runner in (("separate", run_separate), ("same transaction", run_same_transaction)):
+        start = time.perf_counter()
+        runner(asset_model, args.mutations, args.assets)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>17}: {args.mutations / elapsed:10.1f} mutations/s")
+    
+    change_journal.flush()
@@ -0,0 +1,73 @@
+"""
+Login throughput benchmark for IT Asset Management System
+Measures authentications per second under concurrent login attempts
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.database import db_config
+from src.utils.change_journal import change_journal
+from src.models.user_model import UserModel
+
+def setup_database(user_count):
+    """Create a scratch database with a number of standard users"""
+    db_config.db_path = os.path.join(tempfile.mkdtemp(), "bench_login.db")
+    change_journal.enabled = False
+    db_config.initialize_database()
+    
+    user_model = UserModel()
+    for i in range(user_count):
+        user_model.add_user({
+            "username": f"user{i}",
+            "password": f"password{i}",
+            "role": "standard",
+            "full_name": f"User {i}"
+        })
+
+def run(threads, attempts, user_count, use_cache):
+    """
+    Run login attempts from a thread pool
+    
+    Returns:
+        float: Successful logins per second
+    """
+    user_model = UserModel()
+    user_model.auth_cache.max_size = max(user_count, 128) if use_cache else 0
+    if not use_cache:
+        user_model.auth_cache.clear()
+    
+    def attempt(i):
+        n = i % user_count
+        return user_model.authenticate(f"user{n}", f"password{n}") is not None
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        succeeded = sum(pool.map(attempt, range(attempts)))
+    elapsed = time.perf_counter() - start
+    
+    user_model.last_login_writer.flush()
+    assert succeeded == attempts, f"only {succeeded}/{attempts} logins succeeded"
+    return attempts / elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent logins")
+    parser.add_argument("--users", type=int, default=20, help="Number of distinct accounts")
+    parser.add_argument("--attempts", type=int, default=80, help="Login attempts per run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="Thread counts to test")
+    args = parser.parse_args()
+    
+    setup_database(args.users)
+    
+    print(f"{'threads':>8} {'cold logins/s':>15} {'cached logins/s':>17}")
+    for threads in args.threads:
+        cold = run(threads, args.attempts, args.users, use_cache=False)
+        run(threads, args.users, args.users, use_cache=True)  # Warm the cache
+        cached = run(threads, args.attempts, args.users, use_cache=True)
+        print(f"{threads:>8} {cold:>15.1f} {cached:>17.1f}")
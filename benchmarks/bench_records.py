@@ -0,0 +1,90 @@
+"""
+Asset record memory benchmark for IT Asset Management System
+Compares the memory held by query results as dicts versus AssetRecord objects
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.database import db_config
+from src.utils.change_journal import change_journal
+from src.models.asset_model import AssetModel
+
+def setup_database(asset_count):
+    """Create a scratch database with a number of fully populated assets"""
+    scratch_dir = tempfile.mkdtemp()
+    db_config.db_path = os.path.join(scratch_dir, "bench_records.db")
+    change_journal.enabled = False
+    db_config.initialize_database()
+    
+    db_config.connect()
+    db_config.cursor.executemany(
+        """
+        INSERT INTO assets (serial_number, company, location, category, status, username, designation,
+                            department, model, description, computer_id, working_status, condition,
+                            employee_id, purchase_date, supplier, estimated_cost, remarks)
+        VALUES (?, 'MICL', 'SS7', 'Laptop', 'Active', ?, 'Engineer', 'IT', 'Latitude 5440',
+                'Standard issue laptop', ?, 'Working', 'Good', ?, '2024-01-15', 'Dell', 1250.0, '')
+        """,
+        ((f"BENCH{i:07d}", f"user{i}", f"PC-{i:07d}", f"E{i:06d}") for i in range(asset_count))
+    )
+    db_config.commit()
+    db_config.close()
+
+def measure(load):
+    """
+    Load all assets and measure what stays allocated
+    
+    Returns:
+        int: Bytes held by the result
+        float: Seconds taken to load
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    assets = load()
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    assert assets
+    return held, elapsed
+
+def load_dicts():
+    """Previous behaviour: one dict per sqlite3.Row"""
+    db_config.connect()
+    try:
+        db_config.cursor.execute("SELECT * FROM assets")
+        return [dict(asset) for asset in db_config.cursor.fetchall()]
+    finally:
+        db_config.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark memory held by asset query results")
+    parser.add_argument("--assets", type=int, default=100000, help="Number of assets to load")
+    args = parser.parse_args()
+    
+    setup_database(args.assets)
+    asset_model = AssetModel()
+    
+    def load_records():
+        """AssetRecord without string sharing"""
+        db_config.connect()
+        try:
+            return asset_model._query_records("SELECT * FROM assets")
+        finally:
+            db_config.close()
+    
+    results = {}
+    for name, load in (("dict", load_dicts), ("AssetRecord", load_records), ("shared", asset_model.get_all_assets)):
+        results[name] = measure(load)
+        held, elapsed = results[name]
+        print(f"{name:>11}: {held / 2**20:8.1f} MiB ({held / args.assets:6.0f} B/asset), loaded in {elapsed:.2f} s")
+    
+    for name in ("AssetRecord", "shared"):
+        print(f"{name + ' saving':>19}: {1 - results[name][0] / results['dict'][0]:6.1%}")
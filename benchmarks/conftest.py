@@ -0,0 +1,77 @@
+"""
+Benchmark suite fixtures for IT Asset Management System
+Points the application at seeded datasets in a scratch directory, without Tk
+"""
+import os
+import sys
+import shutil
+import pytest
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Add the project root and the benchmarks directory to the Python path
+sys.path.append(os.path.dirname(BENCHMARKS_DIR))
+sys.path.append(BENCHMARKS_DIR)
+
+from fixtures import fixture_path
+from src.config.database import db_config
+from src.utils.change_journal import change_journal
+from src.utils.query_stats import query_stats
+from src.utils.metrics import metrics
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--assets", default="1000,10000",
+        help="Comma separated dataset sizes to run every benchmark at (default: 1000,10000)"
+    )
+
+def pytest_generate_tests(metafunc):
+    """Run every benchmark that uses a dataset once per requested size"""
+    if "dataset_size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("assets").split(",")]
+        metafunc.parametrize("dataset_size", sizes, ids=[f"assets={size}" for size in sizes], scope="session")
+
+@pytest.fixture(scope="session")
+def scratch_dir(tmp_path_factory):
+    """Directory for databases, the journal, backups, exports and reports"""
+    path = tmp_path_factory.mktemp("bench")
+    
+    # The journal is part of every write path, so it stays enabled
+    change_journal.journal_dir = str(path / "journal")
+    query_stats.log_dir = str(path / "logs")
+    metrics.log_dir = str(path / "logs")
+    yield path
+    change_journal.flush()
+
+@pytest.fixture(scope="session")
+def dataset_copy(dataset_size, scratch_dir):
+    """Working copy of the seeded fixture shared by read-only benchmarks"""
+    path = scratch_dir / f"assets_{dataset_size}.db"
+    shutil.copyfile(fixture_path(dataset_size), path)
+    return str(path)
+
+@pytest.fixture
+def database(dataset_copy):
+    """Point the application at the shared dataset copy; benchmarks must not modify it"""
+    db_config.db_path = dataset_copy
+    return dataset_copy
+
+@pytest.fixture
+def scratch_database(dataset_size, scratch_dir, request):
+    """Point the application at a private copy of the dataset that may be modified"""
+    path = scratch_dir / f"{request.node.name}.db".replace("/", "_")
+    shutil.copyfile(fixture_path(dataset_size), path)
+    db_config.db_path = str(path)
+    yield str(path)
+    change_journal.flush()
+    os.remove(path)
+
+@pytest.fixture
+def empty_database(scratch_dir, request):
+    """Point the application at a database with the schema and no assets"""
+    path = scratch_dir / f"{request.node.name}.empty.db".replace("/", "_")
+    db_config.db_path = str(path)
+    db_config.initialize_database()
+    yield str(path)
+    change_journal.flush()
+    os.remove(path)
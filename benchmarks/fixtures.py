@@ -0,0 +1,379 @@
+"""
+Benchmark fixtures for IT Asset Management System
+Builds seeded, realistic databases of 10k to 10M assets through a bulk insert path
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.database import DatabaseConfig, LOOKUP_FIELDS
+from src.utils.security import hash_password
+
+# Built fixtures are kept here and reused by later benchmark runs
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.fixtures')
+
+# Password of every generated user
+FIXTURE_PASSWORD = 'benchmark'
+
+# Fixed reference date so the same seed always gives the same data
+AS_OF = datetime(2025, 6, 30, 17, 0, 0)
+
+# Rows generated and inserted per batch; part of the seed's meaning, don't change lightly
+BATCH_SIZE = 10000
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+COMPANIES = ["MICL", "Meraki", "Steel", "SALES", "EDUCATION"]
+LOCATIONS = ["SS7", "SS16", "Majan"]
+CATEGORIES = ["Laptop", "Desktop", "Mobile Device", "Printer", "Network Device", "Server"]
+MODELS = {
+    "Laptop": ["Dell Latitude 5420", "HP EliteBook 840", "Lenovo ThinkPad T14", "MacBook Pro"],
+    "Desktop": ["Dell OptiPlex 7090", "HP EliteDesk 800", "Lenovo ThinkCentre M70q"],
+    "Server": ["Dell PowerEdge R740", "HP ProLiant DL380", "Lenovo ThinkSystem SR650"],
+    "Printer": ["HP LaserJet Pro M404", "Epson WorkForce Pro WF-C5790", "Brother MFC-L8900CDW"],
+    "Network Device": ["Cisco Catalyst 9200", "HP Aruba 2930F", "Ubiquiti UniFi Switch"],
+    "Mobile Device": ["iPhone 13", "Samsung Galaxy S21", "Google Pixel 6"]
+}
+COSTS = {
+    "Laptop": (700, 2500), "Desktop": (500, 1500), "Server": (4000, 15000),
+    "Printer": (200, 1200), "Network Device": (300, 5000), "Mobile Device": (300, 1300)
+}
+SUPPLIERS = ["Dell", "HP", "Lenovo", "Apple", "Cisco", "Samsung", "Epson"]
+DEPARTMENTS = ["IT", "Finance", "HR", "Sales", "Marketing", "Operations"]
+DESIGNATIONS = ["Manager", "Assistant", "Director", "Coordinator", "Specialist", "Analyst", "Engineer"]
+
+# (value, weight) for columns whose mix doesn't depend on the skew settings
+STATUSES = [("Active", 70), ("Stock", 25), ("Attention", 5)]
+ISSUED_SHARE = 70 / 100
+WORKING_STATUSES = [("Working", 85), ("Under Maintenance", 7), ("Not Working", 5), ("Damage", 3)]
+CONDITIONS = [("New", 15), ("Good", 55), ("Fair", 22), ("Poor", 8)]
+ROLES = [("standard", 85), ("view_only", 10), ("document_controller", 4), ("administrator", 1)]
+
+def zipf_weights(count, skew):
+    """
+    Weights for count values where the value of rank r gets 1 / r ** skew
+    
+    Args:
+        count (int): Number of values
+        skew (float): 0 for a uniform mix, 1 for a typical long tail, higher for more skew
+    
+    Returns:
+        list: One weight per value, largest first
+    """
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+def fixture_path(assets, seed=42, **options):
+    """
+    Build a fixture database once and return its path
+    
+    Fixtures are cached in FIXTURE_DIR by their parameters, so every
+    benchmark asking for the same dataset shares one build.
+    
+    Args:
+        assets (int): Number of assets
+        seed (int): Random seed
+        **options: Further build_dataset options
+    
+    Returns:
+        str: Path of the fixture database
+    """
+    name = '-'.join([f"assets{assets}", f"seed{seed}"] + [f"{key}{value}" for key, value in sorted(options.items())])
+    path = os.path.join(FIXTURE_DIR, f"{name}.db")
+    if not os.path.exists(path):
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        
+        # Build under a temporary name so an interrupted build is never reused
+        partial = f"{path}.partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        build_dataset(partial, assets, seed, **options)
+        os.replace(partial, path)
+    return path
+
+def build_dataset(path, assets=10000, seed=42, users=None, logs_per_asset=3.0,
+                  company_skew=1.0, category_skew=1.0, as_of=AS_OF):
+    """
+    Write a realistic dataset into a fresh database file
+    
+    The schema comes from DatabaseConfig; rows then go straight into
+    lookup_values, asset_rows, users, asset_logs and asset_changes with
+    executemany and no per-row commits. Histories are consistent with the
+    assets: issued assets belong to generated users and have a matching
+    issue entry and field changes, and the last change of every field
+    equals its current value.
+    
+    Args:
+        path (str): Database file to create; must not exist
+        assets (int): Number of assets
+        seed (int): Random seed; the same arguments always give the same data
+        users (int, optional): Number of users (default: one per three assets, at least 10)
+        logs_per_asset (float): Average audit entries per asset, including its creation
+        company_skew (float): Zipf skew of assets across companies (0 is uniform)
+        category_skew (float): Zipf skew of assets across categories (0 is uniform)
+        as_of (datetime): Moment the dataset describes; all timestamps are before it
+    
+    Returns:
+        dict: Number of rows written per table
+    
+    Raises:
+        FileExistsError: If the file already exists
+    """
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    
+    users = users or max(10, assets // 3)
+    rnd = random.Random(seed)
+    
+    db = DatabaseConfig(os.path.abspath(path))
+    if not db.initialize_database():
+        raise RuntimeError(f"Could not create the schema in {path}")
+    
+    db.connect()
+    try:
+        db.cursor.execute("PRAGMA journal_mode = OFF")  # A fresh file; nothing to protect yet
+        db.cursor.execute("PRAGMA synchronous = OFF")
+        
+        # Sorting once into fresh indexes beats updating them row by row
+        db.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+        for index in [row['name'] for row in db.cursor.fetchall()]:
+            db.cursor.execute(f"DROP INDEX {index}")
+        
+        lookups = _insert_lookups(db)
+        counts = {'lookup_values': sum(len(values) for values in lookups.values())}
+        counts['users'] = _insert_users(db, rnd, users, as_of)
+        counts.update(_insert_assets(db, rnd, assets, users, lookups, logs_per_asset,
+                                     company_skew, category_skew, as_of))
+        
+        # Continue the change numbering after the numbers assigned above
+        db.cursor.execute("UPDATE asset_change_sequence SET value = (SELECT COALESCE(MAX(change_seq), 0) FROM asset_rows)")
+        db.commit()
+    finally:
+        db.close()
+    
+    # The schema is already current, so initialize_database() would skip the indexes
+    if not db.create_indexes():
+        raise RuntimeError(f"Could not create the indexes in {path}")
+    
+    db.connect()
+    try:
+        db.cursor.execute("ANALYZE")
+        db.commit()
+    finally:
+        db.close()
+    return counts
+
+def _insert_lookups(db):
+    """
+    Insert every lookup value the generator can produce
+    
+    Returns:
+        dict: field: {value: lookup ID}
+    """
+    vocabulary = {
+        'company': COMPANIES,
+        'location': LOCATIONS,
+        'category': CATEGORIES,
+        'status': [value for value, weight in STATUSES],
+        'working_status': [value for value, weight in WORKING_STATUSES],
+        'condition': [value for value, weight in CONDITIONS],
+        'department': DEPARTMENTS,
+        'supplier': SUPPLIERS
+    }
+    db.cursor.executemany(
+        "INSERT OR IGNORE INTO lookup_values (field, value) VALUES (?, ?)",
+        [(field, value) for field in LOOKUP_FIELDS for value in vocabulary[field]]
+    )
+    db.cursor.execute("SELECT id, field, value FROM lookup_values")
+    lookups = {field: {} for field in LOOKUP_FIELDS}
+    for row in db.cursor.fetchall():
+        lookups[row['field']][row['value']] = row['id']
+    return lookups
+
+def _insert_users(db, rnd, count, as_of):
+    """
+    Insert generated users after the default admin
+    
+    Every user gets the same password hash; deriving one per user would
+    dominate the build time. Accounts are created long before as_of.
+    
+    Returns:
+        int: Number of users inserted
+    """
+    password_hash = hash_password(FIXTURE_PASSWORD)
+    roles = rnd.choices([role for role, weight in ROLES], [weight for role, weight in ROLES], k=count)
+    db.cursor.executemany(
+        "INSERT INTO users (username, password, role, email, full_name, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (f"user{i:07d}", password_hash, roles[i], f"user{i:07d}@example.com", f"User {i}",
+             (as_of - timedelta(days=3000)).strftime(TIMESTAMP_FORMAT))
+            for i in range(count)
+        )
+    )
+    return count
+
+def _insert_assets(db, rnd, count, user_count, lookups, logs_per_asset, company_skew, category_skew, as_of):
+    """
+    Generate and insert assets with their audit entries and field changes in batches
+    
+    Returns:
+        dict: Number of rows written to asset_rows, asset_logs and asset_changes
+    """
+    company_weights = zipf_weights(len(COMPANIES), company_skew)
+    category_weights = zipf_weights(len(CATEGORIES), category_skew)
+    
+    # The admin is user 1, generated users follow
+    first_user_id = 2
+    log_id = 0
+    written = {'asset_rows': 0, 'asset_logs': 0, 'asset_changes': 0}
+    
+    for start in range(0, count, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start)
+        
+        # Draw whole columns at once, it is much faster than per-row choices
+        companies = rnd.choices(COMPANIES, company_weights, k=size)
+        categories = rnd.choices(CATEGORIES, category_weights, k=size)
+        statuses = rnd.choices([v for v, w in STATUSES], [w for v, w in STATUSES], k=size)
+        working = rnd.choices([v for v, w in WORKING_STATUSES], [w for v, w in WORKING_STATUSES], k=size)
+        conditions = rnd.choices([v for v, w in CONDITIONS], [w for v, w in CONDITIONS], k=size)
+        
+        assets = []
+        logs = []
+        changes = []
+        for offset in range(size):
+            asset_id = start + offset + 1
+            category = categories[offset]
+            status = statuses[offset]
+            
+            created = as_of - timedelta(days=rnd.uniform(1, 3000))
+            purchase_date = (created - timedelta(days=rnd.randint(0, 60))).strftime('%Y-%m-%d')
+            low, high = COSTS[category]
+            location = rnd.choice(LOCATIONS)
+            
+            events = [(created, 'create', "Asset created by admin", 1, [])]
+            
+            # Location moves make up the rest of the history, each an update with its field change
+            moves = _draw_count(rnd, max(0.0, logs_per_asset - 1 - ISSUED_SHARE))
+            visited = [location]
+            for _ in range(moves):
+                visited.insert(0, rnd.choice([other for other in LOCATIONS if other != visited[0]]))
+            
+            user = department = designation = employee_id = issue_date = None
+            if status == 'Active':
+                user_number = rnd.randrange(user_count)
+                user = f"user{user_number:07d}"
+                department = rnd.choice(DEPARTMENTS)
+                designation = rnd.choice(DESIGNATIONS)
+                employee_id = f"EMP{user_number:07d}"
+                issued = created + (as_of - created) * rnd.uniform(0.01, 0.5)
+                issue_date = issued.strftime('%Y-%m-%d')
+                events.append((
+                    issued, 'move_to_active', f"Asset issued to {user} by admin", 1,
+                    [('status', 'Stock', 'Active'), ('username', None, user), ('department', None, department),
+                     ('designation', None, designation), ('employee_id', None, employee_id),
+                     ('issue_date', None, issue_date)]
+                ))
+            
+            for _ in range(moves):
+                moved = created + (as_of - created) * rnd.uniform(0.01, 0.99)
+                editor = first_user_id + rnd.randrange(user_count)
+                events.append((moved, 'update', "Asset updated by a user", editor, [('location', None, None)]))
+            
+            # Assign the location path to the moves in time order
+            events.sort(key=lambda event: event[0])
+            step = 0
+            for event in events:
+                if event[1] == 'update':
+                    event[4][0] = ('location', visited[step], visited[step + 1])
+                    step += 1
+            
+            updated = events[-1][0]
+            assets.append((
+                asset_id, f"{category[:3].upper()}{asset_id:09d}", lookups['company'][companies[offset]],
+                lookups['location'][location], lookups['category'][category], lookups['status'][status],
+                user, designation, lookups['department'][department] if department else None,
+                rnd.choice(MODELS[category]), f"{category} {asset_id}", issue_date,
+                f"PC-{asset_id:09d}" if category in ("Laptop", "Desktop") else None,
+                lookups['working_status'][working[offset]], lookups['condition'][conditions[offset]],
+                None, employee_id, purchase_date, None, None,
+                f"LPO-{asset_id // 50:07d}", f"INV-{asset_id // 10:08d}", lookups['supplier'][rnd.choice(SUPPLIERS)],
+                round(rnd.uniform(low, high), 2), None,
+                created.strftime(TIMESTAMP_FORMAT), updated.strftime(TIMESTAMP_FORMAT),
+                len(events),  # Every write after the creation bumped the version
+                asset_id  # change_seq, set here so the numbering trigger stays out of the bulk insert
+            ))
+            
+            for when, action, details, user_id, fields in events:
+                # The file is fresh, so log IDs can be assigned up front
+                log_id += 1
+                timestamp = when.strftime(TIMESTAMP_FORMAT)
+                logs.append((log_id, asset_id, action, details, user_id, timestamp))
+                changes.extend(
+                    (asset_id, log_id, field, old_value, new_value, user_id, timestamp)
+                    for field, old_value, new_value in fields
+                )
+        
+        db.cursor.executemany(
+            """
+            INSERT INTO asset_rows (id, serial_number, company_id, location_id, category_id, status_id, username,
+                                    designation, department_id, model, description, issue_date, computer_id,
+                                    working_status_id, condition_id, audit, employee_id, purchase_date,
+                                    rack_tray_number, service_center, lpo_number, invoice_number, supplier_id,
+                                    estimated_cost, remarks, created_at, updated_at, version, change_seq)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            assets
+        )
+        
+        db.cursor.executemany(
+            "INSERT INTO asset_logs (id, asset_id, action, details, user_id, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            logs
+        )
+        db.cursor.executemany(
+            "INSERT INTO asset_changes (asset_id, log_id, field, old_value, new_value, user_id, changed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            changes
+        )
+        
+        written['asset_rows'] += len(assets)
+        written['asset_logs'] += len(logs)
+        written['asset_changes'] += len(changes)
+    
+    return written
+
+def _draw_count(rnd, mean):
+    """Small non-negative count with the given mean (geometric distribution)"""
+    if mean <= 0:
+        return 0
+    keep_going = mean / (1 + mean)
+    count = 0
+    while rnd.random() < keep_going:
+        count += 1
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a seeded benchmark database")
+    parser.add_argument("output", help="Database file to create")
+    parser.add_argument("--assets", type=int, default=10000, help="Number of assets (10k to 10M)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--users", type=int, help="Number of users (default: assets / 3)")
+    parser.add_argument("--logs-per-asset", type=float, default=3.0, help="Average audit entries per asset")
+    parser.add_argument("--company-skew", type=float, default=1.0, help="Zipf skew across companies (0 = uniform)")
+    parser.add_argument("--category-skew", type=float, default=1.0, help="Zipf skew across categories (0 = uniform)")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    counts = build_dataset(
+        args.output, args.assets, args.seed, args.users, args.logs_per_asset,
+        args.company_skew, args.category_skew
+    )
+    elapsed = time.perf_counter() - start
+    
+    for table, rows in counts.items():
+        print(f"{table:>14}: {rows:10d} rows")
+    print(f"Built {args.output} ({os.path.getsize(args.output) / 2**20:.1f} MiB) in {elapsed:.1f} s")
@@ -0,0 +1,54 @@
+"""
+Asset model and controller benchmarks for IT Asset Management System
+"""
+import itertools
+import pytest
+from src.models.asset_model import AssetModel
+from src.controllers.asset_controller import AssetController
+
+ADMIN = {'id': 1, 'username': 'admin', 'role': 'administrator'}
+
+FILTERS = {
+    'none': None,
+    'status': {'status': 'Active'},
+    'company_location': {'company': 'MICL', 'location': 'SS7'},
+    'model_text': {'model': 'Latitude'},
+}
+
+def bench_add_asset(benchmark, scratch_database):
+    controller = AssetController(ADMIN)
+    serials = itertools.count()
+    
+    def add():
+        return controller.add_asset({
+            'serial_number': f"BENCH{next(serials):09d}", 'category': 'Laptop',
+            'company': 'MICL', 'location': 'SS7', 'status': 'Stock'
+        })
+    
+    success, message = benchmark(add)
+    assert success, message
+
+def bench_update_asset(benchmark, scratch_database, dataset_size):
+    controller = AssetController(ADMIN)
+    asset_ids = itertools.cycle(range(1, dataset_size + 1))
+    remarks = itertools.count()
+    
+    def update():
+        # Without a version the controller uses the stored one, like a fresh form
+        return controller.update_asset(next(asset_ids), {'remarks': f"benchmark {next(remarks)}"})
+    
+    success, message = benchmark(update)
+    assert success, message
+
+@pytest.mark.parametrize("name", list(FILTERS))
+def bench_get_all_assets(benchmark, database, name):
+    model = AssetModel()
+    assets = benchmark(model.get_all_assets, FILTERS[name])
+    assert assets or name != 'none'
+
+def bench_get_asset_history(benchmark, database, dataset_size):
+    model = AssetModel()
+    asset_ids = itertools.cycle(range(1, dataset_size + 1, 97))
+    
+    history = benchmark(lambda: model.get_asset_history(next(asset_ids)))
+    assert history
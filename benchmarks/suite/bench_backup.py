@@ -0,0 +1,27 @@
+"""
+Backup and restore benchmarks for IT Asset Management System
+"""
+import os
+import pytest
+from src.models.backup_model import BackupModel
+
+@pytest.fixture
+def backup_model(scratch_database, scratch_dir):
+    """Backup model writing into the scratch directory"""
+    backup_model = BackupModel()
+    backup_model.backup_dir = str(scratch_dir / "backups")
+    os.makedirs(backup_model.backup_dir, exist_ok=True)
+    return backup_model
+
+def bench_create_backup(benchmark, backup_model):
+    success, message = benchmark(backup_model.create_backup)
+    assert success, message
+
+def bench_restore_backup(benchmark, backup_model):
+    success, message = backup_model.create_backup()
+    assert success, message
+    backup_id = backup_model.get_all_backups()[0]['id']
+    
+    # Each restore also snapshots the live file first, as in production
+    success, message = benchmark.pedantic(backup_model.restore_backup, args=(backup_id,), rounds=5)
+    assert success, message
@@ -0,0 +1,46 @@
+"""
+Excel import and export benchmarks for IT Asset Management System
+"""
+import os
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from src.config.database import db_config
+from src.models.asset_model import AssetModel
+from src.controllers.asset_controller import AssetController
+from src.utils.excel_utils import ExcelUtils
+
+ADMIN = {'id': 1, 'username': 'admin', 'role': 'administrator'}
+
+def bench_export_assets_to_excel(benchmark, database, scratch_dir):
+    excel_utils = ExcelUtils()
+    excel_utils.exports_dir = str(scratch_dir)
+    
+    def export():
+        return excel_utils.export_assets_to_excel(AssetModel().get_all_assets(), "bench_export.xlsx")
+    
+    assert os.path.exists(benchmark(export))
+
+def bench_import_assets_from_excel(benchmark, dataset_copy, empty_database, scratch_dir):
+    # Export the dataset once, then import it into the emptied database every round
+    db_config.db_path = dataset_copy
+    excel_utils = ExcelUtils()
+    excel_utils.exports_dir = str(scratch_dir)
+    workbook = excel_utils.export_assets_to_excel(AssetModel().get_all_assets(), "bench_import.xlsx")
+    db_config.db_path = empty_database
+    
+    def empty():
+        db_config.connect()
+        try:
+            db_config.cursor.execute("DELETE FROM asset_rows")
+            db_config.cursor.execute("DELETE FROM asset_logs")
+            db_config.commit()
+        finally:
+            db_config.close()
+    
+    def import_workbook():
+        return ExcelUtils(AssetController(ADMIN)).import_assets_from_excel(workbook)
+    
+    success, message, imported = benchmark.pedantic(import_workbook, setup=empty, rounds=3)
+    assert success and imported, message
@@ -0,0 +1,20 @@
+"""
+Report benchmarks for IT Asset Management System
+"""
+import pytest
+from src.controllers.report_controller import ReportController
+
+REPORT_TYPES = ["asset_list", "depreciation", "ageing", "lifecycle", "warranty", "maintenance"]
+
+@pytest.mark.parametrize("report_type", REPORT_TYPES)
+def bench_generate_report(benchmark, database, scratch_dir, report_type):
+    controller = ReportController()
+    controller.reports_dir = str(scratch_dir)
+    
+    benchmark(controller.generate_report, report_type, None, 'csv')
+
+def bench_summary(benchmark, database):
+    controller = ReportController()
+    
+    summary = benchmark(controller.get_summary, 'company', {'status': 'Active'})
+    assert summary
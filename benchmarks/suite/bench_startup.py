@@ -0,0 +1,22 @@
+"""
+Startup benchmarks for IT Asset Management System
+"""
+import os
+import sys
+import subprocess
+from src.config.database import db_config
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def bench_initialize_current_database(benchmark, scratch_database):
+    # The first call brings the fixture up to date, later launches take the fast path
+    assert db_config.initialize_database()
+    
+    assert benchmark(db_config.initialize_database)
+
+def bench_import_application(benchmark):
+    # A fresh interpreter each round; imports everything the login screen needs, without opening a window
+    command = [sys.executable, "-c", "import src.main"]
+    
+    completed = benchmark.pedantic(subprocess.run, args=(command,), kwargs={'cwd': PROJECT_DIR}, rounds=5)
+    assert completed.returncode == 0
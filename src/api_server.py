@@ -0,0 +1,423 @@
+"""
+API Server for IT Asset Management System
+HTTP JSON API for help desk kiosks and scripts, on top of the controllers
+"""
+import os
+import sys
+import time
+import asyncio
+import secrets
+import argparse
+import threading
+import contextlib
+from functools import partial
+from src.config.database import db_config, ASSET_COLUMNS
+from src.controllers.asset_controller import AssetController
+from src.controllers.report_controller import ReportController
+from src.controllers.backup_controller import BackupController
+from src.models.async_models import AsyncAssetModel, AsyncUserModel, AsyncBackupModel
+from src.utils.authorization import authorization, ASSET_VIEW, REPORT_VIEW, BACKUP_MANAGE
+from src.utils.http_server import HTTPServer, HTTPError
+from src.utils.db_executor import DatabaseExecutor, ExecutorBusyError
+
+API_HOST = os.environ.get('ITAM_API_HOST', '127.0.0.1')
+API_PORT = int(os.environ.get('ITAM_API_PORT', 8080))
+
+# Threads answering read requests, each with its own database connection
+API_READERS = int(os.environ.get('ITAM_API_READERS', 4))
+
+# Threads verifying passwords, apart from the readers so a burst of logins can't stall searches
+API_LOGIN_WORKERS = int(os.environ.get('ITAM_API_LOGIN_WORKERS', 2))
+
+# Logins waiting for a password check before further ones have to wait
+API_MAX_PENDING_LOGINS = 16
+
+# Minutes a login token stays valid without being used
+SESSION_MINUTES = float(os.environ.get('ITAM_API_SESSION_MINUTES', 60))
+
+# Assets per page of search results
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+REPORT_TYPES = ('asset_list', 'depreciation', 'ageing', 'lifecycle', 'warranty', 'maintenance')
+
+# User fields returned to clients (never the password hash)
+USER_FIELDS = ('id', 'username', 'role', 'email', 'full_name')
+
+# Asset columns clients can't set; 'version' is accepted on updates as the version the client loaded
+READ_ONLY_FIELDS = ('id', 'version', 'created_at', 'updated_at')
+
+def status_for(message):
+    """
+    Choose the HTTP status for a failure message from a controller
+    
+    Args:
+        message (str): Message returned with success=False
+    
+    Returns:
+        int: HTTP status code
+    """
+    text = message.lower()
+    if "permission" in text:
+        return 403
+    if "not found" in text:
+        return 404
+    if "already exists" in text or "changed by someone else" in text or text.startswith("asset is not"):
+        return 409
+    if text.startswith(("database error", "backup error", "restore error")):
+        return 500
+    return 400
+
+class APIServer:
+    def __init__(self, host=API_HOST, port=API_PORT, readers=API_READERS, session_minutes=SESSION_MINUTES):
+        """
+        Initialize the API server
+        
+        Requests are parsed on one asyncio event loop. Reads (searches,
+        history, reports) run on a pool of reader threads, each
+        keeping its database connection open between requests. Every
+        change (asset writes, transitions, backups, restores) goes through a
+        queue served by a single writer thread, so SQLite's one-writer lock
+        is never contended between requests of this server. Logins have
+        threads of their own, since password verification is slow by
+        design. All queues are bounded; when one stays full, requests are
+        answered with 503 instead of piling up. Clients log in
+        once and send the token as "Authorization: Bearer <token>"; each
+        request then runs with that user's permissions.
+        
+        Args:
+            host (str): Address to listen on
+            port (int): Port to listen on (0 picks a free port)
+            readers (int): Number of reader threads
+            session_minutes (float): Minutes a token stays valid without being used
+        """
+        self.http = HTTPServer(host, port)
+        self.readers = DatabaseExecutor('api-reader', workers=readers)
+        self.writer = DatabaseExecutor('api-writer', workers=1)
+        self.logins = DatabaseExecutor('api-login', workers=API_LOGIN_WORKERS, max_pending=API_MAX_PENDING_LOGINS)
+        self.assets = AsyncAssetModel(self.readers, self.writer)
+        self.users = AsyncUserModel(self.logins, self.writer)
+        self.backups = AsyncBackupModel(self.readers, self.writer)
+        self.session_seconds = session_minutes * 60
+        
+        # token: [user, expiry time]
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        
+        routes = [
+            ('GET', '/api/health', self.health),
+            ('POST', '/api/login', self.login),
+            ('POST', '/api/logout', self.logout),
+            ('GET', '/api/assets', self.search_assets),
+            ('POST', '/api/assets', self.add_asset),
+            ('GET', '/api/assets/{asset_id:int}', self.get_asset),
+            ('PATCH', '/api/assets/{asset_id:int}', self.update_asset),
+            ('DELETE', '/api/assets/{asset_id:int}', self.delete_asset),
+            ('POST', '/api/assets/{asset_id:int}/issue', self.issue_asset),
+            ('POST', '/api/assets/{asset_id:int}/return', self.return_asset),
+            ('GET', '/api/assets/{asset_id:int}/history', self.get_asset_history),
+            ('GET', '/api/assets/{asset_id:int}/changes', self.get_field_history),
+            ('GET', '/api/serials/{serial_number}', self.get_asset_by_serial),
+            ('GET', '/api/reports/{report_type}', self.generate_report),
+            ('GET', '/api/stats', self.get_summary),
+            ('GET', '/api/backups', self.get_backups),
+            ('POST', '/api/backups', self.create_backup),
+            ('POST', '/api/backups/{backup_id:int}/restore', self.restore_backup),
+        ]
+        for method, pattern, handler in routes:
+            self.http.route(method, pattern, partial(self.call, handler))
+    
+    async def call(self, handler, request):
+        """Run a handler, answering 503 when the database queues are full"""
+        try:
+            return await handler(request)
+        except ExecutorBusyError as e:
+            raise HTTPError(503, str(e))
+    
+    def authenticate(self, request, permission=None):
+        """
+        Get the user a request's bearer token belongs to
+        
+        Args:
+            request (Request): The request
+            permission (str, optional): Permission the user must have
+        
+        Returns:
+            dict: User data
+        
+        Raises:
+            HTTPError: 401 without a valid token, 403 without the permission
+        """
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        now = time.monotonic()
+        with self._sessions_lock:
+            session = self._sessions.get(token) if scheme.lower() == 'bearer' else None
+            if session is None or session[1] < now:
+                self._sessions.pop(token, None)
+                raise HTTPError(401, "Log in first and send the token as 'Authorization: Bearer <token>'")
+            session[1] = now + self.session_seconds
+        
+        user = session[0]
+        if permission and not authorization.has_permission(user, permission):
+            raise HTTPError(403, "You don't have permission for this request")
+        return user
+    
+    def filters(self, request, exclude=()):
+        """
+        Read asset filters from the query string
+        
+        Args:
+            request (Request): The request
+            exclude (tuple): Query parameters that are not filters
+        
+        Returns:
+            dict: field: value
+        
+        Raises:
+            HTTPError: 400 for a parameter that is not an asset column
+        """
+        filters = {}
+        for name, value in request.query.items():
+            if name in exclude:
+                continue
+            if name not in ASSET_COLUMNS:
+                raise HTTPError(400, f"Unknown filter '{name}'")
+            filters[name] = value
+        return filters
+    
+    def result(self, success, message, status=200):
+        """
+        Turn a controller's (success, message) into a response
+        
+        Args:
+            success (bool): Whether the controller succeeded
+            message (str): Message from the controller
+            status (int): HTTP status on success
+        
+        Returns:
+            tuple: (status, payload)
+        
+        Raises:
+            HTTPError: With a status chosen from the message if not successful
+        """
+        if not success:
+            raise HTTPError(status_for(message), message)
+        return status, {'message': message}
+    
+    async def health(self, request):
+        """GET /api/health: liveness check, no login needed"""
+        return {'status': 'ok'}
+    
+    async def login(self, request):
+        """POST /api/login {username, password}: get a token"""
+        data = request.json()
+        if not data.get('username') or not data.get('password'):
+            raise HTTPError(400, "username and password are required")
+        
+        # Password verification is slow by design; it runs on the login threads
+        user = await self.users.authenticate(data['username'], data['password'])
+        if not user:
+            raise HTTPError(401, "Invalid username or password")
+        
+        token = secrets.token_urlsafe(32)
+        with self._sessions_lock:
+            # Drop expired sessions while we are here
+            now = time.monotonic()
+            for expired in [key for key, session in self._sessions.items() if session[1] < now]:
+                del self._sessions[expired]
+            self._sessions[token] = [user, now + self.session_seconds]
+        
+        return {'token': token, 'user': {field: user.get(field) for field in USER_FIELDS}}
+    
+    async def logout(self, request):
+        """POST /api/logout: end the session of the token"""
+        self.authenticate(request)
+        token = request.headers['authorization'].partition(' ')[2]
+        with self._sessions_lock:
+            self._sessions.pop(token, None)
+        return {'message': "Logged out"}
+    
+    async def search_assets(self, request):
+        """GET /api/assets?field=value&limit=&after=: one page of matching assets, in ID order"""
+        user = self.authenticate(request, ASSET_VIEW)
+        try:
+            limit = min(int(request.query.get('limit', PAGE_SIZE)), MAX_PAGE_SIZE)
+            after_id = int(request.query.get('after', 0))
+        except ValueError:
+            raise HTTPError(400, "limit and after must be integers")
+        if limit < 1:
+            raise HTTPError(400, "limit must be at least 1")
+        
+        filters = self.filters(request, exclude=('limit', 'after'))
+        assets = await self.assets.get_assets_page(filters, after_id, limit)
+        
+        # A full page may have more behind it; the client passes next_after as after
+        next_after = assets[-1]['id'] if len(assets) == limit else None
+        return {'items': assets, 'limit': limit, 'next_after': next_after}
+    
+    async def get_asset(self, request):
+        """GET /api/assets/{id}"""
+        self.authenticate(request, ASSET_VIEW)
+        asset = await self.assets.get_asset_by_id(request.params['asset_id'])
+        if not asset:
+            raise HTTPError(404, "Asset not found")
+        return asset
+    
+    async def get_asset_by_serial(self, request):
+        """GET /api/serials/{serial_number}: the asset with a serial number, e.g. from a barcode scanner"""
+        self.authenticate(request, ASSET_VIEW)
+        asset = await self.assets.get_asset_by_serial(request.params['serial_number'])
+        if not asset:
+            raise HTTPError(404, "Asset not found")
+        return asset
+    
+    async def add_asset(self, request):
+        """POST /api/assets {field: value, ...}: create an asset"""
+        user = self.authenticate(request)
+        data = request.json()
+        unknown = [field for field in data if field not in ASSET_COLUMNS or field in READ_ONLY_FIELDS]
+        if unknown:
+            raise HTTPError(400, f"Unknown or read-only field(s): {', '.join(unknown)}")
+        
+        success, message = await self.writer.run(AssetController(user).add_asset, data)
+        return self.result(success, message, 201)
+    
+    async def update_asset(self, request):
+        """PATCH /api/assets/{id} {field: value, ..., version}: change fields, failing if the asset changed since version"""
+        user = self.authenticate(request)
+        data = request.json()
+        unknown = [field for field in data if field not in ASSET_COLUMNS or (field in READ_ONLY_FIELDS and field != 'version')]
+        if unknown:
+            raise HTTPError(400, f"Unknown or read-only field(s): {', '.join(unknown)}")
+        
+        success, message = await self.writer.run(AssetController(user).update_asset, request.params['asset_id'], data)
+        return self.result(success, message)
+    
+    async def delete_asset(self, request):
+        """DELETE /api/assets/{id}"""
+        user = self.authenticate(request)
+        success, message = await self.writer.run(AssetController(user).delete_asset, request.params['asset_id'])
+        return self.result(success, message)
+    
+    async def issue_asset(self, request):
+        """POST /api/assets/{id}/issue {username, department, designation, employee_id, issue_date}: issue from stock"""
+        user = self.authenticate(request)
+        data = request.json()
+        if not data.get('username'):
+            raise HTTPError(400, "username is required")
+        
+        success, message = await self.writer.run(AssetController(user).move_to_active, request.params['asset_id'], data)
+        return self.result(success, message)
+    
+    async def return_asset(self, request):
+        """POST /api/assets/{id}/return {reason}: return to stock"""
+        user = self.authenticate(request)
+        reason = request.json().get('reason')
+        
+        success, message = await self.writer.run(AssetController(user).move_to_stock, request.params['asset_id'], reason)
+        return self.result(success, message)
+    
+    async def get_asset_history(self, request):
+        """GET /api/assets/{id}/history: audit log entries of an asset"""
+        self.authenticate(request, ASSET_VIEW)
+        asset_id = request.params['asset_id']
+        if not await self.assets.get_asset_by_id(asset_id):
+            return {'items': []}
+        return {'items': await self.assets.get_asset_history(asset_id)}
+    
+    async def get_field_history(self, request):
+        """GET /api/assets/{id}/changes?field=&since=&until=: field-level changes of an asset, newest first"""
+        self.authenticate(request, ASSET_VIEW)
+        query = request.query
+        changes = await self.assets.get_field_changes(
+            request.params['asset_id'], query.get('field'), query.get('since'), query.get('until')
+        )
+        return {'items': changes}
+    
+    async def generate_report(self, request):
+        """GET /api/reports/{type}?field=value: report rows (nothing is saved; the CLI and desktop app export files)"""
+        user = self.authenticate(request, REPORT_VIEW)
+        report_type = request.params['report_type']
+        if report_type not in REPORT_TYPES:
+            raise HTTPError(404, f"Unknown report '{report_type}', expected one of {', '.join(REPORT_TYPES)}")
+        
+        _, report_data = await self.readers.run(
+            ReportController(user).generate_report, report_type, self.filters(request), None
+        )
+        return {'items': report_data}
+    
+    async def get_summary(self, request):
+        """GET /api/stats?group_by=category&field=value: asset counts and costs per group"""
+        user = self.authenticate(request, REPORT_VIEW)
+        group_by = request.query.get('group_by', 'category')
+        filters = self.filters(request, exclude=('group_by',))
+        
+        # Summaries come from the asset snapshot, which holds only the columns analysts group by
+        try:
+            summary = await self.readers.run(ReportController(user).get_summary, group_by, filters)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        return {'items': summary}
+    
+    async def get_backups(self, request):
+        """GET /api/backups"""
+        self.authenticate(request, BACKUP_MANAGE)
+        return {'items': await self.backups.get_all_backups()}
+    
+    async def create_backup(self, request):
+        """POST /api/backups"""
+        user = self.authenticate(request, BACKUP_MANAGE)
+        success, message = await self.writer.run(BackupController(user).create_backup)
+        return self.result(success, message, 201)
+    
+    async def restore_backup(self, request):
+        """POST /api/backups/{id}/restore: replace the database with a backup"""
+        user = self.authenticate(request, BACKUP_MANAGE)
+        success, message = await self.writer.run(BackupController(user).restore_backup, request.params['backup_id'])
+        return self.result(success, message)
+    
+    async def serve(self):
+        """Serve requests until cancelled"""
+        await self.http.start()
+        print(f"API listening on http://{self.http.host}:{self.http.port}/api", file=sys.stderr)
+        try:
+            await self.http.serve_forever()
+        finally:
+            self.close()
+    
+    def close(self):
+        """Stop listening and finish queued reads and writes"""
+        self.http.close()
+        self.readers.shutdown()
+        self.writer.shutdown()
+        self.logins.shutdown()
+
+def main(argv=None):
+    """
+    Run the API server until interrupted
+    
+    Args:
+        argv (list, optional): Arguments without the program name (default: sys.argv[1:])
+    
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.api_server", description="IT Asset Management System HTTP API")
+    parser.add_argument("--host", default=API_HOST, help=f"Address to listen on (default: {API_HOST})")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"Port to listen on (default: {API_PORT})")
+    parser.add_argument("--readers", type=int, default=API_READERS, help=f"Reader threads (default: {API_READERS})")
+    parser.add_argument("--database", help="Database file (default: assets.db in the application folder)")
+    args = parser.parse_args(argv)
+    
+    if args.database:
+        db_config.db_path = os.path.abspath(args.database)
+    if not db_config.initialize_database():
+        return 1
+    
+    server = APIServer(args.host, args.port, args.readers)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
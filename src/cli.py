@@ -0,0 +1,340 @@
+"""
+Command Line Interface for IT Asset Management System
+Headless entry point for scripted imports, exports, reports, backups and searches
+"""
+import os
+import sys
+import csv
+import json
+import getpass
+import argparse
+import contextlib
+from src.config.database import db_config, ASSET_COLUMNS, FILTER_FIELDS
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_DENIED = 3  # --user could not be authenticated
+
+# Assets read per query while streaming search results
+SEARCH_PAGE_SIZE = 1000
+
+REPORT_TYPES = ('asset_list', 'depreciation', 'ageing', 'lifecycle', 'warranty', 'maintenance')
+
+def parse_filters(pairs):
+    """
+    Turn --filter field=value options into a filters dictionary
+    
+    Args:
+        pairs (list): Strings of the form field=value
+    
+    Returns:
+        dict: field: value
+    
+    Raises:
+        argparse.ArgumentTypeError: If a pair is malformed or names an unknown field
+    """
+    filters = {}
+    for pair in pairs or ():
+        field, separator, value = pair.partition('=')
+        if not separator or field not in ASSET_COLUMNS:
+            raise argparse.ArgumentTypeError(f"invalid filter '{pair}', expected field=value with an asset field")
+        filters[field] = value
+    return filters
+
+def authenticate(args):
+    """
+    Log in as the user given with --user
+    
+    The password is read from the ITAM_PASSWORD environment variable, or
+    prompted for. Without --user, commands run without a user like the
+    scheduled backup does: permission checks are skipped and changes are
+    not attributed in the audit log.
+    
+    Args:
+        args: Parsed command line arguments
+    
+    Returns:
+        dict: User data, None when no user was given
+    
+    Raises:
+        PermissionError: If authentication fails
+    """
+    if not args.user:
+        return None
+    
+    from src.controllers.user_controller import UserController
+    
+    password = os.environ.get('ITAM_PASSWORD')
+    if password is None:
+        try:
+            password = getpass.getpass(f"Password for {args.user}: ")
+        except EOFError:
+            raise PermissionError("No password given; set ITAM_PASSWORD when running unattended")
+    
+    user = UserController().login(args.user, password)
+    if not user:
+        raise PermissionError("Invalid username or password")
+    return user
+
+def write_rows(rows, columns, output_format, stream):
+    """
+    Stream rows to a file as CSV or JSON lines, one row at a time
+    
+    Args:
+        rows (iterable): Mappings with the columns as keys
+        columns (list): Columns to write, in order
+        output_format (str): 'csv' or 'jsonl'
+        stream: Text stream to write to
+    
+    Returns:
+        int: Number of rows written
+    """
+    count = 0
+    if output_format == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row[column] for column in columns])
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps({column: row[column] for column in columns}, default=str) + "\n")
+            count += 1
+    return count
+
+def iter_assets(asset_controller, filters, page_size=SEARCH_PAGE_SIZE):
+    """
+    Yield the assets matching filters in ID order, one page at a time
+    
+    Only one page is held in memory, and the first rows can be written
+    while later pages have not been read yet.
+    
+    Args:
+        asset_controller (AssetController): Controller to search with
+        filters (dict): Search filters
+        page_size (int): Assets read per query
+    
+    Yields:
+        Asset records (read-only, dict-like)
+    """
+    after_id = 0
+    while True:
+        page = asset_controller.search_assets_page(filters, after_id, page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        after_id = page[-1]['id']
+
+def command_search(args, user, output):
+    """Write the assets matching the filters to the output"""
+    from src.controllers.asset_controller import AssetController
+    
+    filters = parse_filters(args.filter)
+    if args.text:
+        filters['serial_number'] = args.text
+    
+    columns = args.columns.split(',') if args.columns else list(ASSET_COLUMNS)
+    unknown = [column for column in columns if column not in ASSET_COLUMNS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown column(s): {', '.join(unknown)}")
+    
+    assets = iter_assets(AssetController(user), filters)
+    count = write_rows(assets, columns, args.format, output)
+    print(f"{count} assets", file=sys.stderr)
+    return EXIT_OK
+
+def command_export(args, user, output):
+    """Export the assets matching the filters to an Excel file"""
+    from src.controllers.asset_controller import AssetController
+    from src.utils.excel_utils import ExcelUtils
+    
+    asset_controller = AssetController(user)
+    assets = asset_controller.search_assets(parse_filters(args.filter))
+    if not assets:
+        print("No assets match the filters", file=sys.stderr)
+        return EXIT_FAILED
+    
+    output = os.path.abspath(args.output) if args.output else None
+    path = ExcelUtils(asset_controller).export_assets_to_excel(assets, output)
+    print(f"Exported {len(assets)} assets to {path}", file=sys.stderr)
+    return EXIT_OK
+
+def command_import(args, user, output):
+    """Import assets from an Excel file, reporting each rejected row as it happens; fails if any row is rejected"""
+    from src.controllers.asset_controller import AssetController
+    from src.utils.excel_utils import ExcelUtils
+    
+    if not os.path.isfile(args.file):
+        print(f"File not found: {args.file}", file=sys.stderr)
+        return EXIT_FAILED
+    
+    rejected = []
+    
+    def progress(row_num, success, message):
+        if not success:
+            rejected.append(row_num)
+            print(f"Row {row_num}: {message}", file=sys.stderr, flush=True)
+        elif args.verbose:
+            print(f"Row {row_num}: {message}", file=sys.stderr, flush=True)
+    
+    excel_utils = ExcelUtils(AssetController(user))
+    success, message, _ = excel_utils.import_assets_from_excel(os.path.abspath(args.file), progress)
+    
+    # Rejected rows were already reported one by one
+    print(message.split("\n")[0], file=sys.stderr)
+    return EXIT_OK if success and not rejected else EXIT_FAILED
+
+def command_report(args, user, output):
+    """Generate a report file"""
+    from src.controllers.report_controller import ReportController
+    
+    report_controller = ReportController(user)
+    if args.output_dir:
+        report_controller.reports_dir = os.path.abspath(args.output_dir)
+        os.makedirs(report_controller.reports_dir, exist_ok=True)
+    
+    report_path, report_data = report_controller.generate_report(args.type, parse_filters(args.filter), 'csv')
+    if not report_path:
+        print("No report generated: no matching assets or no permission to run reports", file=sys.stderr)
+        return EXIT_FAILED
+    
+    print(f"Report with {len(report_data)} rows written to {report_path}", file=sys.stderr)
+    return EXIT_OK
+
+def command_stats(args, user, output):
+    """Write asset counts and costs per group to the output"""
+    from src.controllers.report_controller import ReportController
+    
+    # Summaries come from the asset snapshot, which holds only the columns analysts group by
+    try:
+        summary = ReportController(user).get_summary(args.group_by, parse_filters(args.filter))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    write_rows(summary, [args.group_by, 'count', 'total_cost', 'average_cost'], args.format, output)
+    return EXIT_OK
+
+def command_backup(args, user, output):
+    """Create a backup, or list the existing ones"""
+    from src.controllers.backup_controller import BackupController
+    
+    backup_controller = BackupController(user)
+    if args.list:
+        columns = ['id', 'filename', 'created_at', 'size', 'status']
+        write_rows(backup_controller.get_all_backups(), columns, args.format, output)
+        return EXIT_OK
+    
+    success, message = backup_controller.create_backup()
+    print(message, file=sys.stderr)
+    return EXIT_OK if success else EXIT_FAILED
+
+def command_restore(args, user, output):
+    """Restore the database from a backup"""
+    from src.controllers.backup_controller import BackupController
+    
+    if not args.yes:
+        print("Restoring overwrites the current database; pass --yes to confirm", file=sys.stderr)
+        return EXIT_USAGE
+    
+    success, message = BackupController(user).restore_backup(args.backup_id)
+    print(message, file=sys.stderr)
+    return EXIT_OK if success else EXIT_FAILED
+
+def build_parser():
+    """
+    Build the argument parser with one subcommand per operation
+    
+    Returns:
+        argparse.ArgumentParser: The parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="IT Asset Management System without the desktop window",
+        epilog="Data (search, stats and backup --list rows) is written to standard output and nothing else is; "
+               "messages, progress and errors go to standard error, so the output can be piped into other tools."
+    )
+    parser.add_argument("--database", help="Database file (default: assets.db in the application folder)")
+    parser.add_argument("--user", help="Run as this user, with their permissions (password from ITAM_PASSWORD or a prompt)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    filter_help = "Filter as field=value, e.g. company=MICL (repeatable)"
+    
+    search = subparsers.add_parser("search", help="Write matching assets to standard output")
+    search.add_argument("text", nargs="?", help="Serial number or part of it")
+    search.add_argument("--filter", action="append", help=filter_help)
+    search.add_argument("--columns", help="Comma-separated columns (default: all)")
+    search.add_argument("--format", choices=('csv', 'jsonl'), default='csv')
+    search.set_defaults(handler=command_search)
+    
+    export = subparsers.add_parser("export", help="Export matching assets to an Excel file")
+    export.add_argument("--filter", action="append", help=filter_help)
+    export.add_argument("--output", help="Excel file to write (default: a new file in the exports folder)")
+    export.set_defaults(handler=command_export)
+    
+    import_parser = subparsers.add_parser("import", help="Import assets from an Excel file")
+    import_parser.add_argument("file", help="Excel file in the import template layout")
+    import_parser.add_argument("--verbose", action="store_true", help="Also report rows that were imported")
+    import_parser.set_defaults(handler=command_import)
+    
+    report = subparsers.add_parser("report", help="Generate a CSV report")
+    report.add_argument("type", choices=REPORT_TYPES)
+    report.add_argument("--filter", action="append", help=filter_help)
+    report.add_argument("--output-dir", help="Folder for the report (default: the reports folder)")
+    report.set_defaults(handler=command_report)
+    
+    stats = subparsers.add_parser("stats", help="Write asset counts and costs per group")
+    stats.add_argument("--group-by", default='category', help=f"Column to group by, e.g. {', '.join(FILTER_FIELDS)}")
+    stats.add_argument("--filter", action="append", help=filter_help)
+    stats.add_argument("--format", choices=('csv', 'jsonl'), default='csv')
+    stats.set_defaults(handler=command_stats)
+    
+    backup = subparsers.add_parser("backup", help="Back up the database")
+    backup.add_argument("--list", action="store_true", help="List the existing backups instead")
+    backup.add_argument("--format", choices=('csv', 'jsonl'), default='csv')
+    backup.set_defaults(handler=command_backup)
+    
+    restore = subparsers.add_parser("restore", help="Restore the database from a backup")
+    restore.add_argument("backup_id", type=int, help="ID shown by 'backup --list'")
+    restore.add_argument("--yes", action="store_true", help="Confirm that the current database is overwritten")
+    restore.set_defaults(handler=command_restore)
+    
+    return parser
+
+def main(argv=None):
+    """
+    Run one command
+    
+    Args:
+        argv (list, optional): Arguments without the program name (default: sys.argv[1:])
+    
+    Returns:
+        int: Exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.database:
+        db_config.db_path = os.path.abspath(args.database)
+    
+    # Keep standard output for data: commands write rows to output, and anything
+    # printed along the way (including by the layers below them) goes to standard error
+    output = sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            if not db_config.initialize_database():
+                return EXIT_FAILED
+            user = authenticate(args)
+            return args.handler(args, user, output)
+    except PermissionError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_DENIED
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        # Output piped into a command that stopped reading, such as head
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
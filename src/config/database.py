@@ -4,19 +4,128 @@ Handles database connection and initialization
 """
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from src.utils.query_stats import query_stats, TimedConnection
+
+# Low-cardinality asset columns stored as IDs into lookup_values
+LOOKUP_FIELDS = ('company', 'location', 'category', 'status', 'working_status', 'condition', 'department', 'supplier')
+
+# Lookup columns offered as filters, indexed together so the values in use
+# and their counts come from a single index scan
+FILTER_FIELDS = ('status', 'category', 'company', 'location', 'working_status')
+
+# Columns of the assets view, in the order of the original assets table
+ASSET_COLUMNS = (
+    'id', 'serial_number', 'company', 'location', 'category', 'status', 'username', 'designation',
+    'department', 'model', 'description', 'issue_date', 'computer_id', 'working_status', 'condition',
+    'audit', 'employee_id', 'purchase_date', 'rack_tray_number', 'service_center', 'lpo_number',
+    'invoice_number', 'supplier', 'estimated_cost', 'remarks', 'created_at', 'updated_at', 'version'
+)
+
+# Stored in PRAGMA user_version once initialize_database() has brought a
+# database up to date; raise it whenever the schema below changes
+SCHEMA_VERSION = 3
+
+def lookup_column(column):
+    """
+    Get the asset_rows column that stores an assets column
+    
+    Args:
+        column (str): Column name as seen in the assets view
+    
+    Returns:
+        str: The column name, with _id appended for lookup columns
+    """
+    return f"{column}_id" if column in LOOKUP_FIELDS else column
 
 class DatabaseConfig:
     def __init__(self, db_path="assets.db"):
         """Initialize database configuration with path to database file"""
         self.db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), db_path)
-        self.connection = None
-        self.cursor = None
+        
+        # Each thread (Tk main loop, backup scheduler, workers) gets its own connection
+        self._local = threading.local()
+        self._pool_condition = threading.Condition()
+        self._open_connections = 0
+        self._quiesced = False
+        
+        # Connections kept open between requests by pool threads, while not in use
+        self._idle_connections = set()
+        
+        # Long-lived connection used only to notice commits from any connection or process
+        self._monitor = None
+        self._monitor_path = None
+        self._monitor_generation = 0
+    
+        # Timing of every statement run on the connections handed out here
+        self.query_stats = query_stats
+    
+    @property
+    def connection(self):
+        """Connection owned by the calling thread, or None"""
+        return getattr(self._local, 'connection', None)
+    
+    @connection.setter
+    def connection(self, value):
+        self._local.connection = value
+    
+    @property
+    def cursor(self):
+        """Cursor owned by the calling thread, or None"""
+        return getattr(self._local, 'cursor', None)
+    
+    @cursor.setter
+    def cursor(self, value):
+        self._local.cursor = value
+    
+    def reuse_connections(self):
+        """
+        Keep the calling thread's connection open between connect() and close()
+        
+        For long-lived pool threads such as the API server's readers and
+        writer: every new connection has to parse the schema again before
+        its first statement, which costs more than a typical lookup. Kept
+        connections are closed when the database is quiesced for a restore
+        and reopened on the next connect().
+        """
+        self._local.reuse = True
     
     def connect(self):
         """Establish connection to the database"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            with self._pool_condition:
+                # Hold new connections back while the database file is being swapped
+                while self._quiesced:
+                    self._pool_condition.wait()
+                
+                # Don't leak a connection this thread forgot to close
+                if self.connection is not None:
+                    self._release_connection()
+                
+                kept = getattr(self._local, 'kept', None)
+                if kept is not None:
+                    self._local.kept = None
+                    connection, path = kept
+                    if connection in self._idle_connections:
+                        self._idle_connections.discard(connection)
+                        if path == self.db_path:
+                            self.connection = connection
+                        else:
+                            connection.close()
+                            self._open_connections -= 1
+                
+                if self.connection is None:
+                    # Kept connections may be closed by whichever thread quiesces the database
+                    shared = getattr(self._local, 'reuse', False)
+                    if self.query_stats.enabled:
+                        self.connection = sqlite3.connect(self.db_path, factory=TimedConnection, check_same_thread=not shared)
+                        self.connection.stats = self.query_stats
+                    else:
+                        self.connection = sqlite3.connect(self.db_path, check_same_thread=not shared)
+                    self._open_connections += 1
+            
             self.connection.row_factory = sqlite3.Row  # Enable row factory for named columns
             self.cursor = self.connection.cursor()
             return True
@@ -27,19 +136,335 @@ class DatabaseConfig:
     def close(self):
         """Close the database connection"""
         if self.connection:
-            self.connection.close()
+            with self._pool_condition:
+                self._release_connection()
+                self._pool_condition.notify_all()
+    
+    def _release_connection(self):
+        """Close this thread's connection, or keep it for reuse (caller holds the pool condition)"""
+        if getattr(self._local, 'reuse', False) and not self._quiesced:
+            # Never hand a half-finished transaction to the next request
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            self._idle_connections.add(self.connection)
+            self._local.kept = (self.connection, self.db_path)
+            self.connection = None
+            self.cursor = None
+            return
+        
+        self.connection.close()
+        self.connection = None
+        self.cursor = None
+        self._open_connections -= 1
+    
+    @contextmanager
+    def quiesce(self, timeout=30):
+        """
+        Block new connections and wait for every open connection to close
+        
+        Used while the database file is replaced on disk. The calling thread
+        must not hold a connection of its own.
+        
+        Args:
+            timeout (float): Seconds to wait for open connections to drain
+        
+        Raises:
+            TimeoutError: If connections are still open after the timeout
+        """
+        with self._pool_condition:
+            while self._quiesced:
+                self._pool_condition.wait()
+            self._quiesced = True
+            
+            # Connections kept by idle pool threads would never close by themselves
+            for connection in self._idle_connections:
+                connection.close()
+                self._open_connections -= 1
+            self._idle_connections.clear()
+            
+            if not self._pool_condition.wait_for(lambda: self._open_connections == 0, timeout):
+                self._quiesced = False
+                self._pool_condition.notify_all()
+                raise TimeoutError(f"{self._open_connections} database connection(s) still open")
+            
+            # The monitor must not keep the old file open across a swap
+            self._close_monitor()
+        
+        try:
+            yield
+        finally:
+            with self._pool_condition:
+                self._quiesced = False
+                self._pool_condition.notify_all()
+    
+    def data_version(self):
+        """
+        Get a token that changes whenever the database is committed to
+        
+        Covers commits from this process and from other processes, as well
+        as the file being replaced by a restore.
+        
+        Returns:
+            tuple: (generation, PRAGMA data_version) to compare against a previous token
+        """
+        with self._pool_condition:
+            while self._quiesced:
+                self._pool_condition.wait()
+            
+            if self._monitor is None or self._monitor_path != self.db_path:
+                self._close_monitor()
+                self._monitor = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._monitor_path = self.db_path
+                self._monitor_generation += 1
+            
+            return self._monitor_generation, self._monitor.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _close_monitor(self):
+        """Close the data version monitor (caller holds the pool condition)"""
+        if self._monitor is not None:
+            self._monitor.close()
+            self._monitor = None
     
     def commit(self):
         """Commit changes to the database"""
         if self.connection:
             self.connection.commit()
     
+    def _add_column(self, table, column, definition):
+        """
+        Add a column to an existing table unless it is already there
+        
+        Args:
+            table (str): Table name
+            column (str): Column name
+            definition (str): Column type and constraints
+        """
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        if column not in {row['name'] for row in self.cursor.fetchall()}:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    
+    def _lookup_id(self, field, value):
+        """SQL expression for the lookup_values ID of a field's value"""
+        return f"(SELECT id FROM lookup_values WHERE field = '{field}' AND value = {value})"
+    
+    def _migrate_assets_table(self):
+        """
+        Move a plain assets table into asset_rows and lookup_values
+        
+        Runs once, in the initialization transaction; IDs, versions and the
+        AUTOINCREMENT sequence carry over unchanged.
+        """
+        self.cursor.execute("SELECT type FROM sqlite_master WHERE name = 'assets'")
+        existing = self.cursor.fetchone()
+        if not existing or existing['type'] != 'table':
+            return
+        
+        # Row version for optimistic concurrency (older databases lack it)
+        self._add_column('assets', 'version', 'INTEGER NOT NULL DEFAULT 1')
+        
+        for field in LOOKUP_FIELDS:
+            self.cursor.execute(f"""
+            INSERT OR IGNORE INTO lookup_values (field, value)
+            SELECT DISTINCT '{field}', {field} FROM assets WHERE {field} IS NOT NULL
+            """)
+        
+        columns = [lookup_column(column) for column in ASSET_COLUMNS]
+        values = [
+            self._lookup_id(column, f"a.{column}") if column in LOOKUP_FIELDS else f"a.{column}"
+            for column in ASSET_COLUMNS
+        ]
+        self.cursor.execute(
+            f"INSERT INTO asset_rows ({', '.join(columns)}) SELECT {', '.join(values)} FROM assets a"
+        )
+        
+        # Don't hand out IDs of assets deleted before the migration again
+        self.cursor.execute("""
+        UPDATE sqlite_sequence
+        SET seq = MAX(seq, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'assets'), 0))
+        WHERE name = 'asset_rows'
+        """)
+        
+        self.cursor.execute("DROP TABLE assets")
+    
+    def _create_assets_view(self):
+        """
+        Create the assets view and the triggers that make it writable
+        
+        The application writes asset_rows directly; the triggers serve
+        journal replay and anything else that still writes to assets.
+        """
+        select = ', '.join(
+            f"{column}_lookup.value AS {column}" if column in LOOKUP_FIELDS else f"a.{column}"
+            for column in ASSET_COLUMNS
+        )
+        joins = ' '.join(
+            f"LEFT JOIN lookup_values {field}_lookup ON {field}_lookup.id = a.{field}_id"
+            for field in LOOKUP_FIELDS
+        )
+        self.cursor.execute(f"CREATE VIEW IF NOT EXISTS assets AS SELECT {select} FROM asset_rows a {joins}")
+        
+        # Add lookup values the new row uses without ever replacing existing ones
+        new_values = ' UNION ALL '.join(f"SELECT '{field}' AS field, NEW.{field} AS value" for field in LOOKUP_FIELDS)
+        add_lookups = f"""
+            INSERT INTO lookup_values (field, value)
+            SELECT n.field, n.value FROM ({new_values}) n
+            WHERE n.value IS NOT NULL
+            AND NOT EXISTS (SELECT 1 FROM lookup_values l WHERE l.field = n.field AND l.value = n.value);
+        """
+        values = {
+            column: self._lookup_id(column, f"NEW.{column}") if column in LOOKUP_FIELDS else f"NEW.{column}"
+            for column in ASSET_COLUMNS
+        }
+        values['created_at'] = "COALESCE(NEW.created_at, CURRENT_TIMESTAMP)"
+        values['updated_at'] = "COALESCE(NEW.updated_at, CURRENT_TIMESTAMP)"
+        values['version'] = "COALESCE(NEW.version, 1)"
+        
+        self.cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS assets_insert INSTEAD OF INSERT ON assets
+        BEGIN
+            {add_lookups}
+            INSERT INTO asset_rows ({', '.join(lookup_column(column) for column in values)})
+            VALUES ({', '.join(values.values())});
+        END
+        """)
+        self.cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS assets_update INSTEAD OF UPDATE ON assets
+        BEGIN
+            {add_lookups}
+            UPDATE asset_rows
+            SET {', '.join(f"{lookup_column(column)} = {value}" for column, value in values.items())}
+            WHERE id = OLD.id;
+        END
+        """)
+        self.cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS assets_delete INSTEAD OF DELETE ON assets
+        BEGIN
+            DELETE FROM asset_rows WHERE id = OLD.id;
+        END
+        """)
+    
+    def _create_change_sequence(self):
+        """
+        Create the asset change counter and the triggers that stamp rows with it
+        
+        Every insert or update of asset_rows, from the application, the
+        assets view or any other tool, takes the next number from a single
+        counter and stores it in change_seq. SQLite admits one writer at a
+        time, so numbers become visible in order: a reader that has seen
+        everything up to N gets every later change with change_seq > N, no
+        matter how long a transaction took to commit. Writers may set
+        change_seq themselves (bulk loaders do); the counter must then be
+        raised past it.
+        """
+        self._add_column('asset_rows', 'change_seq', 'INTEGER')
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS asset_change_sequence (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            value INTEGER NOT NULL
+        )
+        ''')
+        
+        # Number rows from before the counter existed
+        self.cursor.execute("UPDATE asset_rows SET change_seq = id WHERE change_seq IS NULL")
+        self.cursor.execute('''
+        INSERT OR IGNORE INTO asset_change_sequence (id, value)
+        VALUES (1, (SELECT COALESCE(MAX(change_seq), 0) FROM asset_rows))
+        ''')
+        
+        stamp = '''
+            UPDATE asset_change_sequence SET value = value + 1;
+            UPDATE asset_rows SET change_seq = (SELECT value FROM asset_change_sequence) WHERE id = NEW.id;
+        '''
+        self.cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS asset_rows_insert_sequence AFTER INSERT ON asset_rows
+        WHEN NEW.change_seq IS NULL
+        BEGIN
+            {stamp}
+        END
+        ''')
+        self.cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS asset_rows_update_sequence AFTER UPDATE ON asset_rows
+        WHEN NEW.change_seq IS OLD.change_seq
+        BEGIN
+            {stamp}
+        END
+        ''')
+    
+    def _create_indexes(self):
+        """Create the secondary indexes that are missing, on the open connection"""
+        # Index change times and change numbers for incremental readers such as the asset snapshot
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_assets_updated_at
+        ON asset_rows (updated_at)
+        ''')
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_asset_rows_change_seq
+        ON asset_rows (change_seq)
+        ''')
+        self.cursor.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_asset_rows_filters
+        ON asset_rows ({', '.join(lookup_column(field) for field in FILTER_FIELDS)})
+        ''')
+        
+        # Index the audit log for history lookups and archiving by age
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_asset_logs_asset_time
+        ON asset_logs (asset_id, timestamp)
+        ''')
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_asset_logs_timestamp
+        ON asset_logs (timestamp)
+        ''')
+        
+        # Index field history by asset and by field, both ordered by time
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_asset_changes_asset_field
+        ON asset_changes (asset_id, field, changed_at)
+        ''')
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_asset_changes_field_time
+        ON asset_changes (field, changed_at)
+        ''')
+    
+    def create_indexes(self):
+        """
+        Create any missing secondary index, whatever the schema version
+        
+        For bulk loaders that drop the indexes before inserting and rebuild
+        them afterwards; initialize_database() would skip them on a database
+        that is already at SCHEMA_VERSION.
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.connect():
+            return False
+        
+        try:
+            self._create_indexes()
+            self.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+        finally:
+            self.close()
+    
     def initialize_database(self):
-        """Create database tables if they don't exist"""
+        """
+        Create database tables if they don't exist
+        
+        A database already at SCHEMA_VERSION is left alone, so an ordinary
+        launch reads one pragma instead of running every statement below.
+        """
         if not self.connect():
             return False
         
         try:
+            self.cursor.execute("PRAGMA user_version")
+            if self.cursor.fetchone()[0] == SCHEMA_VERSION:
+                return True
+            
             # Create users table
             self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -54,24 +479,35 @@ class DatabaseConfig:
             )
             ''')
             
-            # Create assets table with all required fields from the specification
+            # Reference data for the low-cardinality asset columns
+            self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS lookup_values (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                UNIQUE (field, value)
+            )
+            ''')
+            
+            # Create the asset rows with all required fields from the specification;
+            # lookup columns hold an ID into lookup_values instead of the text
             self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS assets (
+            CREATE TABLE IF NOT EXISTS asset_rows (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 serial_number TEXT UNIQUE NOT NULL,
-                company TEXT,
-                location TEXT,
-                category TEXT NOT NULL,
-                status TEXT,
+                company_id INTEGER REFERENCES lookup_values (id),
+                location_id INTEGER REFERENCES lookup_values (id),
+                category_id INTEGER NOT NULL REFERENCES lookup_values (id),
+                status_id INTEGER REFERENCES lookup_values (id),
                 username TEXT,
                 designation TEXT,
-                department TEXT,
+                department_id INTEGER REFERENCES lookup_values (id),
                 model TEXT,
                 description TEXT,
                 issue_date DATE,
                 computer_id TEXT,
-                working_status TEXT,
-                condition TEXT,
+                working_status_id INTEGER REFERENCES lookup_values (id),
+                condition_id INTEGER REFERENCES lookup_values (id),
                 audit TEXT,
                 employee_id TEXT,
                 purchase_date DATE,
@@ -79,14 +515,26 @@ class DatabaseConfig:
                 service_center TEXT,
                 lpo_number TEXT,
                 invoice_number TEXT,
-                supplier TEXT,
+                supplier_id INTEGER REFERENCES lookup_values (id),
                 estimated_cost REAL,
                 remarks TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                version INTEGER NOT NULL DEFAULT 1,
+                change_seq INTEGER
             )
             ''')
             
+            # Databases from before the lookup tables keep a plain assets table
+            self._migrate_assets_table()
+            
+            # The assets view presents the rows with their text values, so
+            # existing queries (reports, exports, recovery) keep working
+            self._create_assets_view()
+            
+            # Number every asset write, so incremental readers can tell exactly what changed
+            self._create_change_sequence()
+            
             # Create asset_logs table for history and audits
             self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS asset_logs (
@@ -101,6 +549,31 @@ class DatabaseConfig:
             )
             ''')
             
+            # Create asset_changes table for field-level history
+            self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS asset_changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                asset_id INTEGER NOT NULL,
+                log_id INTEGER,
+                field TEXT NOT NULL,
+                old_value,
+                new_value,
+                user_id INTEGER,
+                changed_at TIMESTAMP NOT NULL,
+                FOREIGN KEY (asset_id) REFERENCES assets (id),
+                FOREIGN KEY (log_id) REFERENCES asset_logs (id),
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+            ''')
+            
+            # Changes were once stamped with local time; both tables are in UTC, so take their entry's time
+            self.cursor.execute('''
+            UPDATE asset_changes
+            SET changed_at = (SELECT timestamp FROM asset_logs WHERE asset_logs.id = asset_changes.log_id)
+            WHERE log_id IN (SELECT id FROM asset_logs)
+              AND changed_at IS NOT (SELECT timestamp FROM asset_logs WHERE asset_logs.id = asset_changes.log_id)
+            ''')
+            
             # Create backups table to track backup history
             self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS backups (
@@ -113,17 +586,23 @@ class DatabaseConfig:
             )
             ''')
             
-            # Insert default admin user if not exists
-            # Hash the default password using SHA-256
-            import hashlib
-            default_password = 'admin123'
-            hashed_password = hashlib.sha256(default_password.encode()).hexdigest()
+            self._create_indexes()
             
-            self.cursor.execute('''
-            INSERT OR IGNORE INTO users (username, password, role, email, full_name)
-            VALUES (?, ?, ?, ?, ?)
-            ''', ('admin', hashed_password, 'administrator', 'admin@example.com', 'System Administrator'))
+            # Insert default admin user if not exists
+            # Only hash when inserting, key derivation is deliberately slow
+            self.cursor.execute("SELECT id FROM users WHERE username = 'admin'")
+            if not self.cursor.fetchone():
+                from src.utils.security import hash_password
+                default_password = 'admin123'
+                hashed_password = hash_password(default_password)
+                
+                self.cursor.execute('''
+                INSERT OR IGNORE INTO users (username, password, role, email, full_name)
+                VALUES (?, ?, ?, ?, ?)
+                ''', ('admin', hashed_password, 'administrator', 'admin@example.com', 'System Administrator'))
             
+            # Written last, so an interrupted initialization runs again in full
+            self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             self.commit()
             print("Database initialized successfully")
             return True
@@ -2,7 +2,10 @@
 Asset Controller for IT Asset Management System
 Handles business logic for asset operations
 """
-from src.models.asset_model import AssetModel
+from src.models.asset_model import AssetModel, field_diff
+from src.utils.authorization import (
+    authorization, ASSET_CREATE, ASSET_MOVE, ASSET_DELETE
+)
 
 class AssetController:
     def __init__(self, current_user=None):
@@ -14,6 +17,27 @@ class AssetController:
         """
         self.asset_model = AssetModel()
         self.current_user = current_user
+        self.authorization = authorization
+    
+    def _log_entry(self, action, details):
+        """
+        Build the audit entry for an action by the current user
+        
+        Args:
+            action (str): Type of action performed
+            details (str): Details of the action
+        
+        Returns:
+            dict: Audit entry, or None when no user is logged in
+        """
+        if not self.current_user:
+            return None
+        
+        return {'action': action, 'details': details, 'user_id': self.current_user.get('id')}
+    
+    def _username(self):
+        """Name of the current user for audit messages"""
+        return self.current_user.get('username') if self.current_user else None
     
     def add_asset(self, asset_data):
         """
@@ -32,20 +56,15 @@ class AssetController:
             if not asset_data.get(field):
                 return False, f"Missing required field: {field}"
         
-        # Add the asset
-        success, message = self.asset_model.add_asset(asset_data)
-        
-        # Log the action if successful
-        if success and self.current_user:
-            asset_id = int(message.split(':')[-1].strip())
-            self.asset_model.log_asset_action(
-                asset_id, 
-                'create', 
-                f"Asset created by {self.current_user.get('username')}", 
-                self.current_user.get('id')
-            )
+        # Check if user has permission to add assets
+        if self.current_user and not self.authorization.has_permission(self.current_user, ASSET_CREATE):
+            return False, "You don't have permission to add assets"
         
-        return success, message
+        # Add the asset and its audit entry in one transaction
+        return self.asset_model.add_asset(
+            asset_data,
+            self._log_entry('create', f"Asset created by {self._username()}")
+        )
     
     def update_asset(self, asset_id, asset_data):
         """
@@ -53,7 +72,7 @@ class AssetController:
         
         Args:
             asset_id (int): ID of the asset to update
-            asset_data (dict): Updated asset data
+            asset_data (dict): Updated asset data, optionally with the 'version' it was loaded at
         
         Returns:
             bool: True if successful, False otherwise
@@ -64,19 +83,28 @@ class AssetController:
         if not existing_asset:
             return False, "Asset not found"
         
-        # Update the asset
-        success, message = self.asset_model.update_asset(asset_id, asset_data)
-        
-        # Log the action if successful
-        if success and self.current_user:
-            self.asset_model.log_asset_action(
-                asset_id, 
-                'update', 
-                f"Asset updated by {self.current_user.get('username')}", 
-                self.current_user.get('id')
-            )
+        # Check if user may change these fields (document controllers have a restricted set)
+        if self.current_user and not self.authorization.can_update_asset_fields(self.current_user, asset_data.keys()):
+            return False, "You don't have permission to update these asset fields"
         
-        return success, message
+        # The version the caller loaded, or the one the diff below is based on
+        asset_data = dict(asset_data)
+        expected_version = asset_data.pop('version', None)
+        if expected_version in (None, ''):
+            expected_version = existing_asset.get('version')
+        try:
+            expected_version = int(expected_version)
+        except (TypeError, ValueError):
+            return False, "Invalid version"
+        
+        # Update the asset, log the action and record the changed fields in one transaction
+        return self.asset_model.update_asset(
+            asset_id,
+            asset_data,
+            self._log_entry('update', f"Asset updated by {self._username()}"),
+            field_diff(existing_asset, asset_data),
+            expected_version
+        )
     
     def delete_asset(self, asset_id):
         """
@@ -95,20 +123,14 @@ class AssetController:
             return False, "Asset not found"
         
         # Check if user has permission to delete
-        if self.current_user and self.current_user.get('role') != 'administrator':
+        if self.current_user and not self.authorization.has_permission(self.current_user, ASSET_DELETE):
             return False, "You don't have permission to delete assets"
         
-        # Log the action before deleting
-        if self.current_user:
-            self.asset_model.log_asset_action(
-                asset_id, 
-                'delete', 
-                f"Asset deleted by {self.current_user.get('username')}", 
-                self.current_user.get('id')
-            )
-        
-        # Delete the asset
-        return self.asset_model.delete_asset(asset_id)
+        # Log the action and delete the asset in one transaction
+        return self.asset_model.delete_asset(
+            asset_id,
+            self._log_entry('delete', f"Asset deleted by {self._username()}")
+        )
     
     def get_asset(self, asset_id):
         """
@@ -122,6 +144,18 @@ class AssetController:
         """
         return self.asset_model.get_asset_by_id(asset_id)
     
+    def get_assets(self, asset_ids):
+        """
+        Get several assets by ID
+        
+        Args:
+            asset_ids (list): IDs of the assets to retrieve
+        
+        Returns:
+            list: Asset records in the order of asset_ids
+        """
+        return self.asset_model.get_assets_by_ids(asset_ids)
+    
     def get_asset_by_serial(self, serial_number):
         """
         Get an asset by serial number
@@ -134,6 +168,27 @@ class AssetController:
         """
         return self.asset_model.get_asset_by_serial(serial_number)
     
+    def get_cache_stats(self):
+        """
+        Get hit and miss statistics of the asset lookup cache
+        
+        Returns:
+            dict: hits, misses, hit_rate, size and max_size
+        """
+        return self.asset_model.cache.stats()
+    
+    def get_filter_values(self, fields):
+        """
+        Get the values in use for filter columns, with the number of assets having each
+        
+        Args:
+            fields (tuple): Filter columns such as ('company', 'status')
+        
+        Returns:
+            dict: field: list of (value, count) pairs sorted by value
+        """
+        return self.asset_model.lookups.get_value_counts(fields)
+    
     def search_assets(self, filters=None):
         """
         Search for assets with filters
@@ -146,6 +201,20 @@ class AssetController:
         """
         return self.asset_model.get_all_assets(filters)
     
+    def search_assets_page(self, filters=None, after_id=0, limit=100):
+        """
+        Search for assets with filters, one page at a time
+        
+        Args:
+            filters (dict, optional): Search filters
+            after_id (int): Last asset ID of the previous page (0 for the first page)
+            limit (int): Maximum number of assets on the page
+        
+        Returns:
+            list: Matching assets in ID order
+        """
+        return self.asset_model.get_assets_page(filters, after_id, limit)
+    
     def get_active_assets(self):
         """
         Get all active (issued) assets
@@ -176,14 +245,9 @@ class AssetController:
             bool: True if successful, False otherwise
             str: Message indicating success or error
         """
-        # Check if the asset exists
-        asset = self.asset_model.get_asset_by_id(asset_id)
-        if not asset:
-            return False, "Asset not found"
-        
-        # Check if the asset is in stock
-        if asset.get('status') != 'Stock':
-            return False, "Asset is not in stock"
+        # Check if user has permission to issue assets
+        if self.current_user and not self.authorization.has_permission(self.current_user, ASSET_MOVE):
+            return False, "You don't have permission to move assets"
         
         # Update asset data
         update_data = {
@@ -195,19 +259,14 @@ class AssetController:
             'issue_date': user_data.get('issue_date')
         }
         
-        # Update the asset
-        success, message = self.asset_model.update_asset(asset_id, update_data)
-        
-        # Log the action if successful
-        if success and self.current_user:
-            self.asset_model.log_asset_action(
-                asset_id, 
-                'move_to_active', 
-                f"Asset issued to {user_data.get('username')} by {self.current_user.get('username')}", 
-                self.current_user.get('id')
-            )
-        
-        return success, message
+        # Issue only if still in stock, and log the action in the same transaction
+        return self.asset_model.transition_asset(
+            asset_id,
+            'Stock',
+            update_data,
+            self._log_entry('move_to_active', f"Asset issued to {user_data.get('username')} by {self._username()}"),
+            "Asset is not in stock"
+        )
     
     def move_to_stock(self, asset_id, reason=None):
         """
@@ -221,14 +280,9 @@ class AssetController:
             bool: True if successful, False otherwise
             str: Message indicating success or error
         """
-        # Check if the asset exists
-        asset = self.asset_model.get_asset_by_id(asset_id)
-        if not asset:
-            return False, "Asset not found"
-        
-        # Check if the asset is active
-        if asset.get('status') != 'Active':
-            return False, "Asset is not active"
+        # Check if user has permission to return assets
+        if self.current_user and not self.authorization.has_permission(self.current_user, ASSET_MOVE):
+            return False, "You don't have permission to move assets"
         
         # Update asset data
         update_data = {
@@ -242,19 +296,161 @@ class AssetController:
         if reason:
             update_data['remarks'] = reason
         
-        # Update the asset
-        success, message = self.asset_model.update_asset(asset_id, update_data)
-        
-        # Log the action if successful
-        if success and self.current_user:
-            self.asset_model.log_asset_action(
-                asset_id, 
+        # Return only if still active, and log the action in the same transaction
+        return self.asset_model.transition_asset(
+            asset_id,
+            'Active',
+            update_data,
+            self._log_entry(
                 'move_to_stock', 
-                f"Asset returned to stock by {self.current_user.get('username')}. Reason: {reason or 'Not specified'}", 
-                self.current_user.get('id')
+                f"Asset returned to stock by {self._username()}. Reason: {reason or 'Not specified'}"
+            ),
+            "Asset is not active"
+        )
+    
+    def _resolve_asset_ids(self, asset_ids, filters):
+        """
+        Get the assets a bulk operation applies to
+        
+        Args:
+            asset_ids (list): Explicit asset IDs, or None
+            filters (dict): Search filters used when no IDs are given
+        
+        Returns:
+            list: Asset IDs (never every asset unless a filter says so)
+        """
+        if asset_ids is not None:
+            return list(asset_ids)
+        if filters and any(filters.values()):
+            return self.asset_model.get_asset_ids(filters)
+        return []
+    
+    def bulk_move_to_active(self, assignments):
+        """
+        Issue many assets at once, e.g. during an onboarding wave
+        
+        Args:
+            assignments (dict): asset_id: user data to assign that asset to
+        
+        Returns:
+            bool: True if the batch was committed, False otherwise
+            str: Summary message
+            list: (asset_id, success, message) for every asset
+        """
+        if not assignments:
+            return False, "No assets selected", []
+        
+        # Check if user has permission to issue assets
+        if self.current_user and not self.authorization.has_permission(self.current_user, ASSET_MOVE):
+            return False, "You don't have permission to move assets", []
+        
+        updates = {}
+        log_entries = {}
+        for asset_id, user_data in assignments.items():
+            updates[asset_id] = {
+                'status': 'Active',
+                'username': user_data.get('username'),
+                'department': user_data.get('department'),
+                'designation': user_data.get('designation'),
+                'employee_id': user_data.get('employee_id'),
+                'issue_date': user_data.get('issue_date')
+            }
+            log_entries[asset_id] = self._log_entry(
+                'move_to_active', f"Asset issued to {user_data.get('username')} by {self._username()}"
             )
         
-        return success, message
+        # Issue only the assets still in stock, all in one transaction
+        return self.asset_model.bulk_update_assets(updates, log_entries, 'Stock', "Asset is not in stock")
+    
+    def bulk_move_to_stock(self, asset_ids=None, filters=None, reason=None):
+        """
+        Return many assets to stock at once
+        
+        Args:
+            asset_ids (list, optional): IDs of the assets to return
+            filters (dict, optional): Search filters selecting the assets instead of IDs
+            reason (str, optional): Reason for returning to stock
+        
+        Returns:
+            bool: True if the batch was committed, False otherwise
+            str: Summary message
+            list: (asset_id, success, message) for every asset
+        """
+        # Check if user has permission to return assets
+        if self.current_user and not self.authorization.has_permission(self.current_user, ASSET_MOVE):
+            return False, "You don't have permission to move assets", []
+        
+        asset_ids = self._resolve_asset_ids(asset_ids, filters)
+        if not asset_ids:
+            return False, "No assets selected", []
+        
+        update_data = {
+            'status': 'Stock',
+            'username': None,
+            'department': None,
+            'designation': None,
+            'employee_id': None
+        }
+        
+        if reason:
+            update_data['remarks'] = reason
+        
+        log_entry = self._log_entry(
+            'move_to_stock', 
+            f"Asset returned to stock by {self._username()}. Reason: {reason or 'Not specified'}"
+        )
+        
+        # Return only the assets still active, all in one transaction
+        return self.asset_model.bulk_update_assets(
+            {asset_id: update_data for asset_id in asset_ids},
+            {asset_id: log_entry for asset_id in asset_ids},
+            'Active',
+            "Asset is not active"
+        )
+    
+    def bulk_update_assets(self, asset_data, asset_ids=None, filters=None):
+        """
+        Set the same field values on many assets, e.g. a new location after an office move
+        
+        Args:
+            asset_data (dict): Field values to set
+            asset_ids (list, optional): IDs of the assets to update
+            filters (dict, optional): Search filters selecting the assets instead of IDs
+        
+        Returns:
+            bool: True if the batch was committed, False otherwise
+            str: Summary message
+            list: (asset_id, success, message) for every asset
+        """
+        if not asset_data:
+            return False, "No fields to update", []
+        
+        # IDs and serial numbers are unique, so they can't be set in bulk
+        if 'id' in asset_data:
+            return False, "Asset IDs can't be updated", []
+        if 'serial_number' in asset_data:
+            return False, "Serial numbers can't be updated in bulk", []
+        
+        # Status changes go through issue and return, which check the current status and the user data
+        if 'status' in asset_data:
+            return False, "Status can't be updated in bulk; issue or return the assets instead", []
+        
+        # Check if user may change these fields (document controllers have a restricted set)
+        if self.current_user and not self.authorization.can_update_asset_fields(self.current_user, asset_data.keys()):
+            return False, "You don't have permission to update these asset fields", []
+        
+        asset_ids = self._resolve_asset_ids(asset_ids, filters)
+        if not asset_ids:
+            return False, "No assets selected", []
+        
+        fields = ', '.join(asset_data)
+        log_entry = self._log_entry('update', f"Asset updated by {self._username()} (bulk: {fields})")
+        
+        # Update all assets and log the actions in one transaction
+        return self.asset_model.bulk_update_assets(
+            {asset_id: asset_data for asset_id in asset_ids},
+            {asset_id: log_entry for asset_id in asset_ids}
+        )
     
     def get_asset_history(self, asset_id):
         """
@@ -271,26 +467,32 @@ class AssetController:
         if not asset:
             return []
         
-        # Get the asset logs
-        try:
-            self.asset_model.db.connect()
-            
-            query = """
-                SELECT al.*, u.username 
-                FROM asset_logs al
-                LEFT JOIN users u ON al.user_id = u.id
-                WHERE al.asset_id = ?
-                ORDER BY al.timestamp DESC
-            """
-            
-            self.asset_model.db.cursor.execute(query, (asset_id,))
-            logs = self.asset_model.db.cursor.fetchall()
-            
-            # Convert sqlite3.Row objects to dictionaries
-            return [dict(log) for log in logs]
-            
-        except Exception as e:
-            print(f"Error getting asset history: {e}")
-            return []
-        finally:
-            self.asset_model.db.close()
+        # Get the asset logs (archived years are attached on demand)
+        return self.asset_model.get_asset_history(asset_id)
+    
+    def get_field_history(self, asset_id=None, field=None, since=None, until=None):
+        """
+        Get field-level change history
+        
+        Args:
+            asset_id (int, optional): Only changes to this asset
+            field (str, optional): Only changes to this field (e.g. 'location')
+            since (str, optional): Earliest change date, 'YYYY-MM-DD'
+            until (str, optional): Latest change date, 'YYYY-MM-DD'
+        
+        Returns:
+            list: List of change records, newest first
+        """
+        return self.asset_model.get_field_changes(asset_id, field, since, until)
+    
+    def get_assignment_history(self, asset_id):
+        """
+        Get every assignment of an asset
+        
+        Args:
+            asset_id (int): ID of the asset
+        
+        Returns:
+            list: Changes to the assigned username, newest first
+        """
+        return self.asset_model.get_field_changes(asset_id, 'username')
@@ -8,6 +8,9 @@ import schedule
 import threading
 from datetime import datetime
 from src.models.backup_model import BackupModel
+from src.models.log_archive_model import LogArchiveModel
+from src.utils.authorization import authorization, BACKUP_MANAGE
+from src.utils.metrics import metrics
 
 class BackupController:
     def __init__(self, current_user=None):
@@ -18,10 +21,13 @@ class BackupController:
             current_user (dict, optional): The currently logged in user
         """
         self.backup_model = BackupModel()
+        self.log_archive_model = LogArchiveModel()
         self.current_user = current_user
+        self.authorization = authorization
         self.backup_thread = None
         self.is_scheduled = False
     
+    @metrics.traced('backup.create')
     def create_backup(self):
         """
         Create a backup of the database
@@ -30,6 +36,10 @@ class BackupController:
             bool: True if successful, False otherwise
             str: Message indicating success or error
         """
+        # Check if user has permission to create backups
+        if self.current_user and not self.authorization.has_permission(self.current_user, BACKUP_MANAGE):
+            return False, "You don't have permission to create backups"
+        
         return self.backup_model.create_backup()
     
     def get_all_backups(self):
@@ -41,6 +51,7 @@ class BackupController:
         """
         return self.backup_model.get_all_backups()
     
+    @metrics.traced('backup.restore')
     def restore_backup(self, backup_id):
         """
         Restore the database from a backup
@@ -53,11 +64,28 @@ class BackupController:
             str: Message indicating success or error
         """
         # Check if user has permission to restore backups
-        if self.current_user and self.current_user.get('role') != 'administrator':
+        if self.current_user and not self.authorization.has_permission(self.current_user, BACKUP_MANAGE):
             return False, "You don't have permission to restore backups"
         
         return self.backup_model.restore_backup(backup_id)
     
+    def archive_logs(self, horizon_days=None):
+        """
+        Move old audit log entries into the yearly archive files
+        
+        Args:
+            horizon_days (int, optional): Age in days after which entries are archived
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message indicating success or error
+        """
+        # Check if user has permission to manage the database files
+        if self.current_user and not self.authorization.has_permission(self.current_user, BACKUP_MANAGE):
+            return False, "You don't have permission to archive logs"
+        
+        return self.log_archive_model.archive_logs(horizon_days)
+    
     def schedule_daily_backup(self, time_str="00:00"):
         """
         Schedule a daily backup at the specified time
@@ -99,6 +127,11 @@ class BackupController:
         Run the backup operation (called by the scheduler)
         """
         print(f"Running scheduled backup at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        # Archive old audit entries first so the backup doesn't carry them
+        archived, message = self.log_archive_model.archive_logs()
+        print(f"Log archive result: {message}")
+        
         success, message = self.backup_model.create_backup()
         print(f"Backup result: {message}")
         return success
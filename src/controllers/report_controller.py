@@ -7,6 +7,9 @@ import csv
 import sqlite3
 from datetime import datetime, timedelta
 from src.models.asset_model import AssetModel
+from src.models.asset_snapshot import asset_snapshot
+from src.utils.authorization import authorization, REPORT_VIEW
+from src.utils.metrics import metrics
 
 class ReportController:
     def __init__(self, current_user=None):
@@ -17,13 +20,16 @@ class ReportController:
             current_user (dict, optional): The currently logged in user
         """
         self.asset_model = AssetModel()
+        self.snapshot = asset_snapshot
         self.current_user = current_user
+        self.authorization = authorization
         self.reports_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'reports')
         
         # Create reports directory if it doesn't exist
         if not os.path.exists(self.reports_dir):
             os.makedirs(self.reports_dir)
     
+    @metrics.traced('report.generate')
     def generate_report(self, report_type, filters=None, export_format='csv'):
         """
         Generate a report based on the specified type and filters
@@ -31,10 +37,10 @@ class ReportController:
         Args:
             report_type (str): Type of report to generate
             filters (dict, optional): Filters to apply to the report
-            export_format (str, optional): Format to export the report (csv, pdf)
+            export_format (str, optional): Format to export the report (csv, pdf), or None to write no file
         
         Returns:
-            str: Path to the generated report file
+            str: Path to the generated report file (None if no file was written)
             list: Report data
         """
         # Map report types to their respective generation methods
@@ -51,8 +57,78 @@ class ReportController:
         if report_type not in report_generators:
             return None, []
         
+        # Check if user has permission to run reports
+        if self.current_user and not self.authorization.has_permission(self.current_user, REPORT_VIEW):
+            return None, []
+        
         # Generate the report
-        return report_generators[report_type](filters, export_format)
+        report_path, report_data = report_generators[report_type](filters, export_format)
+        if not export_format:
+            # Only the rows were asked for
+            return None, report_data
+        return report_path, report_data
+    
+    def get_summary(self, group_by='category', filters=None):
+        """
+        Summarize assets per group for dashboards
+        
+        Served from the in-memory asset snapshot, which only re-reads rows
+        changed since the previous call.
+        
+        Args:
+            group_by (str): Column to group by (e.g. category, company, location, purchase_date by year)
+            filters (dict, optional): Exact-match filters, e.g. {'company': 'MICL', 'status': 'Active'}
+        
+        Returns:
+            list: One dictionary per group with count, total_cost and average_cost, largest group first
+        
+        Raises:
+            ValueError: If group_by or a filter is not a snapshot column, or a filter value can't be parsed
+        """
+        # Check if user has permission to run reports
+        if self.current_user and not self.authorization.has_permission(self.current_user, REPORT_VIEW):
+            return []
+        
+        self.snapshot.refresh()
+        filters = {key: value for key, value in (filters or {}).items() if value}
+        unknown = [column for column in [group_by, *filters] if column not in self.snapshot.kinds]
+        if unknown:
+            raise ValueError(
+                f"Can't summarize by {', '.join(unknown)}; available columns: {', '.join(self.snapshot.kinds)}"
+            )
+        
+        selection = self.snapshot.filter(**filters)
+        
+        counts = self.snapshot.group_by(group_by, selection)
+        totals = self.snapshot.group_by(group_by, selection, 'estimated_cost', 'sum')
+        averages = self.snapshot.group_by(group_by, selection, 'estimated_cost', 'avg')
+        
+        summary = [
+            {
+                group_by: group,
+                'count': count,
+                'total_cost': round(totals.get(group) or 0, 2),
+                'average_cost': round(averages[group], 2) if averages.get(group) is not None else None
+            }
+            for group, count in counts.items()
+        ]
+        return sorted(summary, key=lambda row: row['count'], reverse=True)
+    
+    def get_filter_values(self, fields):
+        """
+        Get the values in use for report filter columns, with their asset counts
+        
+        Args:
+            fields (tuple): Filter columns such as ('company', 'status')
+        
+        Returns:
+            dict: field: list of (value, count) pairs sorted by value
+        """
+        # Check if user has permission to run reports
+        if self.current_user and not self.authorization.has_permission(self.current_user, REPORT_VIEW):
+            return {}
+        
+        return self.asset_model.lookups.get_value_counts(fields)
     
     def _generate_asset_list_report(self, filters=None, export_format='csv'):
         """
@@ -79,7 +155,7 @@ class ReportController:
         
         # Export to CSV
         if export_format == 'csv':
-            with open(file_path, 'w', newline='') as csvfile:
+            with metrics.phase('io'), open(file_path, 'w', newline='') as csvfile:
                 # Get field names from the first asset
                 fieldnames = assets[0].keys()
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -166,7 +242,7 @@ class ReportController:
         
         # Export to CSV
         if export_format == 'csv':
-            with open(file_path, 'w', newline='') as csvfile:
+            with metrics.phase('io'), open(file_path, 'w', newline='') as csvfile:
                 # Get field names from the first item
                 fieldnames = depreciation_data[0].keys()
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -255,7 +331,7 @@ class ReportController:
         
         # Export to CSV
         if export_format == 'csv':
-            with open(file_path, 'w', newline='') as csvfile:
+            with metrics.phase('io'), open(file_path, 'w', newline='') as csvfile:
                 # Get field names from the first item
                 fieldnames = ageing_data[0].keys()
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -352,7 +428,7 @@ class ReportController:
         
         # Export to CSV
         if export_format == 'csv':
-            with open(file_path, 'w', newline='') as csvfile:
+            with metrics.phase('io'), open(file_path, 'w', newline='') as csvfile:
                 # Get field names from the first item
                 fieldnames = lifecycle_data[0].keys()
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
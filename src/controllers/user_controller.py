@@ -3,6 +3,7 @@ User Controller for IT Asset Management System
 Handles business logic for user operations and authentication
 """
 from src.models.user_model import UserModel
+from src.utils.authorization import authorization, ROLE_PERMISSIONS, USER_VIEW, USER_MANAGE
 
 class UserController:
     def __init__(self, current_user=None):
@@ -14,6 +15,7 @@ class UserController:
         """
         self.user_model = UserModel()
         self.current_user = current_user
+        self.authorization = authorization
     
     def login(self, username, password):
         """
@@ -46,12 +48,12 @@ class UserController:
                 return False, f"Missing required field: {field}"
         
         # Validate role
-        valid_roles = ['administrator', 'standard', 'document_controller', 'view_only']
+        valid_roles = list(ROLE_PERMISSIONS)
         if user_data.get('role') not in valid_roles:
             return False, f"Invalid role. Must be one of: {', '.join(valid_roles)}"
         
         # Check if current user has permission to add users
-        if self.current_user and self.current_user.get('role') != 'administrator':
+        if self.current_user and not self.authorization.has_permission(self.current_user, USER_MANAGE):
             return False, "You don't have permission to add users"
         
         # Add the user
@@ -77,11 +79,12 @@ class UserController:
         # Check if current user has permission to update users
         if self.current_user:
             # Users can update their own profile
-            if self.current_user.get('id') != user_id and self.current_user.get('role') != 'administrator':
+            is_manager = self.authorization.has_permission(self.current_user, USER_MANAGE)
+            if self.current_user.get('id') != user_id and not is_manager:
                 return False, "You don't have permission to update other users"
             
             # Only admins can change roles
-            if 'role' in user_data and self.current_user.get('role') != 'administrator':
+            if 'role' in user_data and not is_manager:
                 return False, "Only administrators can change user roles"
         
         # Update the user
@@ -105,7 +108,7 @@ class UserController:
         
         # Check if current user has permission to delete users
         if self.current_user:
-            if self.current_user.get('role') != 'administrator':
+            if not self.authorization.has_permission(self.current_user, USER_MANAGE):
                 return False, "Only administrators can delete users"
             
             # Prevent deleting yourself
@@ -135,7 +138,7 @@ class UserController:
             list: List of users
         """
         # Check if current user has permission to view all users
-        if self.current_user and self.current_user.get('role') not in ['administrator', 'standard']:
+        if self.current_user and not self.authorization.has_permission(self.current_user, USER_VIEW):
             return []
         
         return self.user_model.get_all_users()
@@ -151,7 +154,7 @@ class UserController:
         Returns:
             bool: True if user has permission, False otherwise
         """
-        return self.user_model.check_permission(user_id, required_role)
+        return self.authorization.has_role(user_id, required_role)
     
     def change_password(self, user_id, current_password, new_password):
         """
@@ -174,11 +177,11 @@ class UserController:
         # Check if current user has permission to change this password
         if self.current_user:
             # Users can change their own password
-            if self.current_user.get('id') != user_id and self.current_user.get('role') != 'administrator':
+            if self.current_user.get('id') != user_id and not self.authorization.has_permission(self.current_user, USER_MANAGE):
                 return False, "You don't have permission to change other users' passwords"
         
         # Verify current password (except for administrators)
-        if self.current_user and self.current_user.get('role') != 'administrator':
+        if self.current_user and not self.authorization.has_permission(self.current_user, USER_MANAGE):
             if not self.user_model.authenticate(user.get('username'), current_password):
                 return False, "Current password is incorrect"
         
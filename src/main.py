@@ -4,18 +4,37 @@ Main application entry point
 """
 import os
 import sys
+import queue
+import argparse
+from time import perf_counter
+
+# Taken before the imports below, so startup times include loading them
+STARTED_AT = perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.config.database import db_config
 from src.views.login_view import LoginView
-from src.views.main_view import MainView
 from src.controllers.user_controller import UserController
 from src.controllers.backup_controller import BackupController
+from src.utils.ui_watchdog import UIWatchdog
+from src.utils.profiler import profiler, PROFILED_OPERATIONS
+from src.utils.metrics import metrics
 
 class Application(tk.Tk):
-    def __init__(self):
+    def __init__(self, profile=False):
+        """
+        Initialize the application window
+        
+        Args:
+            profile (bool): Profile the whole session with the sampling profiler
+        """
         super().__init__()
         
+        # Start first so startup is part of the profile
+        if profile:
+            profiler.start()
+        
         # Initialize the database
         self.initialize_database()
         
@@ -33,6 +52,9 @@ class Application(tk.Tk):
         # Initialize user session
         self.current_user = None
         
+        # Result of an operation armed with Profile Next Operation, put by whichever thread ran it
+        self.profile_results = None
+        
         # Set up controllers
         self.user_controller = UserController()
         self.backup_controller = BackupController()
@@ -51,6 +73,131 @@ class Application(tk.Tk):
         
         # Schedule daily backup
         self.schedule_backup()
+        
+        # Log freezes of the event loop with what the application was doing
+        self.watchdog = UIWatchdog(self)
+        self.watchdog.start()
+        
+        # Tools menu with the profiling commands
+        self.create_menu()
+        
+        # Idle callbacks run once the pending layout and drawing are done
+        self.after_idle(self.record_startup, 'login_screen', STARTED_AT)
+    
+    def destroy(self):
+        """Stop the watchdog and profiler before the window and its event loop go away"""
+        self.watchdog.stop()
+        if profiler.is_running:
+            success, result = profiler.stop()
+            print(f"Profile written to {result}" if success else result)
+        super().destroy()
+    
+    def create_menu(self):
+        """Create the menu bar with the profiling tools"""
+        menubar = tk.Menu(self)
+        
+        self.tools_menu = tk.Menu(menubar, tearoff=0)
+        self.tools_menu.add_command(
+            label="Stop Profiling" if profiler.is_running else "Start Profiling",
+            command=self.toggle_profiling
+        )
+        
+        operation_menu = tk.Menu(self.tools_menu, tearoff=0)
+        for operation, label in PROFILED_OPERATIONS:
+            operation_menu.add_command(label=label, command=lambda operation=operation: self.profile_operation(operation))
+        self.tools_menu.add_cascade(label="Profile Next Operation", menu=operation_menu)
+        self.tools_menu.add_command(label="Cancel Operation Profiling", command=self.cancel_operation_profiling)
+        
+        menubar.add_cascade(label="Tools", menu=self.tools_menu)
+        self.config(menu=menubar)
+    
+    def toggle_profiling(self):
+        """Start the sampling profiler, or stop it and report where the profile went"""
+        if profiler.is_running:
+            success, result = profiler.stop()
+            self.tools_menu.entryconfigure(0, label="Start Profiling")
+            self.profile_finished(success, result)
+        else:
+            success, message = profiler.start()
+            if success:
+                self.tools_menu.entryconfigure(0, label="Stop Profiling")
+            else:
+                messagebox.showerror("Profiling", message)
+    
+    def profile_operation(self, operation):
+        """
+        Profile the next run of an operation
+        
+        Args:
+            operation (str): Operation name from PROFILED_OPERATIONS
+        """
+        # The operation may run on a worker thread, and Tk must only be called from this one
+        results = queue.Queue()
+        success, message = profiler.profile_next(
+            operation,
+            on_finished=lambda success, result: results.put((success, result))
+        )
+        if success:
+            self.profile_results = results
+            self.wait_for_profile(results)
+            messagebox.showinfo("Profiling", message)
+        else:
+            messagebox.showerror("Profiling", message)
+    
+    def wait_for_profile(self, results):
+        """
+        Poll for the profile of an armed operation and report it
+        
+        Args:
+            results (queue.Queue): Queue the profiler puts the result of stop() into
+        """
+        try:
+            success, result = results.get_nowait()
+        except queue.Empty:
+            # Stop polling once the operation has been cancelled
+            if results is self.profile_results:
+                self.after(200, lambda: self.wait_for_profile(results))
+            return
+        
+        self.profile_results = None
+        self.profile_finished(success, result)
+    
+    def cancel_operation_profiling(self):
+        """Disarm Profile Next Operation before the operation has started"""
+        success, message = profiler.cancel()
+        if success:
+            self.profile_results = None
+            messagebox.showinfo("Profiling", message)
+        else:
+            messagebox.showerror("Profiling", message)
+    
+    def profile_finished(self, success, result):
+        """
+        Report a written profile
+        
+        Args:
+            success (bool): Whether the profile was written
+            result (str): Path of the profile or error message
+        """
+        if success:
+            messagebox.showinfo(
+                "Profiling",
+                f"Profile written to:\n{result}\n\nTurn it into a flamegraph with flamegraph.pl or open it in speedscope."
+            )
+        else:
+            messagebox.showerror("Profiling", result)
+    
+    def record_startup(self, stage, since):
+        """
+        Record how long a startup stage took in itam_startup_seconds
+        
+        Args:
+            stage (str): 'login_screen' (from launch), 'main_view' or 'assets_loaded' (from login)
+            since (float): perf_counter() value the stage is measured from
+        """
+        seconds = perf_counter() - since
+        metrics.observe('startup_seconds', seconds, stage=stage)
+        print(f"Startup: {stage.replace('_', ' ')} ready after {seconds:.2f} s")
     
     def initialize_database(self):
         """Initialize the database"""
@@ -65,9 +212,17 @@ class Application(tk.Tk):
         login_frame.grid(row=0, column=0, sticky="nsew")
         login_frame.tkraise()
     
-    def show_main(self):
-        """Show the main application view"""
-        main_frame = MainView(self.container, self)
+    def show_main(self, on_assets_loaded=None):
+        """
+        Show the main application view
+        
+        Args:
+            on_assets_loaded (function, optional): Called once the asset list has first been filled
+        """
+        # Imported on first login, so the login screen does not wait for the views behind it
+        from src.views.main_view import MainView
+        
+        main_frame = MainView(self.container, self, on_assets_loaded)
         self.frames["main"] = main_frame
         main_frame.grid(row=0, column=0, sticky="nsew")
         main_frame.tkraise()
@@ -84,14 +239,29 @@ class Application(tk.Tk):
             bool: True if login successful, False otherwise
         """
         user = self.user_controller.login(username, password)
+        return self.complete_login(user)
+    
+    def complete_login(self, user):
+        """
+        Start the session for an authenticated user
         
+        Args:
+            user (dict): User data, or None if authentication failed
+        
+        Returns:
+            bool: True if login successful, False otherwise
+        """
         if user:
             self.current_user = user
             self.user_controller.current_user = user
             self.backup_controller.current_user = user
             
-            # Show main view
-            self.show_main()
+            # Show main view; it is usable once drawn, the asset list fills in when loaded
+            logged_in_at = perf_counter()
+            self.show_main(
+                on_assets_loaded=lambda: self.after_idle(self.record_startup, 'assets_loaded', logged_in_at)
+            )
+            self.after_idle(self.record_startup, 'main_view', logged_in_at)
             return True
         else:
             messagebox.showerror("Login Failed", "Invalid username or password")
@@ -110,6 +280,22 @@ class Application(tk.Tk):
         """Schedule daily backup at midnight"""
         self.backup_controller.schedule_daily_backup("00:00")
 
-if __name__ == "__main__":
-    app = Application()
+# Help text for the exported startup metric
+metrics.describe('startup_seconds', "Time to the login screen from launch, and to the main view and asset list from login")
+
+def main(argv=None):
+    """
+    Parse the command line and run the application until its window is closed
+    
+    Args:
+        argv (list, optional): Arguments without the program name (default: sys.argv[1:])
+    """
+    parser = argparse.ArgumentParser(description="IT Asset Management System")
+    parser.add_argument("--profile", action="store_true", help="Profile the whole session with the sampling profiler")
+    args = parser.parse_args(argv)
+    
+    app = Application(profile=args.profile)
     app.mainloop()
+
+if __name__ == "__main__":
+    main()
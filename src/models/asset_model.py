@@ -3,20 +3,201 @@ Asset Model for IT Asset Management System
 Handles all database operations related to assets
 """
 import sqlite3
-from datetime import datetime
-from src.config.database import db_config
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from src.config.database import db_config, LOOKUP_FIELDS
+from src.utils.change_journal import change_journal
+from src.models.log_archive_model import LogArchiveModel
+from src.models.asset_record import fetch_records
+from src.models.lookup_model import lookup_model
+
+# UPDATE ... RETURNING needs SQLite 3.35
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+def _same_value(old_value, new_value):
+    """Compare a stored value with a form value"""
+    if old_value in (None, '') or new_value in (None, ''):
+        return old_value in (None, '') and new_value in (None, '')
+    
+    if old_value == new_value:
+        return True
+    
+    # Numeric columns come back as numbers but arrive from forms as text
+    if isinstance(old_value, (int, float)):
+        try:
+            return float(old_value) == float(new_value)
+        except (TypeError, ValueError):
+            return False
+    
+    return str(old_value).strip() == str(new_value).strip()
+
+def field_diff(existing_asset, asset_data):
+    """
+    Compute the field-level changes an update makes
+    
+    Empty strings and None are treated alike, and numbers are compared by
+    value, so re-saving a form unchanged records nothing.
+    
+    Args:
+        existing_asset (dict): Asset as currently stored
+        asset_data (dict): Updated asset data
+    
+    Returns:
+        dict: field: (old_value, new_value) for every field that changes
+    """
+    changes = {}
+    for field, new_value in asset_data.items():
+        if field in ('id', 'created_at', 'updated_at'):
+            continue
+        
+        old_value = existing_asset.get(field)
+        if not _same_value(old_value, new_value):
+            changes[field] = (old_value, new_value)
+    return changes
+
+class AssetCache:
+    def __init__(self, db, max_size=1024):
+        """
+        Bounded LRU cache of assets looked up by ID or serial number
+        
+        Entries are dropped when the model writes an asset, and the whole
+        cache is dropped whenever the database's data version moves, which
+        also catches writes from other processes and restores.
+        
+        Args:
+            db: Database configuration providing data_version()
+            max_size (int): Maximum number of cached assets
+        """
+        self.db = db
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._assets = OrderedDict()
+        self._serials = {}
+        self._version = None
+        self._lock = threading.Lock()
+    
+    def _key(self, asset_id):
+        """IDs arrive as int or as text from the views"""
+        try:
+            return int(asset_id)
+        except (TypeError, ValueError):
+            return asset_id
+    
+    def _validate(self):
+        """Drop everything if the database changed; returns the current version token"""
+        version = self.db.data_version()
+        if version != self._version:
+            self._assets.clear()
+            self._serials.clear()
+            self._version = version
+        return version
+    
+    def get(self, asset_id):
+        """
+        Look up an asset by ID
+        
+        Returns:
+            AssetRecord: The cached asset, or None on a miss
+            tuple: Version token to pass to put() after loading on a miss
+        """
+        with self._lock:
+            version = self._validate()
+            asset = self._assets.get(self._key(asset_id))
+            if asset is None:
+                self.misses += 1
+                return None, version
+            
+            self._assets.move_to_end(asset['id'])
+            self.hits += 1
+            return asset, version
+    
+    def get_by_serial(self, serial_number):
+        """
+        Look up an asset by serial number
+        
+        Returns:
+            AssetRecord: The cached asset, or None on a miss
+            tuple: Version token to pass to put() after loading on a miss
+        """
+        with self._lock:
+            version = self._validate()
+            asset = self._assets.get(self._serials.get(serial_number))
+            if asset is None:
+                self.misses += 1
+                return None, version
+            
+            self._assets.move_to_end(asset['id'])
+            self.hits += 1
+            return asset, version
+    
+    def put(self, asset, version):
+        """Cache an asset record loaded from the database, unless it changed since the lookup"""
+        with self._lock:
+            if version != self._version:
+                return
+            
+            self._assets[asset['id']] = asset
+            self._assets.move_to_end(asset['id'])
+            self._serials[asset['serial_number']] = asset['id']
+            while len(self._assets) > self.max_size:
+                _, evicted = self._assets.popitem(last=False)
+                self._serials.pop(evicted['serial_number'], None)
+    
+    def invalidate(self, asset_id=None):
+        """
+        Forget a cached asset
+        
+        Args:
+            asset_id (int, optional): Asset to forget, or None to clear everything
+        """
+        with self._lock:
+            if asset_id is None:
+                self._assets.clear()
+                self._serials.clear()
+                return
+            
+            asset = self._assets.pop(self._key(asset_id), None)
+            if asset:
+                self._serials.pop(asset['serial_number'], None)
+    
+    def stats(self):
+        """
+        Get cache statistics
+        
+        Returns:
+            dict: hits, misses, hit_rate, size and max_size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._assets),
+                'max_size': self.max_size
+            }
+
+# Shared by every AssetModel instance
+asset_cache = AssetCache(db_config)
 
 class AssetModel:
     def __init__(self):
         """Initialize the asset model"""
         self.db = db_config
+        self.journal = change_journal
+        self.log_archive = LogArchiveModel()
+        self.cache = asset_cache
+        self.lookups = lookup_model
     
-    def add_asset(self, asset_data):
+    def add_asset(self, asset_data, log_entry=None):
         """
         Add a new asset to the database
         
         Args:
             asset_data (dict): Dictionary containing asset data
+            log_entry (dict, optional): Audit entry (action, details, user_id) written in the same transaction
         
         Returns:
             bool: True if successful, False otherwise
@@ -37,7 +218,7 @@ class AssetModel:
             placeholders = []
             
             for key, value in asset_data.items():
-                if key != 'id':  # Skip id for new assets
+                if key not in ('id', 'version'):  # Skip id and version for new assets
                     fields.append(key)
                     values.append(value)
                     placeholders.append('?')
@@ -49,11 +230,15 @@ class AssetModel:
             placeholders.extend(['?', '?'])
             
             # Build and execute the query
-            query = f"INSERT INTO assets ({', '.join(fields)}) VALUES ({', '.join(placeholders)})"
-            self.db.cursor.execute(query, values)
+            row = self.lookups.encode(dict(zip(fields, values)))
+            query = f"INSERT INTO asset_rows ({', '.join(row)}) VALUES ({', '.join(placeholders)})"
+            self.db.cursor.execute(query, tuple(row.values()))
             
             asset_id = self.db.cursor.lastrowid
+            log = self._write_log(asset_id, log_entry)
             self.db.commit()
+            self.journal.record('assets', 'insert', asset_id, dict(zip(fields, values)))
+            self._journal_log(log)
             
             return True, f"Asset added successfully with ID: {asset_id}"
             
@@ -62,13 +247,16 @@ class AssetModel:
         finally:
             self.db.close()
     
-    def update_asset(self, asset_id, asset_data):
+    def update_asset(self, asset_id, asset_data, log_entry=None, field_changes=None, expected_version=None):
         """
         Update an existing asset
         
         Args:
             asset_id (int): ID of the asset to update
             asset_data (dict): Dictionary containing updated asset data
+            log_entry (dict, optional): Audit entry (action, details, user_id) written in the same transaction
+            field_changes (dict, optional): field: (old_value, new_value) pairs recorded in the field history
+            expected_version (int, optional): Version the caller loaded; the update fails if the asset has changed since
         
         Returns:
             bool: True if successful, False otherwise
@@ -77,57 +265,232 @@ class AssetModel:
         try:
             self.db.connect()
             
-            # Check if asset exists
-            self.db.cursor.execute("SELECT id FROM assets WHERE id = ?", (asset_id,))
-            if not self.db.cursor.fetchone():
-                return False, "Asset not found"
+            # Prepare fields and values for update
+            changes = {key: value for key, value in asset_data.items() if key not in ('id', 'version')}
             
-            # Check if updating to a serial number that already exists
-            if 'serial_number' in asset_data:
-                self.db.cursor.execute(
-                    "SELECT id FROM assets WHERE serial_number = ? AND id != ?", 
-                    (asset_data['serial_number'], asset_id)
-                )
-                if self.db.cursor.fetchone():
+            # Add updated_at timestamp
+            changes['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            # Update first and only look closer if nothing matched
+            conditions = {'version': expected_version} if expected_version is not None else None
+            try:
+                written = self._update_row(asset_id, changes, conditions)
+            except sqlite3.IntegrityError:
+                if 'serial_number' in changes:
                     return False, "Another asset with this serial number already exists"
+                raise
+            
+            if written is None:
+                self.db.cursor.execute("SELECT version FROM assets WHERE id = ?", (asset_id,))
+                current = self.db.cursor.fetchone()
+                if not current:
+                    return False, "Asset not found"
+                return False, (
+                    f"Asset was changed by someone else since it was loaded (loaded version {expected_version}, "
+                    f"current version {current['version']}). Reload it and try again."
+                )
             
-            # Prepare fields and values for update
-            set_clause = []
-            values = []
+            log = self._write_log(asset_id, log_entry)
+            field_log = self._write_field_changes(asset_id, field_changes, log, log_entry)
+            self.db.commit()
+            self.cache.invalidate(asset_id)
+            self.journal.record('assets', 'update', asset_id, written)
+            self._journal_log(log)
+            for change_id, values in field_log:
+                self.journal.record('asset_changes', 'insert', change_id, values)
+            return True, "Asset updated successfully"
             
-            for key, value in asset_data.items():
-                if key != 'id':  # Skip id for updates
-                    set_clause.append(f"{key} = ?")
-                    values.append(value)
+        except sqlite3.Error as e:
+            return False, f"Database error: {e}"
+        finally:
+            self.db.close()
+    
+    def _update_row(self, asset_id, changes, conditions=None):
+        """
+        Run a guarded UPDATE on the current connection and bump the row version
+        
+        Args:
+            asset_id (int): ID of the asset
+            changes (dict): Column values to set
+            conditions (dict, optional): column: value pairs the row must still have
+        
+        Returns:
+            dict: Values written, including the new version when known, or None if no row matched
+        """
+        # A condition on a lookup value that was never stored can't match any row
+        conditions = self.lookups.find_ids(conditions or {})
+        if conditions is None:
+            return None
+        
+        row = self.lookups.encode(changes)
+        set_clause = ', '.join([f"{key} = ?" for key in row] + ["version = version + 1"])
+        where_clause = ' AND '.join(['id = ?'] + [f"{key} = ?" for key in conditions])
+        query = f"UPDATE asset_rows SET {set_clause} WHERE {where_clause}"
+        values = list(row.values()) + [asset_id] + list(conditions.values())
+        
+        written = dict(changes)
+        if SUPPORTS_RETURNING:
+            self.db.cursor.execute(query + " RETURNING version", values)
+            row = self.db.cursor.fetchone()
+            if row is None:
+                return None
+            written['version'] = row['version']
+        else:
+            self.db.cursor.execute(query, values)
+            if self.db.cursor.rowcount == 0:
+                return None
+            if 'version' in conditions:
+                written['version'] = conditions['version'] + 1
+        return written
+    
+    def transition_asset(self, asset_id, from_status, asset_data, log_entry=None, status_error=None):
+        """
+        Change an asset's status atomically, e.g. issue it from stock
+        
+        The pre-image read, the conditional UPDATE (which only matches while
+        the asset still has from_status), the audit entry and the field
+        history all happen in one write transaction on one connection, so
+        two people issuing the same asset cannot both succeed.
+        
+        Args:
+            asset_id (int): ID of the asset to move
+            from_status (str): Status the asset must currently have
+            asset_data (dict): New values, including the new status
+            log_entry (dict, optional): Audit entry (action, details, user_id) written in the same transaction
+            status_error (str, optional): Message when the asset is not in from_status
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message indicating success or error
+        """
+        try:
+            self.db.connect()
             
-            # Add updated_at timestamp
-            set_clause.append("updated_at = ?")
-            values.append(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            # Take the write lock up front so the pre-image can't go stale
+            self.db.cursor.execute("BEGIN IMMEDIATE")
             
-            # Add asset_id to values
-            values.append(asset_id)
+            columns = ', '.join(key for key in asset_data if key != 'id')
+            self.db.cursor.execute(f"SELECT {columns} FROM assets WHERE id = ?", (asset_id,))
+            existing = self.db.cursor.fetchone()
             
-            # Build and execute the query
-            query = f"UPDATE assets SET {', '.join(set_clause)} WHERE id = ?"
-            self.db.cursor.execute(query, values)
+            changes = {key: value for key, value in asset_data.items() if key not in ('id', 'version')}
+            changes['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            if self.db.cursor.rowcount == 0:
-                return False, "No changes made to the asset"
-                
+            written = self._update_row(asset_id, changes, {'status': from_status})
+            if written is None:
+                self.db.connection.rollback()
+                if existing is None:
+                    return False, "Asset not found"
+                return False, status_error or f"Asset is not {from_status}"
+            
+            log = self._write_log(asset_id, log_entry)
+            field_log = self._write_field_changes(
+                asset_id, field_diff(dict(existing), asset_data), log, log_entry
+            )
             self.db.commit()
+            self.cache.invalidate(asset_id)
+            self.journal.record('assets', 'update', asset_id, written)
+            self._journal_log(log)
+            for change_id, values in field_log:
+                self.journal.record('asset_changes', 'insert', change_id, values)
             return True, "Asset updated successfully"
             
         except sqlite3.Error as e:
+            if self.db.connection and self.db.connection.in_transaction:
+                self.db.connection.rollback()
             return False, f"Database error: {e}"
         finally:
             self.db.close()
     
-    def delete_asset(self, asset_id):
+    def bulk_update_assets(self, updates, log_entries=None, from_status=None, status_error=None):
+        """
+        Apply updates to many assets in one transaction
+        
+        Each asset is updated inside its own savepoint, so one failure (a
+        missing asset, a wrong status or a constraint violation) is reported
+        and skipped without undoing the others. Audit entries and field
+        history are written in the same transaction and committed together.
+        
+        Args:
+            updates (dict): asset_id: asset_data for every asset to update
+            log_entries (dict, optional): asset_id: audit entry (action, details, user_id)
+            from_status (str, optional): Only update assets currently in this status
+            status_error (str, optional): Message for assets not in from_status
+        
+        Returns:
+            bool: True if the batch was committed, False otherwise
+            str: Summary message
+            list: (asset_id, success, message) for every requested asset
+        """
+        log_entries = log_entries or {}
+        results = []
+        journal_entries = []
+        try:
+            self.db.connect()
+            self.db.cursor.execute("BEGIN IMMEDIATE")
+            updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            for asset_id, asset_data in updates.items():
+                changes = {key: value for key, value in asset_data.items() if key not in ('id', 'version')}
+                if not changes:
+                    results.append((asset_id, False, "No changes given"))
+                    continue
+                changes['updated_at'] = updated_at
+                
+                self.db.cursor.execute("SAVEPOINT bulk_item")
+                try:
+                    columns = ', '.join(key for key in changes if key != 'updated_at')
+                    self.db.cursor.execute(f"SELECT status, {columns} FROM assets WHERE id = ?", (asset_id,))
+                    existing = self.db.cursor.fetchone()
+                    
+                    if existing is None:
+                        results.append((asset_id, False, "Asset not found"))
+                        continue
+                    if from_status and existing['status'] != from_status:
+                        results.append((asset_id, False, status_error or f"Asset is not {from_status}"))
+                        continue
+                    
+                    written = self._update_row(asset_id, changes)
+                    
+                    log_entry = log_entries.get(asset_id)
+                    log = self._write_log(asset_id, log_entry)
+                    field_log = self._write_field_changes(
+                        asset_id, field_diff(dict(existing), asset_data), log, log_entry
+                    )
+                    journal_entries.append((asset_id, written, log, field_log))
+                    results.append((asset_id, True, "Asset updated successfully"))
+                
+                except sqlite3.IntegrityError as e:
+                    self.db.cursor.execute("ROLLBACK TO bulk_item")
+                    results.append((asset_id, False, f"Database error: {e}"))
+                finally:
+                    self.db.cursor.execute("RELEASE bulk_item")
+            
+            self.db.commit()
+            
+            for asset_id, changes, log, field_log in journal_entries:
+                self.cache.invalidate(asset_id)
+                self.journal.record('assets', 'update', asset_id, changes)
+                self._journal_log(log)
+                for change_id, values in field_log:
+                    self.journal.record('asset_changes', 'insert', change_id, values)
+            
+            return True, f"{len(journal_entries)} of {len(updates)} assets updated", results
+            
+        except sqlite3.Error as e:
+            if self.db.connection and self.db.connection.in_transaction:
+                self.db.connection.rollback()
+            return False, f"Database error: {e}", []
+        finally:
+            self.db.close()
+    
+    def delete_asset(self, asset_id, log_entry=None):
         """
         Delete an asset from the database
         
         Args:
             asset_id (int): ID of the asset to delete
+            log_entry (dict, optional): Audit entry (action, details, user_id) written in the same transaction
         
         Returns:
             bool: True if successful, False otherwise
@@ -142,8 +505,12 @@ class AssetModel:
                 return False, "Asset not found"
             
             # Delete the asset
-            self.db.cursor.execute("DELETE FROM assets WHERE id = ?", (asset_id,))
+            log = self._write_log(asset_id, log_entry)
+            self.db.cursor.execute("DELETE FROM asset_rows WHERE id = ?", (asset_id,))
             self.db.commit()
+            self.cache.invalidate(asset_id)
+            self._journal_log(log)
+            self.journal.record('assets', 'delete', asset_id)
             
             return True, "Asset deleted successfully"
             
@@ -160,17 +527,19 @@ class AssetModel:
             asset_id (int): ID of the asset to retrieve
         
         Returns:
-            dict: Asset data if found, None otherwise
+            AssetRecord: Asset data (read-only, dict-like) if found, None otherwise
         """
+        cached, version = self.cache.get(asset_id)
+        if cached is not None:
+            return cached
+        
         try:
             self.db.connect()
             
-            self.db.cursor.execute("SELECT * FROM assets WHERE id = ?", (asset_id,))
-            asset = self.db.cursor.fetchone()
-            
-            if asset:
-                # Convert sqlite3.Row to dict
-                return dict(asset)
+            assets = self._query_records("SELECT * FROM assets WHERE id = ?", (asset_id,))
+            if assets:
+                self.cache.put(assets[0], version)
+                return assets[0]
             return None
             
         except sqlite3.Error as e:
@@ -187,17 +556,19 @@ class AssetModel:
             serial_number (str): Serial number of the asset to retrieve
         
         Returns:
-            dict: Asset data if found, None otherwise
+            AssetRecord: Asset data (read-only, dict-like) if found, None otherwise
         """
+        cached, version = self.cache.get_by_serial(serial_number)
+        if cached is not None:
+            return cached
+        
         try:
             self.db.connect()
             
-            self.db.cursor.execute("SELECT * FROM assets WHERE serial_number = ?", (serial_number,))
-            asset = self.db.cursor.fetchone()
-            
-            if asset:
-                # Convert sqlite3.Row to dict
-                return dict(asset)
+            assets = self._query_records("SELECT * FROM assets WHERE serial_number = ?", (serial_number,))
+            if assets:
+                self.cache.put(assets[0], version)
+                return assets[0]
             return None
             
         except sqlite3.Error as e:
@@ -214,30 +585,73 @@ class AssetModel:
             filters (dict, optional): Dictionary of field:value pairs to filter by
         
         Returns:
-            list: List of asset dictionaries
+            list: List of asset records (read-only, dict-like)
         """
         try:
             self.db.connect()
             
-            query = "SELECT * FROM assets"
-            params = []
+            where, params = self._filter_clause(filters)
+            return self._query_records("SELECT * FROM assets" + where, params, share_strings=True)
             
-            # Apply filters if provided
-            if filters:
-                where_clauses = []
-                for key, value in filters.items():
-                    if value:  # Only add non-empty filters
-                        where_clauses.append(f"{key} LIKE ?")
-                        params.append(f"%{value}%")
-                
-                if where_clauses:
-                    query += " WHERE " + " AND ".join(where_clauses)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+        finally:
+            self.db.close()
+    
+    def get_assets_page(self, filters=None, after_id=0, limit=100):
+        """
+        Get one page of the assets matching filters, in ID order
+        
+        Pages are keyed on the last ID of the previous page rather than an
+        offset, so every page is a range scan of the primary key however
+        deep into the results it is.
+        
+        Args:
+            filters (dict, optional): Dictionary of field:value pairs to filter by
+            after_id (int): Last asset ID of the previous page (0 for the first page)
+            limit (int): Maximum number of assets on the page
+        
+        Returns:
+            list: List of asset records (read-only, dict-like)
+        """
+        try:
+            self.db.connect()
             
-            self.db.cursor.execute(query, params)
-            assets = self.db.cursor.fetchall()
+            where, params = self._filter_clause(filters)
+            where += " AND id > ?" if where else " WHERE id > ?"
+            return self._query_records(
+                "SELECT * FROM assets" + where + " ORDER BY id LIMIT ?", params + [int(after_id), int(limit)]
+            )
             
-            # Convert sqlite3.Row objects to dictionaries
-            return [dict(asset) for asset in assets]
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+        finally:
+            self.db.close()
+    
+    def get_assets_by_ids(self, asset_ids):
+        """
+        Get several assets in as few queries as possible
+        
+        Args:
+            asset_ids (list): IDs of the assets to retrieve
+        
+        Returns:
+            list: List of asset records in the order of asset_ids (missing IDs are skipped)
+        """
+        asset_ids = [int(asset_id) for asset_id in asset_ids]
+        try:
+            self.db.connect()
+            
+            found = {}
+            for start in range(0, len(asset_ids), 500):
+                chunk = asset_ids[start:start + 500]
+                placeholders = ', '.join('?' * len(chunk))
+                for asset in self._query_records(f"SELECT * FROM assets WHERE id IN ({placeholders})", chunk):
+                    found[asset['id']] = asset
+            
+            return [found[asset_id] for asset_id in asset_ids if asset_id in found]
             
         except sqlite3.Error as e:
             print(f"Database error: {e}")
@@ -245,12 +659,93 @@ class AssetModel:
         finally:
             self.db.close()
     
+    def _query_records(self, query, params=(), share_strings=False):
+        """
+        Run a query on the current connection and return compact records
+        
+        Args:
+            query (str): SQL query
+            params (tuple): Query parameters
+            share_strings (bool): Deduplicate repeated string values, worthwhile for large results
+        
+        Returns:
+            list: List of AssetRecord objects
+        """
+        cursor = self.db.connection.cursor()
+        cursor.row_factory = None  # Plain tuples; the records share one column index
+        cursor.execute(query, params)
+        return fetch_records(cursor, share_strings)
+    
+    def get_asset_ids(self, filters=None):
+        """
+        Get the IDs of the assets matching filters
+        
+        Args:
+            filters (dict, optional): Dictionary of field:value pairs to filter by
+        
+        Returns:
+            list: List of asset IDs
+        """
+        try:
+            self.db.connect()
+            
+            where, params = self._filter_clause(filters)
+            self.db.cursor.execute("SELECT id FROM assets" + where, params)
+            return [row['id'] for row in self.db.cursor.fetchall()]
+            
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+        finally:
+            self.db.close()
+    
+    def _filter_clause(self, filters):
+        """
+        Build the WHERE clause for a filter dictionary
+        
+        Lookup columns are matched against the few lookup values first and
+        the assets then selected by ID, so the filter compares integers
+        instead of joining in the text of every row.
+        
+        Args:
+            filters (dict): Dictionary of field:value pairs, matched with LIKE
+        
+        Returns:
+            str: WHERE clause (empty if there are no filters)
+            list: Query parameters
+        """
+        where_clauses = []
+        params = []
+        lookup_clauses = []
+        lookup_params = []
+        
+        # Apply filters if provided
+        for key, value in (filters or {}).items():
+            if not value:  # Only add non-empty filters
+                continue
+            if key in LOOKUP_FIELDS:
+                lookup_clauses.append(
+                    f"{key}_id IN (SELECT id FROM lookup_values WHERE field = '{key}' AND value LIKE ?)"
+                )
+                lookup_params.append(f"%{value}%")
+            else:
+                where_clauses.append(f"{key} LIKE ?")
+                params.append(f"%{value}%")
+        
+        if lookup_clauses:
+            where_clauses.insert(0, f"id IN (SELECT id FROM asset_rows WHERE {' AND '.join(lookup_clauses)})")
+            params = lookup_params + params
+        
+        if not where_clauses:
+            return "", params
+        return " WHERE " + " AND ".join(where_clauses), params
+    
     def get_active_assets(self):
         """
         Get all active (issued) assets
         
         Returns:
-            list: List of active asset dictionaries
+            list: List of active asset records
         """
         return self.get_all_assets({'status': 'Active'})
     
@@ -259,7 +754,7 @@ class AssetModel:
         Get all stock (unassigned) assets
         
         Returns:
-            list: List of stock asset dictionaries
+            list: List of stock asset records
         """
         return self.get_all_assets({'status': 'Stock'})
     
@@ -267,6 +762,8 @@ class AssetModel:
         """
         Log an action performed on an asset
         
+        Mutations should pass a log_entry instead, so the entry commits with them.
+        
         Args:
             asset_id (int): ID of the asset
             action (str): Type of action performed
@@ -279,12 +776,9 @@ class AssetModel:
         try:
             self.db.connect()
             
-            self.db.cursor.execute(
-                "INSERT INTO asset_logs (asset_id, action, details, user_id) VALUES (?, ?, ?, ?)",
-                (asset_id, action, details, user_id)
-            )
-            
+            log = self._write_log(asset_id, {'action': action, 'details': details, 'user_id': user_id})
             self.db.commit()
+            self._journal_log(log)
             return True
             
         except sqlite3.Error as e:
@@ -292,3 +786,146 @@ class AssetModel:
             return False
         finally:
             self.db.close()
+    
+    def get_asset_history(self, asset_id):
+        """
+        Get the audit history of an asset, including archived entries
+        
+        Args:
+            asset_id (int): ID of the asset
+        
+        Returns:
+            list: List of asset history records, newest first (timestamps in UTC, like get_field_changes)
+        """
+        return self.log_archive.query_logs("asset_id = ?", (asset_id,))
+    
+    def _write_log(self, asset_id, log_entry):
+        """
+        Insert an audit entry on the current connection without committing
+        
+        Args:
+            asset_id (int): ID of the asset
+            log_entry (dict): Entry with action, details and user_id, or None
+        
+        Returns:
+            tuple: (log_id, values) for the journal, or None if nothing was written
+        """
+        if not log_entry:
+            return None
+        
+        # Same value CURRENT_TIMESTAMP would produce (UTC), made explicit so it can be journaled
+        values = {
+            'asset_id': asset_id,
+            'action': log_entry['action'],
+            'details': log_entry.get('details'),
+            'user_id': log_entry.get('user_id'),
+            'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        }
+        self.db.cursor.execute(
+            "INSERT INTO asset_logs (asset_id, action, details, user_id, timestamp) VALUES (?, ?, ?, ?, ?)",
+            tuple(values.values())
+        )
+        return self.db.cursor.lastrowid, values
+    
+    def _write_field_changes(self, asset_id, field_changes, log, log_entry):
+        """
+        Insert field-level change records on the current connection without committing
+        
+        changed_at is in UTC like asset_logs.timestamp, and is the audit
+        entry's own timestamp when there is one, so the history and the
+        field changes of a mutation fall into the same time windows.
+        
+        Args:
+            asset_id (int): ID of the asset
+            field_changes (dict): field: (old_value, new_value) pairs, or None
+            log (tuple): Result of _write_log for the same mutation, or None
+            log_entry (dict): Audit entry the changes belong to, or None
+        
+        Returns:
+            list: (change_id, values) pairs for the journal
+        """
+        if not field_changes:
+            return []
+        
+        changed_at = log[1]['timestamp'] if log else datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        written = []
+        for field, (old_value, new_value) in field_changes.items():
+            values = {
+                'asset_id': asset_id,
+                'log_id': log[0] if log else None,
+                'field': field,
+                'old_value': old_value,
+                'new_value': new_value,
+                'user_id': log_entry.get('user_id') if log_entry else None,
+                'changed_at': changed_at
+            }
+            self.db.cursor.execute(
+                "INSERT INTO asset_changes (asset_id, log_id, field, old_value, new_value, user_id, changed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                tuple(values.values())
+            )
+            written.append((self.db.cursor.lastrowid, values))
+        return written
+    
+    def get_field_changes(self, asset_id=None, field=None, since=None, until=None):
+        """
+        Get field-level change records, newest first
+        
+        Served from the (asset_id, field, changed_at) and (field, changed_at)
+        indexes, e.g. every assignment of one laptop or every location change
+        in a month.
+        
+        Args:
+            asset_id (int, optional): Only changes to this asset
+            field (str, optional): Only changes to this field
+            since (str, optional): Earliest changed_at in UTC, 'YYYY-MM-DD[ HH:MM:SS]'
+            until (str, optional): Latest changed_at in UTC, 'YYYY-MM-DD[ HH:MM:SS]'
+        
+        Returns:
+            list: List of change dictionaries including the changing user's username
+        """
+        try:
+            self.db.connect()
+            
+            where_clauses = []
+            params = []
+            
+            if asset_id is not None:
+                where_clauses.append("ac.asset_id = ?")
+                params.append(asset_id)
+            if field:
+                where_clauses.append("ac.field = ?")
+                params.append(field)
+            if since:
+                where_clauses.append("ac.changed_at >= ?")
+                params.append(since)
+            if until:
+                # A bare date includes the whole day
+                where_clauses.append("ac.changed_at <= ?")
+                params.append(until if len(until) > 10 else f"{until} 23:59:59")
+            
+            query = """
+                SELECT ac.*, u.username AS changed_by
+                FROM asset_changes ac
+                LEFT JOIN users u ON ac.user_id = u.id
+            """
+            if where_clauses:
+                query += " WHERE " + " AND ".join(where_clauses)
+            query += " ORDER BY ac.changed_at DESC, ac.id DESC"
+            
+            self.db.cursor.execute(query, params)
+            changes = self.db.cursor.fetchall()
+            
+            # Convert sqlite3.Row objects to dictionaries
+            return [dict(change) for change in changes]
+            
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+        finally:
+            self.db.close()
+    
+    def _journal_log(self, log):
+        """Journal an audit entry written by _write_log once it has committed"""
+        if log:
+            self.journal.record('asset_logs', 'insert', *log)
@@ -0,0 +1,92 @@
+"""
+Asset Record for IT Asset Management System
+Compact read-only row type for asset query results
+"""
+from collections.abc import Mapping
+
+# Column name -> position maps, shared by every record of the same query shape
+_field_indexes = {}
+
+def field_index(description):
+    """
+    Get the shared column index for a cursor description
+    
+    Args:
+        description (tuple): cursor.description of the executed query
+    
+    Returns:
+        dict: Column name to position in the row tuple
+    """
+    names = tuple(column[0] for column in description)
+    index = _field_indexes.get(names)
+    if index is None:
+        index = _field_indexes.setdefault(names, {name: i for i, name in enumerate(names)})
+    return index
+
+class AssetRecord(Mapping):
+    __slots__ = ('_index', '_values')
+    
+    def __init__(self, index, values):
+        """
+        One asset row: the row tuple plus a reference to a shared column index
+        
+        Behaves like a read-only dict (record['serial_number'], record.get(...),
+        keys(), items(), dict(record)) at a fraction of the memory of a dict
+        per row. Records are immutable, so caches can hand them out as is.
+        
+        Args:
+            index (dict): Shared column name to position map
+            values (tuple): Row values in column order
+        """
+        self._index = index
+        self._values = values
+    
+    def __getitem__(self, key):
+        return self._values[self._index[key]]
+    
+    def __iter__(self):
+        return iter(self._index)
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def __contains__(self, key):
+        return key in self._index
+    
+    def __repr__(self):
+        return f"AssetRecord({self.to_dict()!r})"
+    
+    def to_dict(self):
+        """
+        Convert the record to a plain, mutable dict
+        
+        Returns:
+            dict: Column name to value
+        """
+        return dict(zip(self._index, self._values))
+
+def fetch_records(cursor, share_strings=False):
+    """
+    Fetch all rows of an executed query as records
+    
+    The cursor must return plain tuples (row_factory None).
+    
+    Args:
+        cursor: Cursor the query was executed on
+        share_strings (bool): Reuse one string object for equal values across
+            rows. Low-cardinality columns (company, location, status...) then
+            cost one string per distinct value instead of one per row, at
+            some extra CPU per cell.
+    
+    Returns:
+        list: List of AssetRecord objects
+    """
+    index = field_index(cursor.description)
+    if not share_strings:
+        return [AssetRecord(index, row) for row in cursor.fetchall()]
+    
+    shared = {}.setdefault
+    return [
+        AssetRecord(index, tuple([shared(value, value) if value.__class__ is str else value for value in row]))
+        for row in cursor.fetchall()
+    ]
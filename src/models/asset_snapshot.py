@@ -0,0 +1,431 @@
+"""
+Asset Snapshot for IT Asset Management System
+Column-oriented in-memory copy of the assets table for repeated analytics
+"""
+import math
+import sqlite3
+import threading
+from array import array
+from datetime import date
+from src.config.database import db_config
+
+# Columns loaded by default: the ones analysts slice and aggregate by
+DEFAULT_COLUMNS = (
+    'company', 'location', 'category', 'status', 'working_status', 'condition',
+    'department', 'model', 'supplier', 'estimated_cost', 'purchase_date', 'issue_date',
+    'created_at', 'updated_at'
+)
+
+# Code of a NULL string and value of a NULL date
+NULL_CODE = -1
+NULL_DAY = 0
+
+class AssetSnapshot:
+    def __init__(self, db=None, columns=DEFAULT_COLUMNS):
+        """
+        Columnar snapshot of the assets table
+        
+        Strings are dictionary-encoded into integer codes, numbers are kept
+        in float arrays (NaN for NULL) and dates as day ordinals (0 for NULL),
+        so filters and group-bys compare machine integers instead of building
+        a dict per row. refresh() keeps the snapshot current from the
+        database's data version, reading only rows whose change number
+        (asset_rows.change_seq) is past the last one it has seen.
+        
+        Args:
+            db: Database configuration, defaults to the application database
+            columns (tuple): Asset columns to load
+        """
+        self.db = db or db_config
+        self.column_names = tuple(columns)
+        self.kinds = {}
+        self.columns = {}
+        self.dictionaries = {}
+        self._codes = {}
+        self.ids = array('q')
+        self.alive = bytearray()
+        self._positions = {}
+        self._max_id = 0
+        self._version = None
+        self._change_seq = 0
+        self._lock = threading.RLock()
+    
+    def refresh(self):
+        """
+        Bring the snapshot up to date with the database
+        
+        Returns:
+            bool: True if anything was (re)loaded, False if it was already current
+        """
+        with self._lock:
+            version = self.db.data_version()
+            if version == self._version:
+                return False
+            
+            try:
+                self.db.connect()
+                
+                # A new generation means a different file (restore, other path): start over
+                if self._version is None or version[0] != self._version[0]:
+                    self._load_all()
+                else:
+                    self._load_delta()
+                
+                self._version = version
+                return True
+            
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                self._version = None
+                return False
+            finally:
+                self.db.close()
+    
+    def _load_all(self):
+        """Load every asset (caller holds a connection)"""
+        self.db.cursor.execute("PRAGMA table_info(assets)")
+        declared = {row['name']: (row['type'] or '').upper() for row in self.db.cursor.fetchall()}
+        
+        self.kinds = {}
+        self.columns = {}
+        self.dictionaries = {}
+        self._codes = {}
+        for name in self.column_names:
+            if name not in declared:
+                continue
+            kind = self._kind(declared[name])
+            self.kinds[name] = kind
+            self.columns[name] = array('l') if kind in ('string', 'date') else array('d')
+            if kind == 'string':
+                self.dictionaries[name] = []
+                self._codes[name] = {}
+        
+        self.ids = array('q')
+        self.alive = bytearray()
+        self._positions = {}
+        self._max_id = 0
+        
+        # Read the counter first: rows committed while loading are read again next time, never missed
+        self._change_seq = self._last_change_seq()
+        self._ingest(self._select())
+    
+    def _load_delta(self):
+        """Apply inserts, updates and deletes since the last refresh (caller holds a connection)"""
+        # Every insert and update takes a number from the counter, in commit order
+        change_seq = self._last_change_seq()
+        if change_seq != self._change_seq:
+            self._ingest(self._select(
+                "WHERE id IN (SELECT id FROM asset_rows WHERE change_seq > ?)", (self._change_seq,)
+            ))
+            self._change_seq = change_seq
+        
+        # Deletes leave no row to number: with every insert applied above,
+        # fewer assets than the snapshot holds means some were deleted
+        self.db.cursor.execute("SELECT COUNT(*), MAX(id) FROM assets")
+        count, max_id = self.db.cursor.fetchone()
+        if count != sum(self.alive) or (max_id or 0) > self._max_id:
+            self.db.cursor.execute("SELECT id FROM assets")
+            current = {row[0] for row in self.db.cursor.fetchall()}
+            
+            for asset_id, position in self._positions.items():
+                if asset_id not in current:
+                    self.alive[position] = 0
+            
+            missing = [asset_id for asset_id in current if asset_id not in self._positions]
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                self._ingest(self._select(f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+    
+    def _last_change_seq(self):
+        """Number of the latest committed asset insert or update"""
+        self.db.cursor.execute("SELECT value FROM asset_change_sequence")
+        row = self.db.cursor.fetchone()
+        return row[0] if row else 0
+    
+    def _select(self, where="", params=()):
+        """Fetch the loaded columns as plain tuples, ID first"""
+        cursor = self.db.connection.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"SELECT id, {', '.join(self.kinds)} FROM assets {where}", params)
+        return cursor
+    
+    def _ingest(self, rows):
+        """Append new rows and overwrite changed ones"""
+        columns = [(self.columns[name], self._encoder(name)) for name in self.kinds]
+        positions = self._positions
+        
+        for row in rows:
+            asset_id = row[0]
+            position = positions.get(asset_id)
+            
+            if position is None:
+                positions[asset_id] = len(self.ids)
+                self.ids.append(asset_id)
+                if asset_id > self._max_id:
+                    self._max_id = asset_id
+                self.alive.append(1)
+                for (values, encode), value in zip(columns, row[1:]):
+                    values.append(encode(value))
+            else:
+                self.alive[position] = 1
+                for (values, encode), value in zip(columns, row[1:]):
+                    values[position] = encode(value)
+    
+    def _kind(self, declared_type):
+        """Storage kind for a declared SQLite column type"""
+        if 'DATE' in declared_type or 'TIME' in declared_type:
+            return 'date'
+        if 'REAL' in declared_type or 'INT' in declared_type or 'NUM' in declared_type:
+            return 'number'
+        return 'string'
+    
+    def _encoder(self, name):
+        """Function turning a database value into the column's storage value"""
+        kind = self.kinds[name]
+        
+        if kind == 'number':
+            def encode(value):
+                try:
+                    return float(value) if value not in (None, '') else math.nan
+                except (TypeError, ValueError):
+                    return math.nan
+            return encode
+        
+        if kind == 'date':
+            # Dates repeat a lot (same purchase batch, same day's edits): parse each once
+            days = {}
+            
+            def encode(value):
+                day = days.get(value)
+                if day is None:
+                    day = days[value] = _day(value)
+                return day
+            return encode
+        
+        codes = self._codes[name]
+        dictionary = self.dictionaries[name]
+        
+        def encode(value):
+            if value is None:
+                return NULL_CODE
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(dictionary)
+                dictionary.append(value)
+            return code
+        return encode
+    
+    def _decode(self, name, stored):
+        """Turn a storage value back into a presentable value"""
+        kind = self.kinds[name]
+        if kind == 'string':
+            return None if stored == NULL_CODE else self.dictionaries[name][stored]
+        if kind == 'date':
+            return None if stored == NULL_DAY else date.fromordinal(stored).isoformat()
+        return None if math.isnan(stored) else stored
+    
+    def __len__(self):
+        return sum(self.alive)
+    
+    def filter(self, selection=None, **conditions):
+        """
+        Select rows matching every condition
+        
+        String columns take a value or a list/set of values (None matches
+        NULL). Number and date columns take a (low, high) range, inclusive,
+        with None for an open end, or a single value to match exactly; dates
+        may be date objects or 'YYYY-MM-DD', numbers may be numeric strings.
+        
+        Example: snapshot.filter(company='MICL', category=['Laptop', 'Desktop'],
+                                 purchase_date=(None, '2020-12-31'))
+        
+        Args:
+            selection (list, optional): Rows to narrow down, defaults to all assets
+            **conditions: column=condition pairs
+        
+        Returns:
+            list: Row positions of the matching assets
+        
+        Raises:
+            KeyError: If a column is not in the snapshot
+            ValueError: If a number or date condition can't be parsed
+        """
+        with self._lock:
+            rows = selection if selection is not None else [i for i, live in enumerate(self.alive) if live]
+            
+            for name, condition in conditions.items():
+                if name not in self.kinds:
+                    raise KeyError(f"Column not in snapshot: {name}")
+                values = self.columns[name]
+                kind = self.kinds[name]
+                
+                if kind == 'string':
+                    wanted = condition if isinstance(condition, (list, tuple, set, frozenset)) else [condition]
+                    codes = self._codes[name]
+                    wanted_codes = {NULL_CODE if value is None else codes.get(value, -2) for value in wanted}
+                    rows = [i for i in rows if values[i] in wanted_codes]
+                else:
+                    if isinstance(condition, (list, tuple)):
+                        low, high = condition
+                    else:
+                        low = high = condition
+                    if kind == 'date':
+                        low = _parse_day(name, low) if low is not None else NULL_DAY + 1
+                        high = _parse_day(name, high) if high is not None else date.max.toordinal()
+                    else:
+                        low = _parse_number(name, low) if low is not None else -math.inf
+                        high = _parse_number(name, high) if high is not None else math.inf
+                    rows = [i for i in rows if low <= values[i] <= high]
+            
+            return rows
+    
+    def aggregate(self, column, func='count', selection=None):
+        """
+        Aggregate a column over a selection
+        
+        Args:
+            column (str): Column to aggregate (ignored for count)
+            func (str): count, sum, avg, min or max
+            selection (list, optional): Row positions, defaults to all assets
+        
+        Returns:
+            float: Aggregate value (count is an int; None if there is nothing to aggregate)
+        """
+        with self._lock:
+            rows = selection if selection is not None else [i for i, live in enumerate(self.alive) if live]
+            if func == 'count':
+                return len(rows)
+            
+            values = self.columns[column]
+            present = [values[i] for i in rows if not _is_null(self.kinds[column], values[i])]
+            return _reduce(func, present)
+    
+    def group_by(self, column, selection=None, value_column=None, func='count'):
+        """
+        Group a selection by a column and aggregate each group
+        
+        Date columns are grouped by year.
+        
+        Example: snapshot.group_by('category', value_column='estimated_cost', func='sum')
+        
+        Args:
+            column (str): Column to group by
+            selection (list, optional): Row positions, defaults to all assets
+            value_column (str, optional): Column to aggregate, required unless func is count
+            func (str): count, sum, avg, min or max
+        
+        Returns:
+            dict: Group value to aggregate value
+        
+        Raises:
+            KeyError: If a column is not in the snapshot
+        """
+        with self._lock:
+            for name in (column, value_column):
+                if name is not None and name not in self.kinds:
+                    raise KeyError(f"Column not in snapshot: {name}")
+            
+            rows = selection if selection is not None else [i for i, live in enumerate(self.alive) if live]
+            keys = self.columns[column]
+            
+            if self.kinds[column] == 'date':
+                # Fold day ordinals into years
+                years = {}
+                
+                def group_key(i):
+                    day = keys[i]
+                    year = years.get(day)
+                    if year is None and day not in years:
+                        year = years[day] = None if day == NULL_DAY else date.fromordinal(day).year
+                    return year
+                decode = lambda key: key
+            else:
+                group_key = keys.__getitem__
+                decode = lambda key: self._decode(column, key)
+            
+            groups = {}
+            if func == 'count':
+                for i in rows:
+                    key = group_key(i)
+                    groups[key] = groups.get(key, 0) + 1
+            else:
+                values = self.columns[value_column]
+                value_kind = self.kinds[value_column]
+                for i in rows:
+                    value = values[i]
+                    if not _is_null(value_kind, value):
+                        groups.setdefault(group_key(i), []).append(value)
+                groups = {key: _reduce(func, group) for key, group in groups.items()}
+            
+            return {decode(key): result for key, result in groups.items()}
+    
+    def rows(self, selection=None, columns=None):
+        """
+        Materialize selected rows for display or export
+        
+        Args:
+            selection (list, optional): Row positions, defaults to all assets
+            columns (list, optional): Columns to include, defaults to all loaded columns
+        
+        Returns:
+            list: List of dictionaries including the asset id
+        """
+        with self._lock:
+            rows = selection if selection is not None else [i for i, live in enumerate(self.alive) if live]
+            columns = columns or list(self.kinds)
+            return [
+                dict([('id', self.ids[i])] + [(name, self._decode(name, self.columns[name][i])) for name in columns])
+                for i in rows
+            ]
+
+def _day(value):
+    """Day ordinal of a date, date string or timestamp string (0 for NULL or unparsable)"""
+    if value is None or value == '':
+        return NULL_DAY
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return NULL_DAY
+
+def _parse_day(name, value):
+    """Day ordinal of a date condition"""
+    day = _day(value)
+    if day == NULL_DAY:
+        raise ValueError(f"Invalid date for {name}: {value!r}, expected YYYY-MM-DD")
+    return day
+
+def _parse_number(name, value):
+    """Float value of a number condition"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid number for {name}: {value!r}")
+
+def _is_null(kind, value):
+    """Whether a stored value represents NULL"""
+    if kind == 'number':
+        return math.isnan(value)
+    if kind == 'date':
+        return value == NULL_DAY
+    return value == NULL_CODE
+
+def _reduce(func, values):
+    """Apply an aggregate function to a list of values"""
+    if func == 'count':
+        return len(values)
+    if not values:
+        return None
+    if func == 'sum':
+        return math.fsum(values)
+    if func == 'avg':
+        return math.fsum(values) / len(values)
+    if func == 'min':
+        return min(values)
+    if func == 'max':
+        return max(values)
+    raise ValueError(f"Unknown aggregate: {func}")
+
+# Shared by every report and dashboard
+asset_snapshot = AssetSnapshot()
@@ -0,0 +1,89 @@
+"""
+Async Models for IT Asset Management System
+Coroutine versions of the asset, user and backup models for asyncio services and background jobs
+"""
+from functools import wraps
+from src.models.asset_model import AssetModel
+from src.models.user_model import UserModel
+from src.models.backup_model import BackupModel
+from src.utils.db_executor import read_executor, write_executor
+
+def _read(method):
+    """Coroutine that runs a model method on the read executor"""
+    @wraps(method)
+    async def run(self, *args, **kwargs):
+        return await self.readers.run(method, self.model, *args, **kwargs)
+    return run
+
+def _write(method):
+    """Coroutine that queues a model method for the single writer"""
+    @wraps(method)
+    async def run(self, *args, **kwargs):
+        return await self.writer.run(method, self.model, *args, **kwargs)
+    return run
+
+class AsyncModel:
+    model_class = None
+    
+    def __init__(self, readers=None, writer=None):
+        """
+        Initialize the async model
+        
+        Each method takes the same arguments and returns the same values as
+        the synchronous model's method of the same name; it just has to be
+        awaited. Reads run on a pool of reader threads, changes on a single
+        writer thread. Both executors bound their queues, so a burst of
+        calls waits (or fails with ExecutorBusyError) instead of starting
+        more threads.
+        
+        Args:
+            readers (DatabaseExecutor, optional): Executor for reads (default: the shared read_executor)
+            writer (DatabaseExecutor, optional): Executor for changes (default: the shared write_executor)
+        """
+        self.model = self.model_class()
+        self.readers = readers or read_executor
+        self.writer = writer or write_executor
+
+class AsyncAssetModel(AsyncModel):
+    model_class = AssetModel
+    
+    add_asset = _write(AssetModel.add_asset)
+    update_asset = _write(AssetModel.update_asset)
+    transition_asset = _write(AssetModel.transition_asset)
+    bulk_update_assets = _write(AssetModel.bulk_update_assets)
+    delete_asset = _write(AssetModel.delete_asset)
+    log_asset_action = _write(AssetModel.log_asset_action)
+    
+    get_asset_by_id = _read(AssetModel.get_asset_by_id)
+    get_asset_by_serial = _read(AssetModel.get_asset_by_serial)
+    get_all_assets = _read(AssetModel.get_all_assets)
+    get_assets_page = _read(AssetModel.get_assets_page)
+    get_assets_by_ids = _read(AssetModel.get_assets_by_ids)
+    get_asset_ids = _read(AssetModel.get_asset_ids)
+    get_active_assets = _read(AssetModel.get_active_assets)
+    get_stock_assets = _read(AssetModel.get_stock_assets)
+    get_asset_history = _read(AssetModel.get_asset_history)
+    get_field_changes = _read(AssetModel.get_field_changes)
+
+class AsyncUserModel(AsyncModel):
+    model_class = UserModel
+    
+    add_user = _write(UserModel.add_user)
+    update_user = _write(UserModel.update_user)
+    delete_user = _write(UserModel.delete_user)
+    
+    # Counts as a read: last-login times are written in the background, and a hash
+    # is only rewritten once, when its key derivation parameters are outdated
+    authenticate = _read(UserModel.authenticate)
+    get_user_by_id = _read(UserModel.get_user_by_id)
+    get_all_users = _read(UserModel.get_all_users)
+    check_permission = _read(UserModel.check_permission)
+
+class AsyncBackupModel(AsyncModel):
+    model_class = BackupModel
+    
+    # Both go through the writer, so no change of this process lands between copying and swapping the file
+    create_backup = _write(BackupModel.create_backup)
+    restore_backup = _write(BackupModel.restore_backup)
+    
+    get_all_backups = _read(BackupModel.get_all_backups)
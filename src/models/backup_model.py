@@ -7,11 +7,15 @@ import sqlite3
 import shutil
 from datetime import datetime, timedelta
 from src.config.database import db_config
+from src.utils.change_journal import change_journal
+from src.utils.authorization import authorization
+from src.utils.metrics import metrics
 
 class BackupModel:
     def __init__(self):
         """Initialize the backup model"""
         self.db = db_config
+        self.journal = change_journal
         self.backup_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backups')
         
         # Create backup directory if it doesn't exist
@@ -32,8 +36,13 @@ class BackupModel:
             backup_filename = f"assets_backup_{timestamp}.db"
             backup_path = os.path.join(self.backup_dir, backup_filename)
             
+            # Mark the journal first: everything journaled before this point is
+            # in the copy, and replaying later records over it is idempotent
+            self.journal.checkpoint(backup_path)
+            
             # Copy the database file
-            shutil.copy2(self.db.db_path, backup_path)
+            with metrics.phase('io'):
+                shutil.copy2(self.db.db_path, backup_path)
             
             # Record the backup in the database
             self.db.connect()
@@ -125,6 +134,11 @@ class BackupModel:
         """
         Restore the database from a backup
         
+        The backup is staged next to the live database and verified before
+        anything is touched. The connection pool is then quiesced, the live
+        file is snapshotted (hard link or reflink where possible) and the
+        staged file is swapped in with an atomic rename.
+        
         Args:
             backup_id (int): ID of the backup to restore
         
@@ -132,6 +146,7 @@ class BackupModel:
             bool: True if successful, False otherwise
             str: Message indicating success or error
         """
+        staged_path = f"{self.db.db_path}.restore"
         try:
             self.db.connect()
             
@@ -149,14 +164,33 @@ class BackupModel:
             # Close the database connection
             self.db.close()
             
-            # Create a backup of the current database before restoring
+            # Stage the backup on the same filesystem as the live database
+            with metrics.phase('io'):
+                self._clone_file(backup['path'], staged_path)
+            
+            with metrics.phase('db'):
+                valid, message = self._verify_database(staged_path)
+            if not valid:
+                os.remove(staged_path)
+                return False, f"Backup failed verification: {message}"
+            
+            # Snapshot the current database and swap the staged file in
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             pre_restore_backup = f"pre_restore_backup_{timestamp}.db"
             pre_restore_path = os.path.join(self.backup_dir, pre_restore_backup)
-            shutil.copy2(self.db.db_path, pre_restore_path)
             
-            # Restore the database
-            shutil.copy2(backup['path'], self.db.db_path)
+            with self.db.quiesce():
+                with metrics.phase('io'):
+                    self._snapshot_file(self.db.db_path, pre_restore_path)
+                    os.replace(staged_path, self.db.db_path)
+                self.journal.checkpoint(backup['path'], kind='restore')
+            
+            # Roles may differ in the restored users table
+            authorization.invalidate()
+            
+            # Bring a backup taken before a schema change up to date
+            if not self.db.initialize_database():
+                return False, "Database restored but could not be upgraded to the current schema"
             
             # Record the restore operation
             self.db.connect()
@@ -172,5 +206,101 @@ class BackupModel:
         except Exception as e:
             return False, f"Restore error: {e}"
         finally:
+            if os.path.exists(staged_path):
+                os.remove(staged_path)
             if hasattr(self, 'db') and self.db.connection:
                 self.db.close()
+    
+    def _verify_database(self, path):
+        """
+        Check that a database file is intact and has the application schema
+        
+        Args:
+            path (str): Path to the database file
+        
+        Returns:
+            bool: True if the database is usable, False otherwise
+            str: Description of the problem, if any
+        """
+        try:
+            connection = sqlite3.connect(path)
+            try:
+                result = connection.execute("PRAGMA quick_check").fetchone()[0]
+                if result != 'ok':
+                    return False, result
+                
+                # assets is a view since the lookup tables, a table before
+                tables = {row[0] for row in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"
+                )}
+                missing = {'assets', 'users', 'backups'} - tables
+                if missing:
+                    return False, f"missing tables: {', '.join(sorted(missing))}"
+                
+                return True, "ok"
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            return False, str(e)
+    
+    def _clone_file(self, source, destination):
+        """
+        Copy a file, using a copy-on-write reflink when the filesystem supports it
+        
+        Args:
+            source (str): File to copy
+            destination (str): Path of the new file
+        """
+        if not self._reflink(source, destination):
+            shutil.copyfile(source, destination)
+        
+        # Make sure the data is on disk before it gets renamed into place
+        with open(destination, 'rb') as f:
+            os.fsync(f.fileno())
+    
+    def _snapshot_file(self, source, destination):
+        """
+        Preserve the current contents of a file that is about to be replaced
+        
+        A hard link is enough because the live file is swapped out rather
+        than overwritten, so the snapshot keeps the old data for free.
+        Falls back to a reflink and finally to a full copy.
+        
+        Args:
+            source (str): File to snapshot
+            destination (str): Path of the snapshot
+        """
+        try:
+            os.link(source, destination)
+            return
+        except OSError:
+            pass
+        
+        if not self._reflink(source, destination):
+            shutil.copy2(source, destination)
+    
+    def _reflink(self, source, destination):
+        """
+        Try to create a copy-on-write clone of a file (Linux FICLONE)
+        
+        Args:
+            source (str): File to clone
+            destination (str): Path of the clone
+        
+        Returns:
+            bool: True if the clone was created, False otherwise
+        """
+        try:
+            import fcntl
+        except ImportError:
+            return False
+        
+        FICLONE = 0x40049409
+        try:
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            if os.path.exists(destination):
+                os.remove(destination)
+            return False
@@ -0,0 +1,239 @@
+"""
+Log Archive Model for IT Asset Management System
+Moves old audit log entries out of the main database into per-year archive files
+"""
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from src.config.database import db_config
+from src.utils.change_journal import change_journal
+
+# Audit entries older than this many days are moved to the archives
+LOG_ARCHIVE_HORIZON_DAYS = int(os.environ.get('ITAM_LOG_ARCHIVE_DAYS', 365))
+
+# Columns copied between the live table and the archives
+LOG_COLUMNS = "id, asset_id, action, details, user_id, timestamp"
+
+# SQLite allows 10 attached databases by default; one is kept spare
+MAX_ATTACHED_ARCHIVES = 9
+
+class LogArchiveModel:
+    def __init__(self, horizon_days=None):
+        """
+        Initialize the log archive model
+        
+        Args:
+            horizon_days (int, optional): Age in days after which entries are archived
+        """
+        self.db = db_config
+        self.journal = change_journal
+        self.horizon_days = LOG_ARCHIVE_HORIZON_DAYS if horizon_days is None else horizon_days
+        self.archive_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'archives')
+    
+    def archive_path(self, year):
+        """
+        Get the archive file for a year
+        
+        Args:
+            year (str): Four digit year
+        
+        Returns:
+            str: Path of the archive database
+        """
+        return os.path.join(self.archive_dir, f"asset_logs_{year}.db")
+    
+    def get_archive_paths(self):
+        """
+        Get the existing archive files, oldest first
+        
+        Returns:
+            list: Paths of the archive databases
+        """
+        if not os.path.isdir(self.archive_dir):
+            return []
+        
+        return [
+            os.path.join(self.archive_dir, filename)
+            for filename in sorted(os.listdir(self.archive_dir))
+            if filename.startswith('asset_logs_') and filename.endswith('.db')
+        ]
+    
+    def archive_logs(self, horizon_days=None, vacuum=True):
+        """
+        Move audit entries older than the horizon into per-year archive files
+        
+        Each year is copied and deleted in one transaction spanning both
+        files, so an interrupted run never loses or duplicates entries.
+        Entries are matched on (id, timestamp), which makes re-running after
+        a restore from an older backup safe. The deletes are journaled, so a
+        point-in-time recovery doesn't bring archived entries back.
+        
+        Args:
+            horizon_days (int, optional): Override the configured horizon
+            vacuum (bool): Reclaim the freed space so backups shrink as well
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message indicating success or error
+        """
+        horizon_days = self.horizon_days if horizon_days is None else horizon_days
+        
+        # asset_logs timestamps are UTC
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=horizon_days)).strftime('%Y-%m-%d %H:%M:%S')
+        
+        moved = 0
+        try:
+            self.db.connect()
+            
+            self.db.cursor.execute(
+                "SELECT DISTINCT substr(timestamp, 1, 4) AS year FROM asset_logs WHERE timestamp < ?",
+                (cutoff,)
+            )
+            years = [row['year'] for row in self.db.cursor.fetchall() if row['year'] and row['year'].isdigit()]
+            
+            if not years:
+                return True, "No audit log entries to archive"
+            
+            os.makedirs(self.archive_dir, exist_ok=True)
+            for year in years:
+                moved += self._archive_year(year, cutoff)
+        
+        except (sqlite3.Error, OSError) as e:
+            return False, f"Archive error: {e}"
+        finally:
+            self.db.close()
+        
+        if vacuum and moved:
+            self._vacuum()
+        
+        return True, f"Archived {moved} audit log entries from {', '.join(years)}"
+    
+    def _archive_year(self, year, cutoff):
+        """
+        Move one year's entries before the cutoff into its archive file
+        
+        Args:
+            year (str): Four digit year
+            cutoff (str): Entries strictly older than this timestamp are moved
+        
+        Returns:
+            int: Number of entries moved
+        """
+        start = f"{year}-01-01 00:00:00"
+        end = min(cutoff, f"{int(year) + 1}-01-01 00:00:00")
+        
+        self.db.cursor.execute("ATTACH DATABASE ? AS archive", (self.archive_path(year),))
+        try:
+            self.db.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archive.asset_logs (
+                id INTEGER NOT NULL,
+                asset_id INTEGER,
+                action TEXT NOT NULL,
+                details TEXT,
+                user_id INTEGER,
+                timestamp TIMESTAMP,
+                UNIQUE (id, timestamp)
+            )
+            ''')
+            self.db.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS archive.idx_asset_logs_asset_time ON asset_logs (asset_id, timestamp)"
+            )
+            
+            try:
+                self.db.cursor.execute(
+                    f"INSERT OR IGNORE INTO archive.asset_logs ({LOG_COLUMNS}) "
+                    f"SELECT {LOG_COLUMNS} FROM main.asset_logs WHERE timestamp >= ? AND timestamp < ?",
+                    (start, end)
+                )
+                self.db.cursor.execute(
+                    "SELECT id FROM main.asset_logs WHERE timestamp >= ? AND timestamp < ?",
+                    (start, end)
+                )
+                moved_ids = [row[0] for row in self.db.cursor.fetchall()]
+                self.db.cursor.execute(
+                    "DELETE FROM main.asset_logs WHERE timestamp >= ? AND timestamp < ?",
+                    (start, end)
+                )
+                self.db.commit()
+            except sqlite3.Error:
+                self.db.connection.rollback()
+                raise
+            
+            for log_id in moved_ids:
+                self.journal.record('asset_logs', 'delete', log_id)
+            return len(moved_ids)
+        finally:
+            self.db.cursor.execute("DETACH DATABASE archive")
+    
+    def _vacuum(self):
+        """Rebuild the main database file to release the space of archived entries"""
+        try:
+            self.db.connect()
+            self.db.cursor.execute("VACUUM")
+        except sqlite3.Error as e:
+            # Another connection is busy; the space is reused by new entries anyway
+            print(f"Database error: {e}")
+        finally:
+            self.db.close()
+    
+    def query_logs(self, where, params):
+        """
+        Query audit entries across the live table and every archive
+        
+        The archives are attached on demand, a batch at a time, and combined
+        with UNION ALL so callers see one history. After a restore from a
+        backup taken before the last archive run, entries are in both the
+        live table and an archive until the next run; they are returned
+        once, matched on (id, timestamp) like the archiving itself.
+        
+        Args:
+            where (str): WHERE clause on the log columns, e.g. "asset_id = ?"
+            params (tuple): Parameters for the WHERE clause
+        
+        Returns:
+            list: List of log dictionaries with the acting user's username, newest first
+        """
+        archives = self.get_archive_paths()
+        batches = [archives[i:i + MAX_ATTACHED_ARCHIVES] for i in range(0, len(archives), MAX_ATTACHED_ARCHIVES)]
+        
+        logs = []
+        seen = set()
+        try:
+            self.db.connect()
+            
+            for batch_number, batch in enumerate(batches or [[]]):
+                # The live table is read with the first batch
+                sources = [f"SELECT {LOG_COLUMNS} FROM main.asset_logs WHERE {where}"] if batch_number == 0 else []
+                
+                attached = 0
+                try:
+                    for i, path in enumerate(batch):
+                        self.db.cursor.execute(f"ATTACH DATABASE ? AS archive_{i}", (path,))
+                        attached += 1
+                        sources.append(f"SELECT {LOG_COLUMNS} FROM archive_{i}.asset_logs WHERE {where}")
+                    
+                    query = f"""
+                        SELECT al.*, u.username
+                        FROM ({' UNION ALL '.join(sources)}) al
+                        LEFT JOIN main.users u ON al.user_id = u.id
+                        ORDER BY al.timestamp DESC
+                    """
+                    self.db.cursor.execute(query, tuple(params) * len(sources))
+                    for log in self.db.cursor.fetchall():
+                        key = (log['id'], log['timestamp'])
+                        if key not in seen:
+                            seen.add(key)
+                            logs.append(dict(log))
+                finally:
+                    for i in range(attached):
+                        self.db.cursor.execute(f"DETACH DATABASE archive_{i}")
+            
+            if len(batches) > 1:
+                logs.sort(key=lambda log: log['timestamp'] or '', reverse=True)
+            return logs
+        
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+        finally:
+            self.db.close()
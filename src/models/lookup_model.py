@@ -0,0 +1,210 @@
+"""
+Lookup Model for IT Asset Management System
+Reference data for the low-cardinality asset columns (company, location, status...)
+"""
+import sqlite3
+import threading
+from src.config.database import db_config, LOOKUP_FIELDS, FILTER_FIELDS, lookup_column
+
+class LookupModel:
+    def __init__(self, db=None):
+        """
+        Cached mapping between lookup values and their IDs
+        
+        Assets store company, location, category and the other lookup
+        columns as IDs into lookup_values. Values are only ever added, so
+        the cached mapping stays valid until the database file itself is
+        replaced, which the generation of the data version reveals.
+        
+        Args:
+            db: Database configuration (defaults to the shared one)
+        """
+        self.db = db or db_config
+        self._ids = None
+        self._generation = None
+        self._counts = None
+        self._counts_version = None
+        self._lock = threading.Lock()
+    
+    def _mapping(self, cursor, reload=False):
+        """
+        Get the (field, value) -> ID mapping, loading it if needed
+        
+        Args:
+            cursor: Cursor of the calling thread's connection
+            reload (bool): Re-read the table even if the cache looks current
+        
+        Returns:
+            dict: (field, value): lookup ID
+        """
+        generation = self.db.data_version()[0]
+        ids = self._ids
+        if ids is None or reload or generation != self._generation:
+            cursor.execute("SELECT id, field, value FROM lookup_values")
+            ids = {(row[1], row[2]): row[0] for row in cursor.fetchall()}
+            with self._lock:
+                self._ids = ids
+                self._generation = generation
+        return ids
+    
+    def encode(self, values):
+        """
+        Translate assets column values into asset_rows column values
+        
+        Lookup columns become <column>_id holding the value's ID; other
+        columns pass through. Uses the calling thread's open connection.
+        Values not seen before are added: outside a transaction they are
+        committed on the spot and cached, inside one they stay uncached
+        until committed, so the cache never holds an ID that is rolled back.
+        
+        Args:
+            values (dict): assets column: value pairs
+        
+        Returns:
+            dict: asset_rows column: value pairs
+        """
+        cursor = self.db.cursor
+        ids = None
+        encoded = {}
+        for column, value in values.items():
+            if column not in LOOKUP_FIELDS or value is None:
+                encoded[lookup_column(column)] = value
+                continue
+            
+            key = (column, value if isinstance(value, str) else str(value))
+            if ids is None:
+                ids = self._mapping(cursor)
+            lookup_id = ids.get(key)
+            if lookup_id is None:
+                lookup_id = self._add_value(cursor, key)
+                ids = None
+            encoded[lookup_column(column)] = lookup_id
+        return encoded
+    
+    def find_ids(self, values):
+        """
+        Translate assets column values into asset_rows column values without adding any
+        
+        Read-only counterpart of encode() for WHERE conditions: a value
+        that was never stored cannot match a row, so it is reported instead
+        of being added. Uses the calling thread's open connection.
+        
+        Args:
+            values (dict): assets column: value pairs
+        
+        Returns:
+            dict: asset_rows column: value pairs, or None if a lookup value is unknown
+        """
+        cursor = self.db.cursor
+        ids = None
+        reloaded = False
+        encoded = {}
+        for column, value in values.items():
+            if column not in LOOKUP_FIELDS or value is None:
+                encoded[lookup_column(column)] = value
+                continue
+            
+            key = (column, value if isinstance(value, str) else str(value))
+            if ids is None:
+                ids = self._mapping(cursor)
+            lookup_id = ids.get(key)
+            if lookup_id is None and not reloaded:
+                # Another connection may have added it since the mapping was cached
+                ids = self._mapping(cursor, reload=True)
+                reloaded = True
+                lookup_id = ids.get(key)
+            if lookup_id is None:
+                return None
+            encoded[lookup_column(column)] = lookup_id
+        return encoded
+    
+    def _add_value(self, cursor, key):
+        """
+        Add a lookup value, possibly already added by another connection
+        
+        Args:
+            cursor: Cursor of the calling thread's connection
+            key (tuple): (field, value)
+        
+        Returns:
+            int: ID of the value
+        """
+        in_transaction = self.db.connection.in_transaction
+        cursor.execute("INSERT OR IGNORE INTO lookup_values (field, value) VALUES (?, ?)", key)
+        
+        if not in_transaction:
+            # Nothing else is pending, so commit and cache the new value right away
+            self.db.connection.commit()
+            return self._mapping(cursor, reload=True)[key]
+        
+        cursor.execute("SELECT id FROM lookup_values WHERE field = ? AND value = ?", key)
+        return cursor.fetchone()[0]
+    
+    def get_value_counts(self, fields=FILTER_FIELDS):
+        """
+        Get the values in use for the filter columns and how many assets have each
+        
+        One GROUP BY over the filter columns, answered from their covering
+        index, serves all of them at once. The result is cached until the
+        data version changes, so opening a filter list again costs nothing.
+        
+        Args:
+            fields (tuple): Filter columns wanted, e.g. ('company', 'status')
+        
+        Returns:
+            dict: field: list of (value, count) pairs sorted by value
+        """
+        version = self.db.data_version()
+        with self._lock:
+            counts = self._counts if version == self._counts_version else None
+        
+        if counts is None:
+            counts = self._count_values()
+            if counts is None:
+                return {}
+            with self._lock:
+                self._counts = counts
+                self._counts_version = version
+        
+        return {field: counts[field] for field in fields if field in counts}
+    
+    def _count_values(self):
+        """
+        Count the assets per value of every filter column
+        
+        Returns:
+            dict: field: list of (value, count) pairs sorted by value, or None on error
+        """
+        try:
+            self.db.connect()
+            
+            columns = ', '.join(lookup_column(field) for field in FILTER_FIELDS)
+            self.db.cursor.execute(f"SELECT {columns}, COUNT(*) FROM asset_rows GROUP BY {columns}")
+            
+            counts = {field: {} for field in FILTER_FIELDS}
+            for row in self.db.cursor.fetchall():
+                total = row[-1]
+                for field, lookup_id in zip(FILTER_FIELDS, row):
+                    if lookup_id is not None:
+                        counts[field][lookup_id] = counts[field].get(lookup_id, 0) + total
+            
+            ids = self._mapping(self.db.cursor)
+            known = set(ids.values())
+            if any(lookup_id not in known for field_counts in counts.values() for lookup_id in field_counts):
+                # Values added since the mapping was cached
+                ids = self._mapping(self.db.cursor, reload=True)
+            values = {lookup_id: value for (field, value), lookup_id in ids.items()}
+            
+            return {
+                field: sorted((values[lookup_id], count) for lookup_id, count in field_counts.items())
+                for field, field_counts in counts.items()
+            }
+        
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+        finally:
+            self.db.close()
+
+# Shared by every asset model and view
+lookup_model = LookupModel()
@@ -2,15 +2,144 @@
 User Model for IT Asset Management System
 Handles all database operations related to users and authentication
 """
+import os
+import hmac
+import atexit
 import sqlite3
 import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from src.config.database import db_config
+from src.utils.change_journal import change_journal
+from src.utils.security import hash_password, verify_password, needs_rehash
+from src.utils.authorization import authorization
+
+class AuthenticationCache:
+    def __init__(self, max_size=128, ttl=300):
+        """
+        Bounded cache of recently verified credentials
+        
+        Lets repeated logins (and password confirmations) skip the slow key
+        derivation. Entries hold a keyed digest of the password, never the
+        password itself, and are tied to the stored hash so a password change
+        invalidates them.
+        
+        Args:
+            max_size (int): Maximum number of cached credentials
+            ttl (float): Seconds a verification stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._key = os.urandom(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _digest(self, password):
+        return hmac.new(self._key, password.encode(), hashlib.sha256).digest()
+    
+    def check(self, user_id, stored_hash, password):
+        """Return True if this password was verified against this hash recently"""
+        with self._lock:
+            entry = self._entries.get((user_id, stored_hash))
+            if not entry:
+                return False
+            
+            digest, verified_at = entry
+            if time.monotonic() - verified_at > self.ttl:
+                del self._entries[(user_id, stored_hash)]
+                return False
+            
+            self._entries.move_to_end((user_id, stored_hash))
+        
+        return hmac.compare_digest(digest, self._digest(password))
+    
+    def add(self, user_id, stored_hash, password):
+        """Remember a successful verification"""
+        entry = (self._digest(password), time.monotonic())
+        with self._lock:
+            self._entries[(user_id, stored_hash)] = entry
+            self._entries.move_to_end((user_id, stored_hash))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Forget every cached verification"""
+        with self._lock:
+            self._entries.clear()
+    
+    def invalidate(self, user_id):
+        """Forget every cached verification for a user"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+class LastLoginWriter:
+    def __init__(self, db, journal, delay=5.0):
+        """
+        Coalesce last_login updates into one write every few seconds
+        
+        Args:
+            db: Database configuration
+            journal: Change journal
+            delay (float): Seconds to collect logins before writing them
+        """
+        self.db = db
+        self.journal = journal
+        self.delay = delay
+        self._pending = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+    
+    def record(self, user_id, timestamp):
+        """Queue a last_login update for a user"""
+        with self._lock:
+            self._pending[user_id] = timestamp
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self):
+        """Write all queued last_login updates in a single transaction"""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        
+        if not pending:
+            return
+        
+        try:
+            self.db.connect()
+            self.db.cursor.executemany(
+                "UPDATE users SET last_login = ? WHERE id = ?",
+                [(timestamp, user_id) for user_id, timestamp in pending.items()]
+            )
+            self.db.commit()
+            for user_id, timestamp in pending.items():
+                self.journal.record('users', 'update', user_id, {'last_login': timestamp})
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+        finally:
+            self.db.close()
+
+# Shared by every UserModel instance
+auth_cache = AuthenticationCache()
+last_login_writer = LastLoginWriter(db_config, change_journal)
 
 class UserModel:
     def __init__(self):
         """Initialize the user model"""
         self.db = db_config
+        self.journal = change_journal
+        self.auth_cache = auth_cache
+        self.last_login_writer = last_login_writer
+        self.authorization = authorization
     
     def _hash_password(self, password):
         """
@@ -20,14 +149,18 @@ class UserModel:
             password (str): Plain text password
         
         Returns:
-            str: Hashed password
+            str: Salted PBKDF2 hash
         """
-        return hashlib.sha256(password.encode()).hexdigest()
+        return hash_password(password)
     
     def authenticate(self, username, password):
         """
         Authenticate a user
         
+        Verification is deliberately slow, so callers on the UI thread should
+        run this on a worker thread. Hashes from older versions are upgraded
+        transparently after a successful login.
+        
         Args:
             username (str): Username
             password (str): Plain text password
@@ -38,31 +171,71 @@ class UserModel:
         try:
             self.db.connect()
             
-            hashed_password = self._hash_password(password)
-            
-            self.db.cursor.execute(
-                "SELECT * FROM users WHERE username = ? AND password = ?",
-                (username, hashed_password)
-            )
-            
+            self.db.cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
             user = self.db.cursor.fetchone()
             
-            if user:
-                # Update last login time
-                self.db.cursor.execute(
-                    "UPDATE users SET last_login = ? WHERE id = ?",
-                    (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), user['id'])
-                )
-                self.db.commit()
-                
-                # Convert sqlite3.Row to dict
-                return dict(user)
+            # Convert sqlite3.Row to dict
+            user = dict(user) if user else None
             
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+        finally:
+            self.db.close()
+        
+        # Verify outside the connection so slow hashing doesn't hold the database
+        if not user:
             return None
+        
+        stored_hash = user['password']
+        if not self.auth_cache.check(user['id'], stored_hash, password):
+            if not verify_password(password, stored_hash):
+                return None
+            
+            if needs_rehash(stored_hash):
+                stored_hash = self._upgrade_hash(user['id'], stored_hash, password)
+            
+            self.auth_cache.add(user['id'], stored_hash, password)
+        
+        # Update last login time (written in batches)
+        self.last_login_writer.record(user['id'], datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        
+        # Permission checks for this session can now be answered from memory
+        self.authorization.remember(user)
+        
+        return user
+    
+    def _upgrade_hash(self, user_id, old_hash, password):
+        """
+        Replace a legacy or weaker password hash after a successful login
+        
+        Args:
+            user_id (int): ID of the user
+            old_hash (str): Hash that was just verified
+            password (str): Plain text password
+        
+        Returns:
+            str: The hash now stored for the user
+        """
+        new_hash = self._hash_password(password)
+        try:
+            self.db.connect()
+            
+            # Only replace the hash we verified, in case the password changed meanwhile
+            self.db.cursor.execute(
+                "UPDATE users SET password = ? WHERE id = ? AND password = ?",
+                (new_hash, user_id, old_hash)
+            )
+            if self.db.cursor.rowcount == 0:
+                return old_hash
             
+            self.db.commit()
+            self.journal.record('users', 'update', user_id, {'password': new_hash})
+            return new_hash
+        
         except sqlite3.Error as e:
             print(f"Database error: {e}")
-            return None
+            return old_hash
         finally:
             self.db.close()
     
@@ -112,6 +285,7 @@ class UserModel:
             
             user_id = self.db.cursor.lastrowid
             self.db.commit()
+            self.journal.record('users', 'insert', user_id, dict(zip(fields, values)))
             
             return True, f"User added successfully with ID: {user_id}"
             
@@ -154,13 +328,9 @@ class UserModel:
                 user_data['password'] = self._hash_password(user_data['password'])
             
             # Prepare fields and values for update
-            set_clause = []
-            values = []
-            
-            for key, value in user_data.items():
-                if key != 'id':  # Skip id for updates
-                    set_clause.append(f"{key} = ?")
-                    values.append(value)
+            changes = {key: value for key, value in user_data.items() if key != 'id'}  # Skip id for updates
+            set_clause = [f"{key} = ?" for key in changes]
+            values = list(changes.values())
             
             # Add user_id to values
             values.append(user_id)
@@ -173,6 +343,8 @@ class UserModel:
                 return False, "No changes made to the user"
                 
             self.db.commit()
+            self.journal.record('users', 'update', user_id, changes)
+            self.authorization.invalidate(user_id)
             return True, "User updated successfully"
             
         except sqlite3.Error as e:
@@ -202,6 +374,9 @@ class UserModel:
             # Delete the user
             self.db.cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
             self.db.commit()
+            self.journal.record('users', 'delete', user_id)
+            self.authorization.invalidate(user_id)
+            self.auth_cache.invalidate(user_id)
             
             return True, "User deleted successfully"
             
@@ -270,24 +445,5 @@ class UserModel:
         Returns:
             bool: True if user has permission, False otherwise
         """
-        try:
-            self.db.connect()
-            
-            self.db.cursor.execute("SELECT role FROM users WHERE id = ?", (user_id,))
-            user = self.db.cursor.fetchone()
-            
-            if not user:
-                return False
-            
-            # Convert required_role to list if it's a string
-            if isinstance(required_role, str):
-                required_role = [required_role]
-            
-            # Check if user's role is in the required roles
-            return user['role'] in required_role
-            
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
-        finally:
-            self.db.close()
+        # Served from the authorization service's role cache
+        return self.authorization.has_role(user_id, required_role)
@@ -0,0 +1,169 @@
+"""
+Authorization Service for IT Asset Management System
+Central role and permission checks with an in-memory role cache
+"""
+import sqlite3
+import threading
+from src.config.database import db_config
+
+# Permissions
+ASSET_VIEW = 'asset.view'
+ASSET_CREATE = 'asset.create'
+ASSET_UPDATE = 'asset.update'
+ASSET_UPDATE_DOCUMENTS = 'asset.update_documents'
+ASSET_MOVE = 'asset.move'
+ASSET_DELETE = 'asset.delete'
+REPORT_VIEW = 'report.view'
+USER_VIEW = 'user.view'
+USER_MANAGE = 'user.manage'
+BACKUP_MANAGE = 'backup.manage'
+
+ALL_PERMISSIONS = (
+    ASSET_VIEW, ASSET_CREATE, ASSET_UPDATE, ASSET_UPDATE_DOCUMENTS, ASSET_MOVE, ASSET_DELETE,
+    REPORT_VIEW, USER_VIEW, USER_MANAGE, BACKUP_MANAGE
+)
+
+# Role-to-permission matrix (see "User Roles" in the README)
+ROLE_PERMISSIONS = {
+    'administrator': ALL_PERMISSIONS,
+    'standard': (ASSET_VIEW, ASSET_CREATE, ASSET_UPDATE, ASSET_UPDATE_DOCUMENTS, ASSET_MOVE,
+                 REPORT_VIEW, USER_VIEW),
+    'document_controller': (ASSET_VIEW, ASSET_UPDATE_DOCUMENTS, REPORT_VIEW),
+    'view_only': (ASSET_VIEW, REPORT_VIEW),
+}
+
+# Asset fields a document controller may change
+DOCUMENT_FIELDS = frozenset(['employee_id', 'designation', 'department', 'lpo_number', 'invoice_number'])
+
+class AuthorizationService:
+    def __init__(self, db=None):
+        """
+        Initialize the authorization service
+        
+        Args:
+            db: Database configuration used to look up roles on a cache miss
+        """
+        self.db = db or db_config
+        
+        # Compile the matrix once so every check is a set lookup
+        self.permissions = {role: frozenset(perms) for role, perms in ROLE_PERMISSIONS.items()}
+        self._roles = {}
+        self._lock = threading.Lock()
+    
+    def remember(self, user):
+        """
+        Seed the role cache from a freshly loaded user record
+        
+        Args:
+            user (dict): User data containing 'id' and 'role'
+        """
+        if user and user.get('id') is not None:
+            with self._lock:
+                self._roles[user['id']] = user.get('role')
+    
+    def invalidate(self, user_id=None):
+        """
+        Drop cached roles
+        
+        Args:
+            user_id (int, optional): User to forget, or None to clear everything
+        """
+        with self._lock:
+            if user_id is None:
+                self._roles.clear()
+            else:
+                self._roles.pop(user_id, None)
+    
+    def get_role(self, user_id):
+        """
+        Get a user's current role
+        
+        Args:
+            user_id (int): ID of the user
+        
+        Returns:
+            str: Role name, or None if the user does not exist or the role can't be read
+        """
+        try:
+            return self._roles[user_id]
+        except KeyError:
+            pass
+        
+        try:
+            role = self._load_role(user_id)
+        except sqlite3.Error as e:
+            # Not cached, so a locked database denies this check only
+            print(f"Database error: {e}")
+            return None
+        
+        with self._lock:
+            self._roles[user_id] = role
+        return role
+    
+    def _load_role(self, user_id):
+        """
+        Read a user's role from the database
+        
+        Raises:
+            sqlite3.Error: If the role could not be read
+        """
+        try:
+            self.db.connect()
+            self.db.cursor.execute("SELECT role FROM users WHERE id = ?", (user_id,))
+            user = self.db.cursor.fetchone()
+            return user['role'] if user else None
+        finally:
+            self.db.close()
+    
+    def has_permission(self, user, permission):
+        """
+        Check whether a user holds a permission
+        
+        Args:
+            user (dict or int): User data or user ID
+            permission (str): Permission to check
+        
+        Returns:
+            bool: True if the user's role grants the permission, False otherwise
+        """
+        if user is None:
+            return False
+        
+        user_id = user.get('id') if isinstance(user, dict) else user
+        return permission in self.permissions.get(self.get_role(user_id), ())
+    
+    def has_role(self, user, roles):
+        """
+        Check whether a user has one of the given roles
+        
+        Args:
+            user (dict or int): User data or user ID
+            roles (str or list): Required role(s)
+        
+        Returns:
+            bool: True if the user's role is one of the roles, False otherwise
+        """
+        if isinstance(roles, str):
+            roles = [roles]
+        
+        user_id = user.get('id') if isinstance(user, dict) else user
+        return self.get_role(user_id) in roles
+    
+    def can_update_asset_fields(self, user, fields):
+        """
+        Check whether a user may change the given asset fields
+        
+        Args:
+            user (dict or int): User data or user ID
+            fields (iterable): Names of the fields being changed
+        
+        Returns:
+            bool: True if the update is allowed, False otherwise
+        """
+        if self.has_permission(user, ASSET_UPDATE):
+            return True
+        
+        return self.has_permission(user, ASSET_UPDATE_DOCUMENTS) and DOCUMENT_FIELDS.issuperset(fields)
+
+# Create an instance for direct usage
+authorization = AuthorizationService()
@@ -0,0 +1,367 @@
+"""
+Change Journal for IT Asset Management System
+Append-only log of committed mutations used for point-in-time recovery
+"""
+import os
+import json
+import atexit
+import shutil
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+# Tables whose mutations are journaled and can be replayed
+JOURNALED_TABLES = ('assets', 'users', 'asset_logs', 'asset_changes')
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+# Seconds between attempts to write a batch after a disk error
+RETRY_INTERVAL = 1.0
+
+class ChangeJournalError(Exception):
+    """Raised by flush() once the writer has stopped and buffered records can't be written"""
+
+class ChangeJournal:
+    def __init__(self, journal_dir="journal", segment_size=16 * 1024 * 1024,
+                 group_commit_interval=0.05, group_commit_size=256):
+        """
+        Initialize the change journal
+        
+        Records are buffered in memory and written by a background thread,
+        which fsyncs them in groups so writers never wait on the disk. A
+        batch that fails to write is kept and retried, and only counts as
+        durable once it has been fsynced.
+        
+        Args:
+            journal_dir (str): Directory for journal segments, relative to the application root
+            segment_size (int): Size in bytes after which a new segment is started
+            group_commit_interval (float): Seconds to wait for more records before an fsync
+            group_commit_size (int): Number of buffered records that triggers an immediate fsync
+        """
+        self.journal_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), journal_dir)
+        self.segment_size = segment_size
+        self.group_commit_interval = group_commit_interval
+        self.group_commit_size = group_commit_size
+        self.enabled = True
+        
+        self._condition = threading.Condition()
+        self._pending = []
+        self._seq = None
+        self._durable_seq = 0
+        self._flush_requested = False
+        self._failure = None
+        self._writer = None
+        self._segment = None
+        self._segment_path = None
+    
+    def record(self, table, op, row_id, values=None):
+        """
+        Append a committed mutation to the journal
+        
+        Args:
+            table (str): Table that was changed
+            op (str): 'insert', 'update' or 'delete'
+            row_id (int): Primary key of the affected row
+            values (dict, optional): Column values written by the mutation
+        """
+        if not self.enabled:
+            return
+        
+        self._append({'table': table, 'op': op, 'id': row_id, 'values': values or {}})
+    
+    def checkpoint(self, snapshot_path, kind='backup'):
+        """
+        Mark a point from which the journal can be replayed on top of a snapshot
+        
+        Args:
+            snapshot_path (str): Database file holding the state at this point
+            kind (str): 'backup' or 'restore'
+        """
+        if not self.enabled:
+            return
+        
+        self._append({'op': 'checkpoint', 'kind': kind, 'path': snapshot_path})
+    
+    def _append(self, entry):
+        """Assign a sequence number and timestamp and hand the entry to the writer"""
+        with self._condition:
+            if self._seq is None:
+                self._seq = self._durable_seq = self._last_sequence()
+            if self._writer is None:
+                self._start_writer()
+            
+            self._seq += 1
+            entry['seq'] = self._seq
+            entry['ts'] = datetime.now().strftime(TIMESTAMP_FORMAT)
+            self._pending.append(json.dumps(entry, separators=(',', ':'), default=str))
+            
+            if len(self._pending) >= self.group_commit_size:
+                self._condition.notify_all()
+    
+    def flush(self, timeout=None):
+        """
+        Wait until every record appended so far is fsynced
+        
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait
+        
+        Returns:
+            bool: True if the journal is durable up to the last record,
+                False if the timeout passed first (e.g. while a disk error is retried)
+        
+        Raises:
+            ChangeJournalError: If the writer stopped, so the records will never be written
+        """
+        with self._condition:
+            if self._seq is None or self._durable_seq >= self._seq:
+                return True
+            
+            target = self._seq
+            self._flush_requested = True
+            self._condition.notify_all()
+            durable = self._condition.wait_for(lambda: self._durable_seq >= target or self._failure, timeout)
+            if self._durable_seq < target and self._failure:
+                raise ChangeJournalError(f"Change journal writer stopped: {self._failure}")
+            return bool(durable)
+    
+    def _flush_at_exit(self):
+        """Give buffered records a last chance to reach the disk when the application exits"""
+        try:
+            if not self.flush(10):
+                print("Change journal: some records could not be written before exit")
+        except ChangeJournalError as e:
+            print(e)
+    
+    def _start_writer(self):
+        """Start the background group-commit thread (caller holds the condition)"""
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self._writer = threading.Thread(target=self._run_writer, name="change-journal-writer")
+        self._writer.daemon = True
+        self._writer.start()
+        atexit.register(self._flush_at_exit)
+    
+    def _run_writer(self):
+        """Write buffered records in groups, one fsync per group"""
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._pending)
+                    
+                    # Give concurrent writers a moment to join this group
+                    self._condition.wait_for(
+                        lambda: len(self._pending) >= self.group_commit_size or self._flush_requested,
+                        self.group_commit_interval
+                    )
+                    batch = self._pending
+                    self._pending = []
+                    self._flush_requested = False
+                
+                try:
+                    segment = self._open_segment()
+                    segment.write('\n'.join(batch) + '\n')
+                    segment.flush()
+                    os.fsync(segment.fileno())
+                except OSError as e:
+                    print(f"Change journal write error, retrying: {e}")
+                    self._close_segment()
+                    with self._condition:
+                        # Keep the batch ahead of newer records and try again shortly
+                        self._pending = batch + self._pending
+                        self._condition.wait(RETRY_INTERVAL)
+                    continue
+                
+                with self._condition:
+                    self._durable_seq += len(batch)
+                    self._condition.notify_all()
+        
+        except Exception as e:
+            print(f"Change journal writer stopped: {e}")
+            with self._condition:
+                self._failure = e
+                self._condition.notify_all()
+                
+    def _close_segment(self):
+        """Drop the current segment file after a failed write; it is reopened for the retry"""
+        segment, self._segment = self._segment, None
+        if segment is not None:
+            try:
+                segment.close()
+            except OSError:
+                pass
+    
+    def _open_segment(self):
+        """Return the current segment file, rotating it when it is full"""
+        if self._segment and self._segment.tell() >= self.segment_size:
+            self._segment.close()
+            self._segment = None
+        
+        if self._segment is None:
+            segments = self._segment_files()
+            if segments and os.path.getsize(segments[-1]) < self.segment_size:
+                self._segment_path = segments[-1]
+            else:
+                self._segment_path = os.path.join(self.journal_dir, f"changes_{self._durable_seq + 1:012d}.jsonl")
+            self._segment = open(self._segment_path, 'a', encoding='utf-8')
+            
+            # Terminate a line torn by a failed write, so the retried records start on a line of their own
+            if self._segment.tell() > 0:
+                with open(self._segment_path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self._segment.write('\n')
+        
+        return self._segment
+    
+    def _segment_files(self):
+        """List journal segments in sequence order"""
+        if not os.path.isdir(self.journal_dir):
+            return []
+        
+        return [
+            os.path.join(self.journal_dir, filename)
+            for filename in sorted(os.listdir(self.journal_dir))
+            if filename.startswith('changes_') and filename.endswith('.jsonl')
+        ]
+    
+    def _last_sequence(self):
+        """Find the sequence number of the last record on disk"""
+        segments = self._segment_files()
+        if not segments:
+            return 0
+        
+        with open(segments[-1], 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - 65536, 0))
+            lines = f.read().splitlines()
+        
+        for line in reversed(lines):
+            try:
+                return json.loads(line)['seq']
+            except (ValueError, KeyError):
+                continue  # Torn write at the end of the segment
+        
+        # Fall back to the sequence the segment was named after
+        return int(os.path.basename(segments[-1])[8:20]) - 1
+    
+    def iter_records(self):
+        """
+        Read every journal record in sequence order
+        
+        Yields:
+            dict: Journal record
+        """
+        self.flush()
+        last_seq = 0
+        for path in self._segment_files():
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write at the end of the segment
+                    
+                    # A batch retried after a disk error may have reached the file more than once
+                    if record.get('seq', 0) <= last_seq:
+                        continue
+                    last_seq = record.get('seq', last_seq)
+                    yield record
+    
+    def recover(self, until, output_path):
+        """
+        Rebuild the database as it was at a point in time
+        
+        The latest checkpoint at or before the target time is copied to the
+        output path and the journal is replayed on top of it. Replay is
+        idempotent, so records that were already in the snapshot are harmless.
+        
+        Args:
+            until (str): Target time, 'YYYY-MM-DD HH:MM:SS'
+            output_path (str): Where to write the recovered database
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message indicating success or error
+        """
+        try:
+            target = datetime.fromisoformat(until)
+            # A target given to the second includes everything within that second
+            target = target.replace(microsecond=target.microsecond or 999999).strftime(TIMESTAMP_FORMAT)
+        except ValueError:
+            return False, f"Invalid timestamp: {until}"
+        
+        try:
+            records = [r for r in self.iter_records() if r.get('ts', '') <= target]
+        except ChangeJournalError as e:
+            return False, f"Recovery error: {e}"
+        
+        checkpoint = None
+        for record in records:
+            if record['op'] == 'checkpoint' and os.path.exists(record['path']):
+                checkpoint = record
+        
+        if not checkpoint:
+            return False, "No snapshot found before the requested time"
+        
+        try:
+            shutil.copyfile(checkpoint['path'], output_path)
+            
+            connection = sqlite3.connect(output_path)
+            try:
+                columns = {
+                    table: {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+                    for table in JOURNALED_TABLES
+                }
+                
+                replayed = 0
+                for record in records:
+                    if record['seq'] <= checkpoint['seq'] or record.get('table') not in columns:
+                        continue
+                    self._apply(connection, record, columns[record['table']])
+                    replayed += 1
+                
+                connection.commit()
+            finally:
+                connection.close()
+            
+            return True, (f"Recovered to {until} from {os.path.basename(checkpoint['path'])} "
+                          f"with {replayed} journaled changes")
+        
+        except (OSError, sqlite3.Error) as e:
+            return False, f"Recovery error: {e}"
+    
+    def _apply(self, connection, record, table_columns):
+        """Replay a single journal record"""
+        table = record['table']
+        values = {k: v for k, v in record['values'].items() if k in table_columns and k != 'id'}
+        
+        if record['op'] == 'insert':
+            fields = ['id'] + list(values)
+            placeholders = ', '.join('?' for _ in fields)
+            connection.execute(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(fields)}) VALUES ({placeholders})",
+                [record['id']] + list(values.values())
+            )
+        elif record['op'] == 'update' and values:
+            set_clause = ', '.join(f"{key} = ?" for key in values)
+            connection.execute(
+                f"UPDATE {table} SET {set_clause} WHERE id = ?",
+                list(values.values()) + [record['id']]
+            )
+        elif record['op'] == 'delete':
+            connection.execute(f"DELETE FROM {table} WHERE id = ?", (record['id'],))
+
+
+# Create an instance for direct usage
+change_journal = ChangeJournal()
+
+if __name__ == "__main__":
+    # If this script is run directly, recover the database to a point in time
+    parser = argparse.ArgumentParser(description="Point-in-time recovery from the change journal")
+    parser.add_argument("--until", required=True, help="Target time (YYYY-MM-DD HH:MM:SS)")
+    parser.add_argument("--output", required=True, help="Path of the recovered database file")
+    args = parser.parse_args()
+    
+    success, message = change_journal.recover(args.until, args.output)
+    print(message)
+    raise SystemExit(0 if success else 1)
@@ -0,0 +1,130 @@
+"""
+Database Executor for IT Asset Management System
+Runs blocking database calls for asyncio code on a fixed set of threads, with back-pressure
+"""
+import os
+import asyncio
+import weakref
+import threading
+from time import perf_counter
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from src.config.database import db_config
+from src.utils.metrics import metrics
+
+# Threads answering reads, each with its own database connection
+DB_READERS = int(os.environ.get('ITAM_DB_READERS', 4))
+
+# Calls accepted per executor (running plus queued) before callers have to wait
+DB_MAX_PENDING = int(os.environ.get('ITAM_DB_MAX_PENDING', 64))
+
+# Seconds a caller waits for room in a full queue before ExecutorBusyError
+DB_QUEUE_TIMEOUT = float(os.environ.get('ITAM_DB_QUEUE_TIMEOUT', 10))
+
+class ExecutorBusyError(Exception):
+    """Raised when a call can't be queued because the executor stayed full"""
+
+class DatabaseExecutor:
+    def __init__(self, name, workers=DB_READERS, max_pending=DB_MAX_PENDING, queue_timeout=DB_QUEUE_TIMEOUT):
+        """
+        Initialize the database executor
+        
+        Coroutines await run() instead of calling the models directly, so
+        the event loop never blocks on SQLite. The number of threads is
+        fixed, and each keeps its database connection open between calls.
+        At most max_pending calls are running or queued at a time; further
+        callers wait for a free place (back-pressure) and give up with
+        ExecutorBusyError after queue_timeout seconds, so a burst of requests
+        can neither start more threads nor grow the queue without limit.
+        
+        Args:
+            name (str): Name for the threads and metrics, e.g. 'db-reader'
+            workers (int): Number of threads
+            max_pending (int): Calls running or queued before callers wait
+            queue_timeout (float): Seconds to wait for a free place (None waits forever)
+        """
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=name, initializer=db_config.reuse_connections
+        )
+        
+        # One semaphore per event loop, since asyncio primitives are bound to a loop
+        self._slots = weakref.WeakKeyDictionary()
+        self._slots_lock = threading.Lock()
+    
+    def _slots_for(self, loop):
+        """Get the semaphore counting free places for an event loop"""
+        with self._slots_lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+            return slots
+    
+    async def run(self, function, *args, **kwargs):
+        """
+        Call a blocking function on one of the executor's threads
+        
+        Args:
+            function (callable): Function to call
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+        
+        Returns:
+            The function's return value (its exceptions are raised here)
+        
+        Raises:
+            ExecutorBusyError: If the queue stayed full for queue_timeout seconds
+        """
+        loop = asyncio.get_running_loop()
+        slots = self._slots_for(loop)
+        queued_at = perf_counter()
+        try:
+            await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            metrics.increment('db_executor_rejected', executor=self.name)
+            raise ExecutorBusyError(f"Too many database requests waiting for {self.name}, try again later")
+        
+        try:
+            future = self._pool.submit(self._call, queued_at, partial(function, *args, **kwargs))
+        except RuntimeError:
+            # Shut down
+            slots.release()
+            raise
+        
+        # Give the place back when the call has finished, even if the caller stopped waiting for it
+        future.add_done_callback(lambda _: self._release(loop, slots))
+        return await asyncio.wrap_future(future)
+    
+    def _call(self, queued_at, call):
+        """Run a call on a worker thread, recording how long it waited"""
+        metrics.observe('db_executor_wait_seconds', perf_counter() - queued_at, executor=self.name)
+        return call()
+    
+    def _release(self, loop, slots):
+        """Free a place from whichever thread the call finished on"""
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:
+            # The event loop is already closed; nobody is waiting any more
+            pass
+    
+    def shutdown(self, wait=True):
+        """
+        Stop accepting calls
+        
+        Args:
+            wait (bool): Whether to wait for running and queued calls to finish
+        """
+        self._pool.shutdown(wait=wait)
+
+# Shared by every async model; a single writer, so SQLite's write lock is never contended among them
+read_executor = DatabaseExecutor('db-reader')
+write_executor = DatabaseExecutor('db-writer', workers=1)
+
+
+# Help texts for the exported executor metrics
+metrics.describe('db_executor_wait_seconds', "Time database calls spent queued before a thread picked them up")
+metrics.describe('db_executor_rejected_total', "Database calls refused because the executor queue stayed full")
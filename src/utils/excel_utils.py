@@ -3,11 +3,8 @@ Excel Utilities for IT Asset Management System
 Handles import and export of data to/from Excel
 """
 import os
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
 from datetime import datetime
-from tkinter import filedialog, messagebox
-import tkinter as tk
+from src.utils.metrics import metrics
 
 class ExcelUtils:
     def __init__(self, asset_controller=None):
@@ -26,6 +23,7 @@ class ExcelUtils:
         os.makedirs(self.exports_dir, exist_ok=True)
         os.makedirs(self.templates_dir, exist_ok=True)
     
+    @metrics.traced('excel.export')
     def export_assets_to_excel(self, assets, filename=None):
         """
         Export asset data to Excel
@@ -42,6 +40,11 @@ class ExcelUtils:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"asset_export_{timestamp}.xlsx"
         
+        # openpyxl takes longer to import than the rest of the application
+        # together, so it is only loaded once a workbook is needed
+        import openpyxl
+        from openpyxl.styles import Font, Alignment, PatternFill
+        
         # Create a new workbook and select the active sheet
         wb = openpyxl.Workbook()
         sheet = wb.active
@@ -104,16 +107,18 @@ class ExcelUtils:
         
         # Save the workbook
         output_path = os.path.join(self.exports_dir, filename)
-        wb.save(output_path)
+        with metrics.phase('io'):
+            wb.save(output_path)
         
         return output_path
     
-    def import_assets_from_excel(self, file_path=None):
+    def import_assets_from_excel(self, file_path=None, progress=None):
         """
         Import assets from Excel file
         
         Args:
             file_path (str, optional): Path to Excel file
+            progress (function, optional): Called as progress(row_num, success, message) after each row
         
         Returns:
             tuple: (success, message, imported_count)
@@ -123,6 +128,9 @@ class ExcelUtils:
         
         # If file path not provided, open file dialog
         if not file_path:
+            # Imported here so headless callers (command line, scripts) never load tkinter
+            from tkinter import filedialog
+            
             file_path = filedialog.askopenfilename(
                 title="Select Excel File",
                 filetypes=[("Excel files", "*.xlsx *.xls")],
@@ -132,85 +140,32 @@ class ExcelUtils:
             if not file_path:  # User cancelled
                 return False, "Import cancelled", 0
         
+        return self._import_file(file_path, progress)
+    
+    @metrics.traced('excel.import')
+    def _import_file(self, file_path, progress=None):
+        """
+        Import assets from a chosen Excel file
+        
+        Args:
+            file_path (str): Path to Excel file
+            progress (function, optional): Called as progress(row_num, success, message) after each row
+        
+        Returns:
+            tuple: (success, message, imported_count)
+        """
         try:
-            # Load the workbook
-            wb = openpyxl.load_workbook(file_path)
-            sheet = wb.active
-            
-            # Get headers from the first row
-            headers = [cell.value for cell in sheet[1]]
-            
-            # Map Excel headers to database fields
-            field_mapping = {
-                "Serial Number": "serial_number",
-                "Company": "company",
-                "Location": "location",
-                "Category": "category",
-                "Status": "status",
-                "Username": "username",
-                "Designation": "designation",
-                "Department": "department",
-                "Model": "model",
-                "Description": "description",
-                "Issue Date": "issue_date",
-                "Computer ID": "computer_id",
-                "Working Status": "working_status",
-                "Condition": "condition",
-                "Audit": "audit",
-                "Employee ID": "employee_id",
-                "Purchase Date": "purchase_date",
-                "Rack/Tray Number": "rack_tray_number",
-                "Service Center": "service_center",
-                "LPO Number": "lpo_number",
-                "Invoice Number": "invoice_number",
-                "Supplier": "supplier",
-                "Estimated Cost": "estimated_cost",
-                "Remarks": "remarks"
-            }
-            
-            # Validate required headers
-            required_fields = ["Serial Number", "Category"]
-            for field in required_fields:
-                if field not in headers:
-                    return False, f"Required field '{field}' not found in Excel file", 0
-            
-            # Process data rows
             imported_count = 0
             errors = []
             
-            for row_num, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), 2):
-                # Skip empty rows
-                if all(cell is None or cell == "" for cell in row):
-                    continue
-                
-                # Create asset data dictionary
-                asset_data = {}
-                for col_num, value in enumerate(row):
-                    if col_num < len(headers) and headers[col_num] in field_mapping:
-                        db_field = field_mapping[headers[col_num]]
-                        asset_data[db_field] = value
-                
-                # Validate required fields
-                if not asset_data.get("serial_number"):
-                    errors.append(f"Row {row_num}: Missing Serial Number")
-                    continue
-                    
-                if not asset_data.get("category"):
-                    errors.append(f"Row {row_num}: Missing Category")
-                    continue
-                
-                # Check for duplicate serial numbers
-                existing_asset = self.asset_controller.get_asset_by_serial(asset_data["serial_number"])
-                if existing_asset:
-                    errors.append(f"Row {row_num}: Duplicate Serial Number '{asset_data['serial_number']}'")
-                    continue
-                
-                # Add the asset
-                success, message = self.asset_controller.add_asset(asset_data)
+            for row_num, success, message in self.iter_import_rows(file_path):
                 if success:
                     imported_count += 1
                 else:
                     errors.append(f"Row {row_num}: {message}")
+                
+                if progress:
+                    progress(row_num, success, message)
             
             # Return results
             if errors:
@@ -218,9 +173,100 @@ class ExcelUtils:
             else:
                 return True, f"Successfully imported {imported_count} assets", imported_count
                 
+        except ValueError as e:
+            return False, str(e), 0
         except Exception as e:
             return False, f"Import error: {str(e)}", 0
     
+    def iter_import_rows(self, file_path):
+        """
+        Import assets from an Excel file one row at a time
+        
+        Args:
+            file_path (str): Path to Excel file
+        
+        Yields:
+            tuple: (row_num, success, message) for each non-empty data row
+        
+        Raises:
+            ValueError: If a required column is missing
+        """
+        import openpyxl
+        
+        # Load the workbook
+        with metrics.phase('io'):
+            wb = openpyxl.load_workbook(file_path)
+        sheet = wb.active
+        
+        # Get headers from the first row
+        headers = [cell.value for cell in sheet[1]]
+        
+        # Map Excel headers to database fields
+        field_mapping = {
+            "Serial Number": "serial_number",
+            "Company": "company",
+            "Location": "location",
+            "Category": "category",
+            "Status": "status",
+            "Username": "username",
+            "Designation": "designation",
+            "Department": "department",
+            "Model": "model",
+            "Description": "description",
+            "Issue Date": "issue_date",
+            "Computer ID": "computer_id",
+            "Working Status": "working_status",
+            "Condition": "condition",
+            "Audit": "audit",
+            "Employee ID": "employee_id",
+            "Purchase Date": "purchase_date",
+            "Rack/Tray Number": "rack_tray_number",
+            "Service Center": "service_center",
+            "LPO Number": "lpo_number",
+            "Invoice Number": "invoice_number",
+            "Supplier": "supplier",
+            "Estimated Cost": "estimated_cost",
+            "Remarks": "remarks"
+        }
+        
+        # Validate required headers
+        required_fields = ["Serial Number", "Category"]
+        for field in required_fields:
+            if field not in headers:
+                raise ValueError(f"Required field '{field}' not found in Excel file")
+        
+        # Process data rows
+        for row_num, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), 2):
+            # Skip empty rows
+            if all(cell is None or cell == "" for cell in row):
+                continue
+            
+            # Create asset data dictionary
+            asset_data = {}
+            for col_num, value in enumerate(row):
+                if col_num < len(headers) and headers[col_num] in field_mapping:
+                    db_field = field_mapping[headers[col_num]]
+                    asset_data[db_field] = value
+            
+            # Validate required fields
+            if not asset_data.get("serial_number"):
+                yield row_num, False, "Missing Serial Number"
+                continue
+                
+            if not asset_data.get("category"):
+                yield row_num, False, "Missing Category"
+                continue
+            
+            # Check for duplicate serial numbers
+            existing_asset = self.asset_controller.get_asset_by_serial(asset_data["serial_number"])
+            if existing_asset:
+                yield row_num, False, f"Duplicate Serial Number '{asset_data['serial_number']}'"
+                continue
+            
+            # Add the asset
+            success, message = self.asset_controller.add_asset(asset_data)
+            yield row_num, success, message
+    
     def create_import_template(self):
         """
         Create an import template file
@@ -228,6 +274,9 @@ class ExcelUtils:
         Returns:
             str: Path to the template file
         """
+        import openpyxl
+        from openpyxl.styles import Font, Alignment, PatternFill
+        
         # Create a new workbook and select the active sheet
         wb = openpyxl.Workbook()
         sheet = wb.active
@@ -303,6 +352,9 @@ class ExcelUtils:
         Returns:
             str: Path to the form file
         """
+        import openpyxl
+        from openpyxl.styles import Font, Alignment, PatternFill
+        
         # Create a new workbook and select the active sheet
         wb = openpyxl.Workbook()
         sheet = wb.active
@@ -378,6 +430,9 @@ class ExcelUtils:
         Returns:
             str: Path to the form file
         """
+        import openpyxl
+        from openpyxl.styles import Font, Alignment, PatternFill
+        
         # Create a new workbook and select the active sheet
         wb = openpyxl.Workbook()
         sheet = wb.active
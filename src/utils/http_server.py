@@ -0,0 +1,262 @@
+"""
+HTTP Server for IT Asset Management System
+Minimal asyncio HTTP/1.1 server with JSON responses and keep-alive connections
+"""
+import re
+import json
+import asyncio
+from time import perf_counter
+from datetime import date, datetime
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl, unquote
+from src.utils.metrics import metrics
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+# Seconds an idle keep-alive connection is kept open
+KEEP_ALIVE_TIMEOUT = 15
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        """
+        Error that is sent to the client as a JSON response
+        
+        Args:
+            status (int): HTTP status code
+            message (str): Message for the client
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class Request:
+    __slots__ = ('method', 'path', 'query', 'version', 'headers', 'body', 'params')
+    
+    def __init__(self, method, path, query, version, headers, body):
+        """
+        One parsed HTTP request
+        
+        Args:
+            method (str): Request method, e.g. 'GET'
+            path (str): Decoded path without the query string
+            query (dict): Query parameters (the last value wins for repeated names)
+            version (str): Protocol version, e.g. 'HTTP/1.1'
+            headers (dict): Headers with lower-case names
+            body (bytes): Request body
+        """
+        self.method = method
+        self.path = path
+        self.query = query
+        self.version = version
+        self.headers = headers
+        self.body = body
+        self.params = {}
+    
+    def json(self):
+        """
+        Parse the body as a JSON object
+        
+        Returns:
+            dict: The parsed object ({} for an empty body)
+        
+        Raises:
+            HTTPError: If the body is not a JSON object
+        """
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return data
+
+class HTTPServer:
+    def __init__(self, host="127.0.0.1", port=8080, max_body_size=MAX_BODY_SIZE, keep_alive_timeout=KEEP_ALIVE_TIMEOUT):
+        """
+        Initialize the HTTP server
+        
+        Handlers are coroutines registered with route(). They receive the
+        Request and return a JSON-serializable payload, or a (status,
+        payload) tuple, and raise HTTPError for error responses. Request
+        bodies need a Content-Length; chunked uploads are refused.
+        
+        Args:
+            host (str): Address to listen on
+            port (int): Port to listen on (0 picks a free port)
+            max_body_size (int): Largest request body accepted, in bytes
+            keep_alive_timeout (float): Seconds an idle connection is kept open
+        """
+        self.host = host
+        self.port = port
+        self.max_body_size = max_body_size
+        self.keep_alive_timeout = keep_alive_timeout
+        self._routes = []
+        self._server = None
+    
+    def route(self, method, pattern, handler):
+        """
+        Register a handler for a method and path pattern
+        
+        Args:
+            method (str): Request method, e.g. 'GET'
+            pattern (str): Path with {name} or {name:int} placeholders, e.g. '/api/assets/{asset_id:int}'
+            handler (coroutine function): Called with the Request
+        """
+        regex = re.sub(
+            r"\{(\w+)(:int)?\}",
+            lambda match: f"(?P<{match.group(1)}>{'[0-9]+' if match.group(2) else '[^/]+'})",
+            pattern
+        )
+        converters = {name: int for name, kind in re.findall(r"\{(\w+)(:int)?\}", pattern) if kind}
+        self._routes.append((method, re.compile(f"^{regex}$"), converters, pattern, handler))
+    
+    async def start(self):
+        """Start listening; the actual port is in self.port afterwards"""
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self):
+        """Serve requests until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    def close(self):
+        """Stop accepting connections"""
+        if self._server is not None:
+            self._server.close()
+    
+    async def _serve_connection(self, reader, writer):
+        """Answer the requests of one connection until it closes"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HTTPError as e:
+                    writer.write(_response(e.status, {'error': e.message}, False))
+                    break
+                if request is None:
+                    break
+                
+                keep_alive = _wants_keep_alive(request)
+                status, payload = await self._dispatch(request)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            # Cancelled when the server shuts down with the connection still open
+            pass
+        finally:
+            writer.close()
+    
+    async def _read_request(self, reader):
+        """Read one request, or return None when the client closed the connection"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise HTTPError(400, "Incomplete request")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request headers too large")
+        
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        
+        if 'transfer-encoding' in headers:
+            raise HTTPError(411, "Send request bodies with a Content-Length")
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body_size:
+            raise HTTPError(413, f"Request body larger than {self.max_body_size} bytes")
+        body = await reader.readexactly(length) if length else b""
+        
+        url = urlsplit(target)
+        return Request(method.upper(), unquote(url.path), dict(parse_qsl(url.query)), version, headers, body)
+    
+    async def _dispatch(self, request):
+        """Run the handler matching a request and turn the outcome into (status, payload)"""
+        started = perf_counter()
+        route_name = "unmatched"
+        try:
+            handler = None
+            path_matched = False
+            for method, regex, converters, pattern, route_handler in self._routes:
+                match = regex.match(request.path)
+                if not match:
+                    continue
+                path_matched = True
+                if method == request.method:
+                    handler = route_handler
+                    route_name = pattern
+                    request.params = {
+                        name: converters.get(name, str)(value) for name, value in match.groupdict().items()
+                    }
+                    break
+            
+            if handler is None:
+                raise HTTPError(405 if path_matched else 404,
+                                "Method not allowed" if path_matched else "Not found")
+            
+            result = await handler(request)
+            status, payload = result if isinstance(result, tuple) else (200, result)
+        except HTTPError as e:
+            status, payload = e.status, {'error': e.message}
+        except Exception as e:
+            print(f"API error in {request.method} {request.path}: {e}")
+            status, payload = 500, {'error': "Internal server error"}
+        
+        metrics.observe('api_request_seconds', perf_counter() - started, route=f"{request.method} {route_name}")
+        metrics.increment('api_requests', route=f"{request.method} {route_name}", status=status)
+        return status, payload
+
+def _wants_keep_alive(request):
+    """Whether the connection stays open after this request"""
+    connection = request.headers.get('connection', '').lower()
+    if request.version == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+def _json_default(value):
+    """Serialize the row types the models return"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    if hasattr(value, 'keys'):
+        return {key: value[key] for key in value.keys()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _response(status, payload, keep_alive):
+    """Encode a JSON response"""
+    body = json.dumps(payload, default=_json_default, separators=(',', ':')).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode('latin-1') + body
+
+
+# Help texts for the exported request metrics
+metrics.describe('api_request_seconds', "Duration of API requests by route")
+metrics.describe('api_requests_total', "API requests by route and status")
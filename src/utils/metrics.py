@@ -0,0 +1,404 @@
+"""
+Metrics for IT Asset Management System
+Counters, histograms and nested timing spans for user-visible operations
+"""
+import os
+import json
+import atexit
+import threading
+from time import perf_counter
+from datetime import datetime
+from functools import wraps
+
+# Upper bounds in seconds of the histogram buckets
+BUCKET_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Kinds of time a span is broken down into; whatever is left over is compute
+PHASES = ('db', 'io', 'render')
+
+METRIC_PREFIX = 'itam_'
+
+class _NullSpan:
+    """Stand-in returned while instrumentation is off or no span is open"""
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """One open operation span or phase on the calling thread's span stack"""
+    __slots__ = ('metrics', 'name', 'phase', 'start', 'charged')
+    
+    def __init__(self, metrics, name, phase=None):
+        self.metrics = metrics
+        self.name = name
+        self.phase = phase
+        self.charged = [0.0] * len(PHASES)
+    
+    def __enter__(self):
+        self.metrics._stack().append(self)
+        if self.phase is None and self.metrics._listeners:
+            self.metrics._notify('start', self.name)
+        self.start = perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = perf_counter() - self.start
+        stack = self.metrics._stack()
+        stack.pop()
+        
+        if self.phase is not None:
+            # Time spent in this phase but not already charged to a nested one
+            exclusive = max(0.0, duration - sum(self.charged))
+            index = PHASES.index(self.phase)
+            for span in stack:
+                span.charged[index] += exclusive
+        else:
+            self.metrics._finish_span(self, duration, exc_type is not None)
+            if self.metrics._listeners:
+                self.metrics._notify('end', self.name)
+        return False
+
+class Metrics:
+    def __init__(self, log_dir="logs", enabled=None):
+        """
+        Initialize the metrics registry
+        
+        Operations such as loading assets or generating a report open a
+        span. Each span breaks down into database, file I/O and Tk rendering
+        time, charged by the data layer and by phase() blocks, with the rest
+        counted as compute. When disabled, span() and phase() hand out a
+        shared no-op object and counters return at once.
+        
+        Args:
+            log_dir (str): Directory for exported metrics, relative to the application root
+            enabled (bool, optional): Record metrics; defaults to the ITAM_METRICS environment variable
+        """
+        self.log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), log_dir)
+        if enabled is None:
+            enabled = os.environ.get('ITAM_METRICS', '1') != '0'
+        self.enabled = enabled
+        
+        self._local = threading.local()
+        self._stacks = {}
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._listeners = []
+        atexit.register(self._export_at_exit)
+    
+    def _stack(self):
+        """Open spans of the calling thread, outermost first"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+            self._stacks[threading.get_ident()] = stack
+        return stack
+    
+    def open_spans(self, thread_id):
+        """
+        Get the operations running on a thread, such as the Tk main thread
+        
+        Args:
+            thread_id (int): Thread identifier
+        
+        Returns:
+            list: Names of the open spans, outermost first
+        """
+        stack = self._stacks.get(thread_id)
+        return [span.name for span in list(stack or ()) if span.name is not None]
+    
+    def span(self, name):
+        """
+        Time a user-visible operation
+        
+        Use as a context manager. Records the duration and its breakdown
+        into itam_span_seconds and itam_span_phase_seconds, and counts the
+        operation in itam_spans_total with its outcome.
+        
+        Args:
+            name (str): Operation name, e.g. 'assets.load'
+        
+        Returns:
+            Context manager for the span
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+    
+    def phase(self, kind):
+        """
+        Charge the time of a block to a phase of the enclosing spans
+        
+        Args:
+            kind (str): 'db', 'io' or 'render'
+        
+        Returns:
+            Context manager for the phase
+        """
+        if not self.enabled or not getattr(self._local, 'stack', None):
+            return _NULL_SPAN
+        return _Span(self, None, kind)
+    
+    def charge(self, kind, seconds):
+        """
+        Charge time measured elsewhere to a phase of the enclosing spans
+        
+        Args:
+            kind (str): 'db', 'io' or 'render'
+            seconds (float): Time to charge
+        """
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            return
+        
+        index = PHASES.index(kind)
+        for span in stack:
+            span.charged[index] += seconds
+    
+    def traced(self, name):
+        """
+        Decorate a function so every call runs in a span
+        
+        Args:
+            name (str): Operation name
+        
+        Returns:
+            function: Decorator
+        """
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Span(self, name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def add_listener(self, listener):
+        """
+        Call a function whenever an operation span starts or ends
+        
+        Args:
+            listener (function): Called as listener(event, name) with event
+                'start' or 'end', on the thread running the span
+        """
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+    
+    def remove_listener(self, listener):
+        """
+        Stop calling a function added with add_listener()
+        
+        Args:
+            listener (function): Listener to remove
+        """
+        with self._lock:
+            self._listeners = [existing for existing in self._listeners if existing != listener]
+    
+    def _notify(self, event, name):
+        """Tell the listeners about a span starting or ending"""
+        for listener in self._listeners:
+            listener(event, name)
+    
+    def increment(self, name, amount=1, **labels):
+        """
+        Add to a counter
+        
+        Args:
+            name (str): Counter name without prefix or _total suffix
+            amount (float): Amount to add
+            **labels: Label values
+        """
+        if not self.enabled:
+            return
+        
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def observe(self, name, value, **labels):
+        """
+        Add a sample to a histogram
+        
+        Args:
+            name (str): Histogram name without prefix
+            value (float): Sample, in seconds for durations
+            **labels: Label values
+        """
+        if not self.enabled:
+            return
+        
+        key = (name, tuple(sorted(labels.items())))
+        bucket = 0
+        while bucket < len(BUCKET_BOUNDS) and value > BUCKET_BOUNDS[bucket]:
+            bucket += 1
+        
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * (len(BUCKET_BOUNDS) + 1), 'sum': 0.0, 'count': 0}
+            histogram['buckets'][bucket] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+    
+    def describe(self, name, text):
+        """
+        Set the help text exported for a metric
+        
+        Args:
+            name (str): Metric name without prefix
+            text (str): One-line description
+        """
+        self._help[name] = text
+    
+    def _finish_span(self, span, duration, failed):
+        """Record a closed operation span"""
+        self.observe('span_seconds', duration, span=span.name)
+        compute = duration
+        for kind, seconds in zip(PHASES, span.charged):
+            self.observe('span_phase_seconds', seconds, span=span.name, phase=kind)
+            compute -= seconds
+        self.observe('span_phase_seconds', max(0.0, compute), span=span.name, phase='compute')
+        self.increment('spans', span=span.name, outcome='error' if failed else 'ok')
+    
+    def snapshot(self):
+        """
+        Get every counter and histogram
+        
+        Returns:
+            dict: 'counters' and 'histograms', each a list of dicts with name, labels and values
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, dict(value, buckets=list(value['buckets'])))
+                                for key, value in self._histograms.items())
+        
+        return {
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in counters
+            ],
+            'histograms': [
+                {
+                    'name': name, 'labels': dict(labels), 'count': value['count'], 'sum': round(value['sum'], 6),
+                    'buckets': {str(bound): count for bound, count in zip(BUCKET_BOUNDS + ('+Inf',), value['buckets'])}
+                }
+                for (name, labels), value in histograms
+            ]
+        }
+    
+    def to_prometheus(self):
+        """
+        Format the metrics in the Prometheus text exposition format
+        
+        Returns:
+            str: Metrics text, suitable for the node exporter's textfile collector
+        """
+        snapshot = self.snapshot()
+        lines = []
+        described = set()
+        
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {METRIC_PREFIX}{name} {self._help[name]}")
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+        
+        for counter in snapshot['counters']:
+            name = counter['name'] if counter['name'].endswith('_total') else f"{counter['name']}_total"
+            header(name, 'counter')
+            lines.append(f"{METRIC_PREFIX}{name}{_labels(counter['labels'])} {counter['value']}")
+        
+        for histogram in snapshot['histograms']:
+            name = histogram['name']
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, count in histogram['buckets'].items():
+                cumulative += count
+                lines.append(f"{METRIC_PREFIX}{name}_bucket{_labels(histogram['labels'], le=bound)} {cumulative}")
+            lines.append(f"{METRIC_PREFIX}{name}_sum{_labels(histogram['labels'])} {histogram['sum']}")
+            lines.append(f"{METRIC_PREFIX}{name}_count{_labels(histogram['labels'])} {histogram['count']}")
+        
+        return '\n'.join(lines) + '\n'
+    
+    def export_prometheus(self, path=None):
+        """
+        Write the metrics to a Prometheus text file
+        
+        Args:
+            path (str, optional): Output file; defaults to metrics.prom in the log folder
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message describing the result
+        """
+        path = path or os.path.join(self.log_dir, "metrics.prom")
+        return self._write(path, self.to_prometheus())
+    
+    def export_json(self, path=None):
+        """
+        Write the metrics to a JSON file
+        
+        Args:
+            path (str, optional): Output file; defaults to metrics.json in the log folder
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message describing the result
+        """
+        path = path or os.path.join(self.log_dir, "metrics.json")
+        data = dict(self.snapshot(), exported_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        return self._write(path, json.dumps(data, indent=2))
+    
+    def _write(self, path, text):
+        """Replace a file atomically, so collectors never read a partial export"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as export_file:
+                export_file.write(text)
+            os.replace(temp_path, path)
+            return True, f"Metrics written to {path}"
+        except OSError as e:
+            return False, f"Error writing metrics: {str(e)}"
+    
+    def reset(self):
+        """Discard every counter and histogram"""
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+    
+    def _export_at_exit(self):
+        """Keep the metrics of this run for later inspection"""
+        if self.enabled and (self._counters or self._histograms):
+            self.export_prometheus()
+            self.export_json()
+
+def _labels(labels, **extra):
+    """Format label pairs as {name="value",...}"""
+    pairs = dict(labels, **extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+# Shared by every controller and view
+metrics = Metrics()
+metrics.describe('span_seconds', "Duration of user-visible operations")
+metrics.describe('span_phase_seconds', "Duration of user-visible operations by phase (db, io, render, compute)")
+metrics.describe('spans_total', "User-visible operations by outcome")
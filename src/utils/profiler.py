@@ -0,0 +1,217 @@
+"""
+Sampling Profiler for IT Asset Management System
+Samples the stacks of all threads and writes collapsed stacks for flamegraphs
+"""
+import os
+import sys
+import threading
+from datetime import datetime
+from src.utils.metrics import metrics
+
+# Milliseconds between stack samples
+PROFILE_INTERVAL_MS = float(os.environ.get('ITAM_PROFILE_INTERVAL_MS', 10))
+
+# Operations that can be profiled on their own (metrics span names)
+PROFILED_OPERATIONS = (
+    ('assets.load', "Load Assets"),
+    ('assets.search', "Search Assets"),
+    ('assets.filter', "Apply Filters"),
+    ('report.generate', "Generate Report"),
+    ('excel.export', "Export to Excel"),
+    ('excel.import', "Import from Excel"),
+    ('backup.create', "Create Backup"),
+    ('backup.restore', "Restore Backup"),
+)
+
+class SamplingProfiler:
+    def __init__(self, interval_ms=PROFILE_INTERVAL_MS, output_dir="logs/profiles"):
+        """
+        Initialize the sampling profiler
+        
+        A background thread periodically samples the stack of every thread
+        (Tk main loop, backup scheduler, workers). Identical stacks are
+        counted, so the overhead depends on the sampling interval, not on
+        how much code runs. Profiles are written in the collapsed-stack
+        format read by flamegraph.pl, speedscope and inferno, one line per
+        stack: "thread;outer function;...;inner function count".
+        
+        Args:
+            interval_ms (float): Milliseconds between samples
+            output_dir (str): Directory for profiles, relative to the application root
+        """
+        self.interval_ms = interval_ms
+        self.output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), output_dir)
+        
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stopped = threading.Event()
+        self._counts = {}
+        self._label = None
+        self._started_at = None
+        self._frame_names = {}
+        
+        # Operation armed with profile_next()
+        self._operation = None
+        self._operation_thread = None
+        self._on_finished = None
+    
+    @property
+    def is_running(self):
+        """Whether samples are being taken"""
+        return self._sampler is not None
+    
+    def start(self, label="session"):
+        """
+        Start sampling all threads
+        
+        Args:
+            label (str): Name used in the profile's file name
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message indicating success or error
+        """
+        with self._lock:
+            if self._sampler is not None:
+                return False, "The profiler is already running"
+            
+            self._counts = {}
+            self._label = label
+            self._started_at = datetime.now()
+            self._stopped.clear()
+            self._sampler = threading.Thread(target=self._run_sampler, name="profiler")
+            self._sampler.daemon = True
+            self._sampler.start()
+        
+        return True, "Profiling started"
+    
+    def stop(self):
+        """
+        Stop sampling and write the profile
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Path of the profile, or a message describing the error
+        """
+        with self._lock:
+            sampler = self._sampler
+            if sampler is None:
+                return False, "The profiler is not running"
+            self._sampler = None
+        
+        self._stopped.set()
+        sampler.join()
+        return self._write()
+    
+    def profile_next(self, operation, on_finished=None):
+        """
+        Profile the next run of an operation, e.g. one report generation
+        
+        Sampling starts when the operation's span opens and stops when it
+        closes; samples cover every thread in between.
+        
+        Args:
+            operation (str): Span name, one of PROFILED_OPERATIONS
+            on_finished (function, optional): Called with the result of stop()
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message indicating success or error
+        """
+        if not metrics.enabled:
+            return False, "Operations can only be profiled while metrics are enabled"
+        
+        with self._lock:
+            if self._sampler is not None or self._operation is not None:
+                return False, "The profiler is already running"
+            self._operation = operation
+            self._operation_thread = None
+            self._on_finished = on_finished
+        
+        metrics.add_listener(self._on_span)
+        return True, f"The next '{operation}' will be profiled"
+    
+    def cancel(self):
+        """
+        Disarm profile_next() before the operation has started
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message indicating success or error
+        """
+        with self._lock:
+            operation = self._operation
+            if operation is None:
+                return False, "No operation is waiting to be profiled"
+            if self._operation_thread is not None:
+                return False, f"'{operation}' is already being profiled"
+            self._operation = None
+            self._on_finished = None
+        metrics.remove_listener(self._on_span)
+        return True, f"The next '{operation}' will not be profiled"
+    
+    def _on_span(self, event, name):
+        """Start and stop sampling around the armed operation"""
+        if name != self._operation:
+            return
+        
+        thread_id = threading.get_ident()
+        if event == 'start' and self._operation_thread is None:
+            self._operation_thread = thread_id
+            self.start(label=name.replace('.', '_'))
+        elif event == 'end' and self._operation_thread == thread_id:
+            metrics.remove_listener(self._on_span)
+            with self._lock:
+                self._operation = None
+                self._operation_thread = None
+                on_finished = self._on_finished
+            result = self.stop()
+            if on_finished:
+                on_finished(*result)
+    
+    def _run_sampler(self):
+        """Take stack samples until stopped"""
+        interval = self.interval_ms / 1000
+        own_id = threading.get_ident()
+        
+        while not self._stopped.wait(interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._collapse(names.get(thread_id, f"thread-{thread_id}"), frame)
+                self._counts[stack] = self._counts.get(stack, 0) + 1
+    
+    def _collapse(self, thread_name, frame):
+        """Turn a frame into 'thread;outermost;...;innermost'"""
+        names = []
+        frame_names = self._frame_names
+        while frame is not None:
+            code = frame.f_code
+            name = frame_names.get(code)
+            if name is None:
+                name = frame_names[code] = (
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':')
+                )
+            names.append(name)
+            frame = frame.f_back
+        names.append(thread_name.replace(';', ':'))
+        names.reverse()
+        return ';'.join(names)
+    
+    def _write(self):
+        """Write the collected stacks to a collapsed-stack file"""
+        timestamp = self._started_at.strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(self.output_dir, f"profile_{self._label}_{timestamp}.folded")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as profile_file:
+                for stack, count in sorted(self._counts.items()):
+                    profile_file.write(f"{stack} {count}\n")
+            return True, path
+        except OSError as e:
+            return False, f"Error writing profile: {str(e)}"
+
+
+# Shared by the application window and the command line
+profiler = SamplingProfiler()
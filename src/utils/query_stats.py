@@ -0,0 +1,465 @@
+"""
+Query Statistics for IT Asset Management System
+Times every SQL statement, keeps histograms per statement shape and logs slow queries
+"""
+import os
+import re
+import json
+import atexit
+import sqlite3
+import logging
+import argparse
+import threading
+from time import perf_counter
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from src.utils.metrics import metrics
+
+# Statements slower than this many milliseconds go to the slow-query log
+SLOW_QUERY_MS = float(os.environ.get('ITAM_SLOW_QUERY_MS', 100))
+
+# Upper bounds in milliseconds of the histogram buckets; slower samples land in a final overflow bucket
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape
+    
+    Literals become ?, placeholder lists of any length become (?, ...)
+    and whitespace is collapsed, so statements that differ only in their
+    values share one set of statistics.
+    
+    Args:
+        sql (str): SQL statement as executed
+    
+    Returns:
+        str: Normalized statement
+    """
+    shape = _STRING_LITERAL.sub('?', sql)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?, ...)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+def format_report(statements, limit=20):
+    """
+    Format statement statistics as a text table
+    
+    Args:
+        statements (list): Statistics as returned by QueryStats.snapshot()
+        limit (int): Number of statements to include
+    
+    Returns:
+        str: Report, one line per statement shape
+    """
+    lines = [f"{'calls':>8} {'total ms':>10} {'mean':>8} {'p95':>8} {'max':>8} {'rows':>9}  statement"]
+    for entry in statements[:limit]:
+        shape = entry['shape'] if len(entry['shape']) <= 100 else entry['shape'][:97] + '...'
+        lines.append(
+            f"{entry['count']:>8} {entry['total_ms']:>10.1f} {entry['mean_ms']:>8.2f} "
+            f"{entry['p95_ms']:>8.2f} {entry['max_ms']:>8.2f} {entry['rows']:>9}  {shape}"
+        )
+    return '\n'.join(lines)
+
+class QueryStats:
+    def __init__(self, log_dir="logs", slow_threshold_ms=SLOW_QUERY_MS, max_shapes=1000,
+                 log_size=1024 * 1024, log_backups=3, enabled=None):
+        """
+        Initialize the query statistics
+        
+        DatabaseConfig connections report every statement here with the
+        time spent executing it and fetching its rows. Statements over the
+        threshold are written, with their query plan, to a rotating
+        slow-query log. The statistics are dumped to the log folder when
+        the application exits.
+        
+        On by default, so a report of a slow screen comes with data. Each
+        statement only adds a counter to a fixed set of histogram buckets;
+        query plans are looked up and logged just for statements over the
+        threshold. Set ITAM_QUERY_STATS=0 to turn timing off; operation
+        metrics then count database time as compute. Connections opened
+        after the switch follow it.
+        
+        Args:
+            log_dir (str): Directory for the slow-query log and dumps, relative to the application root
+            slow_threshold_ms (float): Statements slower than this are logged; None disables the log
+            max_shapes (int): Number of distinct statement shapes tracked; further ones are counted together
+            log_size (int): Size in bytes after which the slow-query log is rotated
+            log_backups (int): Number of rotated slow-query logs kept
+            enabled (bool, optional): Time statements; defaults to the ITAM_QUERY_STATS environment variable
+        """
+        self.log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), log_dir)
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_shapes = max_shapes
+        self.log_size = log_size
+        self.log_backups = log_backups
+        if enabled is None:
+            enabled = os.environ.get('ITAM_QUERY_STATS', '1') != '0'
+        self.enabled = enabled
+        
+        self._lock = threading.Lock()
+        self._shapes = {}
+        self._normalized = {}
+        self._since = datetime.now()
+        self._slow_log = None
+        self._slow_log_path = None
+        atexit.register(self._dump_at_exit)
+    
+    def record(self, sql, parameters, elapsed, rows, connection=None, executions=1):
+        """
+        Add an executed statement to the statistics
+        
+        Args:
+            sql (str): Statement as executed
+            parameters: Parameters it was executed with (the first set for executemany)
+            elapsed (float): Seconds spent executing it and fetching its rows
+            rows (int): Rows fetched, or rows changed for writes
+            connection (sqlite3.Connection, optional): Open connection to explain a slow statement on
+            executions (int): Parameter sets it was executed with; elapsed is spread evenly over them
+        """
+        # Database time of the operation span this statement runs in, if any
+        metrics.charge('db', elapsed)
+        
+        shape = self._normalized.get(sql)
+        if shape is None:
+            shape = normalize_sql(sql)
+            if len(self._normalized) >= 4 * self.max_shapes:
+                self._normalized.clear()
+            self._normalized[sql] = shape
+        
+        elapsed_ms = elapsed * 1000
+        each_ms = elapsed_ms / executions
+        bucket = 0
+        while bucket < len(BUCKET_BOUNDS_MS) and each_ms > BUCKET_BOUNDS_MS[bucket]:
+            bucket += 1
+        
+        with self._lock:
+            entry = self._shapes.get(shape)
+            if entry is None:
+                if len(self._shapes) >= self.max_shapes:
+                    shape = '<other statements>'
+                    entry = self._shapes.get(shape)
+                if entry is None:
+                    entry = self._shapes[shape] = {
+                        'count': 0, 'total_ms': 0.0, 'min_ms': each_ms, 'max_ms': 0.0, 'rows': 0,
+                        'buckets': [0] * (len(BUCKET_BOUNDS_MS) + 1)
+                    }
+            
+            entry['count'] += executions
+            entry['total_ms'] += elapsed_ms
+            entry['rows'] += rows
+            entry['buckets'][bucket] += executions
+            if each_ms < entry['min_ms']:
+                entry['min_ms'] = each_ms
+            if each_ms > entry['max_ms']:
+                entry['max_ms'] = each_ms
+        
+        if self.slow_threshold_ms is not None and elapsed_ms >= self.slow_threshold_ms:
+            self._log_slow(sql, parameters, elapsed_ms, rows, connection, executions)
+    
+    def _log_slow(self, sql, parameters, elapsed_ms, rows, connection, executions=1):
+        """Write a slow statement and its query plan to the slow-query log"""
+        plan = self._explain(sql, parameters, connection)
+        summary = f"{elapsed_ms:.1f} ms, {rows} rows"
+        if executions > 1:
+            summary += f", {executions} executions"
+        message = [summary, f"  {_WHITESPACE.sub(' ', sql).strip()}"]
+        message.extend(f"  {line}" for line in plan)
+        
+        try:
+            with self._lock:
+                path = os.path.join(self.log_dir, "slow_queries.log")
+                if self._slow_log is None or self._slow_log_path != path:
+                    self._open_slow_log(path)
+            self._slow_log.info('\n'.join(message))
+        except OSError as e:
+            print(f"Slow query log error: {e}")
+    
+    def _open_slow_log(self, path):
+        """Point the slow-query logger at a log file (caller holds the lock)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=self.log_size, backupCount=self.log_backups, encoding='utf-8')
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        
+        logger = logging.getLogger("itam.slow_queries")
+        for old_handler in list(logger.handlers):
+            logger.removeHandler(old_handler)
+            old_handler.close()
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        
+        self._slow_log = logger
+        self._slow_log_path = path
+    
+    def _explain(self, sql, parameters, connection):
+        """
+        Get the query plan of a statement as indented lines
+        
+        Returns:
+            list: Plan lines, empty if the statement has none
+        """
+        if connection is None:
+            return []
+        
+        try:
+            # A plain cursor, so explaining is not itself timed
+            cursor = sqlite3.Cursor(connection)
+            cursor.row_factory = None
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, parameters)
+            depths = {0: 0}
+            lines = []
+            for node_id, parent_id, _, detail in cursor.fetchall():
+                depths[node_id] = depths.get(parent_id, 0) + 1
+                lines.append("  " * depths[node_id] + detail)
+            cursor.close()
+            return ["QUERY PLAN"] + lines if lines else []
+        except (sqlite3.Error, ValueError) as e:
+            return [f"QUERY PLAN unavailable: {e}"]
+    
+    def snapshot(self):
+        """
+        Get the statistics of every statement shape
+        
+        Returns:
+            list: One dict per shape (shape, count, total_ms, mean_ms, min_ms, max_ms,
+                p50_ms, p95_ms, p99_ms, rows, histogram), slowest total first
+        """
+        with self._lock:
+            shapes = [(shape, dict(entry, buckets=list(entry['buckets']))) for shape, entry in self._shapes.items()]
+        
+        statements = []
+        for shape, entry in shapes:
+            statements.append({
+                'shape': shape,
+                'count': entry['count'],
+                'total_ms': round(entry['total_ms'], 3),
+                'mean_ms': round(entry['total_ms'] / entry['count'], 3),
+                'min_ms': round(entry['min_ms'], 3),
+                'max_ms': round(entry['max_ms'], 3),
+                'p50_ms': self._percentile(entry, 0.50),
+                'p95_ms': self._percentile(entry, 0.95),
+                'p99_ms': self._percentile(entry, 0.99),
+                'rows': entry['rows'],
+                'histogram': {
+                    f"<={bound}" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}": count
+                    for i, (bound, count) in enumerate(zip(BUCKET_BOUNDS_MS + (None,), entry['buckets']))
+                    if count
+                }
+            })
+        
+        statements.sort(key=lambda statement: statement['total_ms'], reverse=True)
+        return statements
+    
+    def _percentile(self, entry, fraction):
+        """Estimate a percentile in milliseconds from the histogram buckets"""
+        target = fraction * entry['count']
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, entry['buckets']):
+            seen += count
+            if seen >= target:
+                return round(min(bound, entry['max_ms']), 3)
+        return round(entry['max_ms'], 3)
+    
+    def report(self, limit=20):
+        """
+        Get the statements that took the most time as a text table
+        
+        Args:
+            limit (int): Number of statements to include
+        
+        Returns:
+            str: Report, one line per statement shape
+        """
+        return format_report(self.snapshot(), limit)
+    
+    def dump(self, path=None):
+        """
+        Write the statistics to a JSON file
+        
+        Args:
+            path (str, optional): Output file; defaults to query_stats.json in the log folder
+        
+        Returns:
+            bool: True if successful, False otherwise
+            str: Message describing the result
+        """
+        path = path or os.path.join(self.log_dir, "query_stats.json")
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as dump_file:
+                json.dump({
+                    'since': self._since.strftime('%Y-%m-%d %H:%M:%S'),
+                    'until': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'slow_threshold_ms': self.slow_threshold_ms,
+                    'statements': self.snapshot()
+                }, dump_file, indent=2)
+            return True, f"Query statistics written to {path}"
+        except OSError as e:
+            return False, f"Error writing query statistics: {str(e)}"
+    
+    def reset(self):
+        """Discard the statistics gathered so far"""
+        with self._lock:
+            self._shapes = {}
+            self._since = datetime.now()
+    
+    def _dump_at_exit(self):
+        """Keep the statistics of this run for later inspection"""
+        if self._shapes:
+            self.dump()
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors report their statements to a QueryStats"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = query_stats
+        self._pending_cursors = set()
+    
+    def cursor(self, factory=None):
+        return super().cursor(factory or TimedCursor)
+    
+    def close(self):
+        # Statements whose rows were not read to the end are recorded now
+        for cursor in list(self._pending_cursors):
+            cursor._finish()
+        super().close()
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Cursor that times each statement from execute until its rows are fetched
+    
+    A statement is recorded once its rows are exhausted, when the cursor
+    runs the next statement, or when the connection is closed. Rows are
+    counted however they are read: fetched or by iterating over the cursor.
+    """
+    
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._pending = None
+    
+    def execute(self, sql, parameters=()):
+        if self._pending is not None:
+            self._finish()
+        start = perf_counter()
+        super().execute(sql, parameters)
+        self._pending = [sql, parameters, perf_counter() - start, 0]
+        self.connection._pending_cursors.add(self)
+        return self
+    
+    def executemany(self, sql, seq_of_parameters):
+        if self._pending is not None:
+            self._finish()
+        # Count the parameter sets as SQLite takes them, so generators are not read ahead
+        seen = [0, None]
+        
+        def tally(parameter_sets):
+            for parameters in parameter_sets:
+                if not seen[0]:
+                    seen[1] = parameters
+                seen[0] += 1
+                yield parameters
+        
+        start = perf_counter()
+        super().executemany(sql, tally(seq_of_parameters))
+        elapsed = perf_counter() - start
+        executions, first = seen
+        if executions:
+            self.connection.stats.record(sql, first, elapsed, max(self.rowcount, 0), self.connection, executions)
+        return self
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        start = perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            if self._pending is not None:
+                self._pending[2] += perf_counter() - start
+                self._finish()
+            raise
+        if self._pending is not None:
+            self._pending[2] += perf_counter() - start
+            self._pending[3] += 1
+        return row
+    
+    def fetchone(self):
+        start = perf_counter()
+        row = super().fetchone()
+        if self._pending is not None:
+            self._pending[2] += perf_counter() - start
+            if row is None:
+                self._finish()
+            else:
+                self._pending[3] += 1
+        return row
+    
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = perf_counter()
+        rows = super().fetchmany(size)
+        if self._pending is not None:
+            self._pending[2] += perf_counter() - start
+            self._pending[3] += len(rows)
+            if len(rows) < size:
+                self._finish()
+        return rows
+    
+    def fetchall(self):
+        start = perf_counter()
+        rows = super().fetchall()
+        if self._pending is not None:
+            self._pending[2] += perf_counter() - start
+            self._pending[3] += len(rows)
+            self._finish()
+        return rows
+    
+    def close(self):
+        if self._pending is not None:
+            self._finish()
+        super().close()
+    
+    def _finish(self):
+        """Record the current statement"""
+        sql, parameters, elapsed, rows = self._pending
+        self._pending = None
+        connection = self.connection
+        connection._pending_cursors.discard(self)
+        
+        if not rows and self.rowcount > 0:
+            rows = self.rowcount
+        connection.stats.record(sql, parameters, elapsed, rows, connection)
+
+
+# Shared by every database connection
+query_stats = QueryStats()
+
+if __name__ == "__main__":
+    # If this script is run directly, show the statistics dumped by the last run
+    parser = argparse.ArgumentParser(description="Show the SQL statements that took the most time")
+    parser.add_argument("--file", default=os.path.join(query_stats.log_dir, "query_stats.json"),
+                        help="Statistics file written by the application")
+    parser.add_argument("--limit", type=int, default=20, help="Number of statements to show")
+    parser.add_argument("--sort", choices=('total_ms', 'mean_ms', 'p95_ms', 'max_ms', 'count'), default='total_ms',
+                        help="Column to rank statements by")
+    args = parser.parse_args()
+    
+    try:
+        with open(args.file, encoding='utf-8') as stats_file:
+            data = json.load(stats_file)
+    except (OSError, ValueError) as e:
+        print(f"Error reading query statistics: {e}")
+        raise SystemExit(1)
+    
+    statements = sorted(data['statements'], key=lambda statement: statement[args.sort], reverse=True)
+    print(f"{data['since']} to {data['until']}, slow threshold {data['slow_threshold_ms']} ms")
+    print(format_report(statements, args.limit))
@@ -0,0 +1,78 @@
+"""
+Security Utilities for IT Asset Management System
+Handles password hashing and verification
+"""
+import os
+import hmac
+import hashlib
+
+# PBKDF2 work factor; raise it as hardware gets faster; existing hashes are upgraded on next login
+PASSWORD_HASH_ITERATIONS = int(os.environ.get('ITAM_PASSWORD_ITERATIONS', 600000))
+
+PASSWORD_HASH_ALGORITHM = 'pbkdf2_sha256'
+
+def hash_password(password, iterations=None):
+    """
+    Hash a password with a random salt
+    
+    Args:
+        password (str): Plain text password
+        iterations (int, optional): PBKDF2 iterations, defaults to the configured work factor
+    
+    Returns:
+        str: Encoded hash in the form 'pbkdf2_sha256$iterations$salt$hash'
+    """
+    iterations = iterations or PASSWORD_HASH_ITERATIONS
+    salt = os.urandom(16).hex()
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), iterations)
+    return f"{PASSWORD_HASH_ALGORITHM}${iterations}${salt}${digest.hex()}"
+
+def verify_password(password, stored_hash):
+    """
+    Check a password against a stored hash
+    
+    Also accepts the unsalted SHA-256 hashes written by earlier versions.
+    
+    Args:
+        password (str): Plain text password
+        stored_hash (str): Hash stored in the users table
+    
+    Returns:
+        bool: True if the password matches, False otherwise
+    """
+    if not stored_hash:
+        return False
+    
+    if '$' not in stored_hash:
+        # Legacy unsalted SHA-256
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, stored_hash)
+    
+    try:
+        algorithm, iterations, salt, digest = stored_hash.split('$')
+        if algorithm != PASSWORD_HASH_ALGORITHM:
+            return False
+        candidate = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), int(iterations))
+    except ValueError:
+        return False
+    
+    return hmac.compare_digest(candidate.hex(), digest)
+
+def needs_rehash(stored_hash):
+    """
+    Check whether a stored hash is weaker than the current configuration
+    
+    Args:
+        stored_hash (str): Hash stored in the users table
+    
+    Returns:
+        bool: True if the hash should be replaced after a successful login
+    """
+    if not stored_hash or '$' not in stored_hash:
+        return True
+    
+    try:
+        algorithm, iterations, _, _ = stored_hash.split('$')
+        return algorithm != PASSWORD_HASH_ALGORITHM or int(iterations) < PASSWORD_HASH_ITERATIONS
+    except ValueError:
+        return True
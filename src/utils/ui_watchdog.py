@@ -0,0 +1,165 @@
+"""
+UI Watchdog for IT Asset Management System
+Detects stalls of the Tk event loop and logs what the main thread was doing
+"""
+import os
+import sys
+import logging
+import threading
+import traceback
+from time import perf_counter
+from logging.handlers import RotatingFileHandler
+from src.utils.metrics import metrics
+
+# The event loop counts as stalled once a heartbeat is this many milliseconds overdue
+UI_STALL_MS = float(os.environ.get('ITAM_UI_STALL_MS', 500))
+
+class UIWatchdog:
+    def __init__(self, root, interval_ms=100, stall_threshold_ms=UI_STALL_MS, log_dir="logs",
+                 max_samples=5, log_size=1024 * 1024, log_backups=3):
+        """
+        Initialize the UI watchdog
+        
+        A heartbeat scheduled with after() records when the event loop last
+        ran and how late each beat was. A monitor thread notices when the
+        heartbeat stops. It then samples the main thread's Python stack and
+        logs it to ui_stalls.log with the operations that were running.
+        Long stalls are sampled again every threshold period, up to
+        max_samples times.
+        
+        Args:
+            root: Tk root window whose event loop is watched
+            interval_ms (int): Milliseconds between heartbeats
+            stall_threshold_ms (float): Milliseconds without a heartbeat that count as a stall
+            log_dir (str): Directory for the stall log, relative to the application root
+            max_samples (int): Stack samples logged per stall
+            log_size (int): Size in bytes after which the stall log is rotated
+            log_backups (int): Number of rotated stall logs kept
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stall_threshold_ms = stall_threshold_ms
+        self.log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), log_dir)
+        self.max_samples = max_samples
+        self.log_size = log_size
+        self.log_backups = log_backups
+        
+        self._main_thread_id = None
+        self._last_beat = None
+        self._after_id = None
+        self._monitor = None
+        self._stopped = threading.Event()
+        self._log = None
+        
+        # Written by the monitor thread, read by the heartbeat
+        self._stall_start = None
+        self._stall_samples = 0
+    
+    def start(self):
+        """Start watching; must be called from the thread running the Tk event loop"""
+        if self._monitor is not None:
+            return
+        
+        self._main_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._last_beat = perf_counter()
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+        
+        self._monitor = threading.Thread(target=self._run_monitor, name="ui-watchdog")
+        self._monitor.daemon = True
+        self._monitor.start()
+    
+    def stop(self):
+        """Stop watching, e.g. before the window is destroyed"""
+        self._stopped.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._monitor is not None:
+            self._monitor.join(1)
+            self._monitor = None
+    
+    def _beat(self):
+        """Heartbeat on the Tk event loop"""
+        if self._stopped.is_set():
+            return
+        
+        now = perf_counter()
+        lag = now - self._last_beat - self.interval_ms / 1000
+        metrics.observe('ui_loop_lag_seconds', max(0.0, lag))
+        
+        stall_start = self._stall_start
+        if stall_start is not None:
+            self._stall_start = None
+            duration = now - stall_start
+            metrics.increment('ui_stalls')
+            metrics.observe('ui_stall_seconds', duration)
+            self._write(f"UI responsive again after {duration * 1000:.0f} ms")
+        
+        self._last_beat = now
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+    
+    def _run_monitor(self):
+        """Watch the heartbeat and sample the main thread while it is missing"""
+        interval = self.interval_ms / 1000
+        threshold = self.stall_threshold_ms / 1000
+        
+        while not self._stopped.wait(interval):
+            last_beat = self._last_beat
+            silence = perf_counter() - last_beat
+            if silence < threshold:
+                continue
+            
+            if self._stall_start != last_beat:
+                # A new stall: the heartbeat has not run since last_beat
+                self._stall_start = last_beat
+                self._stall_samples = 0
+            
+            if self._stall_samples < self.max_samples and silence >= threshold * (self._stall_samples + 1):
+                self._stall_samples += 1
+                self._sample(silence)
+    
+    def _sample(self, silence):
+        """Log the main thread's current stack and open operations"""
+        frame = sys._current_frames().get(self._main_thread_id)
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else "  (main thread not found)\n"
+        operations = ' > '.join(metrics.open_spans(self._main_thread_id)) or "unknown operation"
+        
+        self._write(
+            f"UI stalled for {silence * 1000:.0f} ms in {operations} "
+            f"(sample {self._stall_samples} of at most {self.max_samples})\n{stack.rstrip()}"
+        )
+    
+    def _write(self, message):
+        """Append a message to the stall log"""
+        try:
+            if self._log is None:
+                self._log = self._open_log()
+            self._log.info(message)
+        except OSError as e:
+            print(f"UI watchdog log error: {e}")
+    
+    def _open_log(self):
+        """Create the rotating logger for stall reports"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        handler = RotatingFileHandler(os.path.join(self.log_dir, "ui_stalls.log"), maxBytes=self.log_size,
+                                      backupCount=self.log_backups, encoding='utf-8')
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        
+        logger = logging.getLogger("itam.ui_stalls")
+        for old_handler in list(logger.handlers):
+            logger.removeHandler(old_handler)
+            old_handler.close()
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        return logger
+
+
+# Help texts for the exported watchdog metrics
+metrics.describe('ui_loop_lag_seconds', "How late Tk event loop heartbeats ran")
+metrics.describe('ui_stall_seconds', "Duration of Tk event loop stalls past the threshold")
+metrics.describe('ui_stalls_total', "Tk event loop stalls past the threshold")
@@ -2,20 +2,24 @@
 Asset View for IT Asset Management System
 Handles asset management interface
 """
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import os
 from src.utils.excel_utils import ExcelUtils
+from src.utils.metrics import metrics
 
 class AssetView(tk.Frame):
-    def __init__(self, parent, controller):
+    def __init__(self, parent, controller, on_loaded=None):
         """
         Initialize the asset view
         
         Args:
             parent: Parent widget
             controller: Main view controller
+            on_loaded (function, optional): Called once the first asset list has been shown
         """
         super().__init__(parent, bg="#f0f0f0")
         self.controller = controller
@@ -29,11 +33,14 @@ class AssetView(tk.Frame):
         self.panel_visible = False
         self.animation_running = False
         
+        # Queue of the background load still to be shown, if any
+        self.pending_load = None
+        
         # Create main layout
         self.create_layout()
         
-        # Load assets
-        self.load_assets()
+        # Load assets without holding up the first paint of the window
+        self.load_assets_in_background(on_loaded)
     
     def create_layout(self):
         """Create the asset view layout"""
@@ -172,26 +179,32 @@ class AssetView(tk.Frame):
         filter_frame = tk.Frame(self.main_container, bg="#f0f0f0", padx=20, pady=10)
         filter_frame.pack(fill=tk.X)
         
-        # Add filter fields
+        # Add filter fields; their lists are filled with the values in use when opened
+        self.filter_combos = {}
         tk.Label(filter_frame, text="Company:", bg="#f0f0f0").grid(row=0, column=0, padx=5, pady=5, sticky="w")
         self.company_var = tk.StringVar()
-        ttk.Combobox(filter_frame, textvariable=self.company_var, values=["", "Meraki", "MICL", "SALES", "EDUCATION", "Steel"], width=15).grid(row=0, column=1, padx=5, pady=5)
+        self.filter_combos["company"] = ttk.Combobox(filter_frame, textvariable=self.company_var, width=15, postcommand=self.refresh_filter_values)
+        self.filter_combos["company"].grid(row=0, column=1, padx=5, pady=5)
         
         tk.Label(filter_frame, text="Location:", bg="#f0f0f0").grid(row=0, column=2, padx=5, pady=5, sticky="w")
         self.location_var = tk.StringVar()
-        ttk.Combobox(filter_frame, textvariable=self.location_var, values=["", "SS7", "SS16", "Majan"], width=15).grid(row=0, column=3, padx=5, pady=5)
+        self.filter_combos["location"] = ttk.Combobox(filter_frame, textvariable=self.location_var, width=15, postcommand=self.refresh_filter_values)
+        self.filter_combos["location"].grid(row=0, column=3, padx=5, pady=5)
         
         tk.Label(filter_frame, text="Category:", bg="#f0f0f0").grid(row=0, column=4, padx=5, pady=5, sticky="w")
         self.category_var = tk.StringVar()
-        ttk.Combobox(filter_frame, textvariable=self.category_var, values=["", "Laptop", "Desktop", "Server", "Printer", "Network", "Mobile", "Other"], width=15).grid(row=0, column=5, padx=5, pady=5)
+        self.filter_combos["category"] = ttk.Combobox(filter_frame, textvariable=self.category_var, width=15, postcommand=self.refresh_filter_values)
+        self.filter_combos["category"].grid(row=0, column=5, padx=5, pady=5)
         
         tk.Label(filter_frame, text="Status:", bg="#f0f0f0").grid(row=1, column=0, padx=5, pady=5, sticky="w")
         self.status_var = tk.StringVar()
-        ttk.Combobox(filter_frame, textvariable=self.status_var, values=["", "Active", "Stock", "Attention"], width=15).grid(row=1, column=1, padx=5, pady=5)
+        self.filter_combos["status"] = ttk.Combobox(filter_frame, textvariable=self.status_var, width=15, postcommand=self.refresh_filter_values)
+        self.filter_combos["status"].grid(row=1, column=1, padx=5, pady=5)
         
         tk.Label(filter_frame, text="Working Status:", bg="#f0f0f0").grid(row=1, column=2, padx=5, pady=5, sticky="w")
         self.working_status_var = tk.StringVar()
-        ttk.Combobox(filter_frame, textvariable=self.working_status_var, values=["", "Working", "Not Working", "Damage", "Under Maintenance"], width=15).grid(row=1, column=3, padx=5, pady=5)
+        self.filter_combos["working_status"] = ttk.Combobox(filter_frame, textvariable=self.working_status_var, width=15, postcommand=self.refresh_filter_values)
+        self.filter_combos["working_status"].grid(row=1, column=3, padx=5, pady=5)
         
         filter_button = tk.Button(
             filter_frame,
@@ -249,6 +262,10 @@ class AssetView(tk.Frame):
         self.context_menu.add_command(label="Edit Asset", command=self.show_edit_asset_dialog)
         self.context_menu.add_command(label="Delete Asset", command=self.delete_asset)
         self.context_menu.add_separator()
+        self.context_menu.add_command(label="Issue Selected...", command=self.issue_selected_assets)
+        self.context_menu.add_command(label="Return Selected to Stock...", command=self.return_selected_assets)
+        self.context_menu.add_command(label="Update Selected...", command=self.update_selected_assets)
+        self.context_menu.add_separator()
         self.context_menu.add_command(label="Generate Issue Form", command=lambda: self.generate_asset_form("issue"))
         self.context_menu.add_command(label="Generate Transfer Form", command=lambda: self.generate_asset_form("transfer"))
         
@@ -749,39 +766,107 @@ class AssetView(tk.Frame):
             print(f"Exception in add_asset_to_database: {error_msg}")
             messagebox.showerror("Error", error_msg)
 
+    @metrics.traced('assets.load')
     def load_assets(self):
         """Load assets into the treeview"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.show_assets(self.fetch_assets(self.asset_type_var.get()))
+    
+    def fetch_assets(self, asset_type):
+        """
+        Get the assets of the selected type
         
-        # Get assets based on selected type
-        asset_type = self.asset_type_var.get()
+        Args:
+            asset_type (str): 'active', 'stock' or 'all'
+        
+        Returns:
+            list: Asset dictionaries
+        """
         if asset_type == "active":
-            assets = self.asset_controller.get_active_assets()
+            return self.asset_controller.get_active_assets()
         elif asset_type == "stock":
-            assets = self.asset_controller.get_stock_assets()
+            return self.asset_controller.get_stock_assets()
         else:
-            assets = self.asset_controller.search_assets()
-        
-        # Add assets to treeview
-        for asset in assets:
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    asset.get("id"),
-                    asset.get("serial_number"),
-                    asset.get("company", ""),
-                    asset.get("location", ""),
-                    asset.get("category", ""),
-                    asset.get("status", ""),
-                    asset.get("username", ""),
-                    asset.get("model", ""),
-                    asset.get("working_status", "")
+            return self.asset_controller.search_assets()
+    
+    def load_assets_in_background(self, on_loaded=None):
+        """
+        Load assets on a worker thread and show them once they arrive
+        
+        Args:
+            on_loaded (function, optional): Called after the assets are shown
+        """
+        asset_type = self.asset_type_var.get()
+        result = queue.Queue()
+        
+        def fetch():
+            try:
+                with metrics.span('assets.load'):
+                    assets = self.fetch_assets(asset_type)
+            except Exception as e:
+                print(f"Error loading assets: {e}")
+                assets = []
+            result.put(assets)
+        
+        self.pending_load = result
+        self.config(cursor="watch")
+        worker = threading.Thread(target=fetch)
+        worker.daemon = True
+        worker.start()
+        
+        self.wait_for_assets(result, on_loaded)
+    
+    def wait_for_assets(self, result, on_loaded):
+        """
+        Poll for the assets of a background load and show them
+        
+        Args:
+            result (queue.Queue): Queue the worker thread puts the assets into
+            on_loaded (function): Called after the assets are shown, or None
+        """
+        # Anything shown in the meantime (search, filters, reload) wins
+        if self.pending_load is not result:
+            return
+        
+        try:
+            assets = result.get_nowait()
+        except queue.Empty:
+            self.after(50, lambda: self.wait_for_assets(result, on_loaded))
+            return
+        
+        self.show_assets(assets)
+        if on_loaded:
+            on_loaded()
+    
+    def show_assets(self, assets):
+        """Replace the treeview contents with a list of assets"""
+        if self.pending_load is not None:
+            self.pending_load = None
+            self.config(cursor="")
+        
+        with metrics.phase('render'):
+            # Clear existing items
+            for item in self.tree.get_children():
+                self.tree.delete(item)
+            
+            # Add assets to treeview
+            for asset in assets:
+                self.tree.insert(
+                    "",
+                    tk.END,
+                    values=(
+                        asset.get("id"),
+                        asset.get("serial_number"),
+                        asset.get("company", ""),
+                        asset.get("location", ""),
+                        asset.get("category", ""),
+                        asset.get("status", ""),
+                        asset.get("username", ""),
+                        asset.get("model", ""),
+                        asset.get("working_status", "")
+                    )
                 )
-            )
     
+    @metrics.traced('assets.search')
     def search_assets(self):
         """Search assets based on search term"""
         search_term = self.search_var.get()
@@ -789,34 +874,21 @@ class AssetView(tk.Frame):
             self.load_assets()
             return
         
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         # Search assets
         filters = {
             "serial_number": search_term
         }
         assets = self.asset_controller.search_assets(filters)
         
-        # Add assets to treeview
-        for asset in assets:
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    asset.get("id"),
-                    asset.get("serial_number"),
-                    asset.get("company", ""),
-                    asset.get("location", ""),
-                    asset.get("category", ""),
-                    asset.get("status", ""),
-                    asset.get("username", ""),
-                    asset.get("model", ""),
-                    asset.get("working_status", "")
-                )
-            )
+        self.show_assets(assets)
+    
+    def refresh_filter_values(self):
+        """Fill the filter lists with the values in use (cached until the data changes)"""
+        values = self.asset_controller.get_filter_values(tuple(self.filter_combos))
+        for field, combo in self.filter_combos.items():
+            combo.configure(values=[""] + [value for value, count in values.get(field, [])])
     
+    @metrics.traced('assets.filter')
     def apply_filters(self):
         """Apply filters to assets"""
         # Build filters dictionary
@@ -837,30 +909,10 @@ class AssetView(tk.Frame):
         if self.working_status_var.get():
             filters["working_status"] = self.working_status_var.get()
         
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         # Get filtered assets
         assets = self.asset_controller.search_assets(filters)
         
-        # Add assets to treeview
-        for asset in assets:
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    asset.get("id"),
-                    asset.get("serial_number"),
-                    asset.get("company", ""),
-                    asset.get("location", ""),
-                    asset.get("category", ""),
-                    asset.get("status", ""),
-                    asset.get("username", ""),
-                    asset.get("model", ""),
-                    asset.get("working_status", "")
-                )
-            )
+        self.show_assets(assets)
     
     def clear_filters(self):
         """Clear all filters"""
@@ -913,13 +965,9 @@ class AssetView(tk.Frame):
     
     def export_to_excel(self):
         """Export assets to Excel"""
-        # Get current assets in the treeview
-        assets = []
-        for item in self.tree.get_children():
-            asset_id = self.tree.item(item, "values")[0]
-            asset = self.asset_controller.get_asset(asset_id)
-            if asset:
-                assets.append(asset)
+        # Get current assets in the treeview (one query instead of one per row)
+        asset_ids = [self.tree.item(item, "values")[0] for item in self.tree.get_children()]
+        assets = self.asset_controller.get_assets(asset_ids)
         
         if not assets:
             messagebox.showinfo("No Assets", "There are no assets to export.")
@@ -974,12 +1022,152 @@ class AssetView(tk.Frame):
     
     def show_context_menu(self, event):
         """Show context menu on right-click"""
-        # Select the item under the cursor
+        # Select the item under the cursor, keeping a multi-selection it belongs to
         item = self.tree.identify_row(event.y)
         if item:
-            self.tree.selection_set(item)
+            if item not in self.tree.selection():
+                self.tree.selection_set(item)
             self.context_menu.post(event.x_root, event.y_root)
     
+    def get_selected_asset_ids(self):
+        """Get the IDs of all selected assets"""
+        return [int(self.tree.item(item, "values")[0]) for item in self.tree.selection()]
+    
+    def ask_bulk_values(self, title, fields):
+        """
+        Ask for values to apply to the selected assets
+        
+        Args:
+            title (str): Dialog title
+            fields (list): (label, options) pairs; options is a list for a combobox or None for a text entry
+        
+        Returns:
+            list: Entered values in field order, or None if cancelled
+        """
+        dialog = tk.Toplevel(self)
+        dialog.title(title)
+        dialog.transient(self)
+        dialog.grab_set()
+        dialog.resizable(False, False)
+        
+        variables = []
+        for row, (label, options) in enumerate(fields):
+            tk.Label(dialog, text=f"{label}:").grid(row=row, column=0, padx=10, pady=5, sticky="w")
+            var = tk.StringVar()
+            if options is None:
+                widget = tk.Entry(dialog, textvariable=var, width=30)
+            else:
+                widget = ttk.Combobox(dialog, textvariable=var, values=options, width=28)
+            widget.grid(row=row, column=1, padx=10, pady=5)
+            variables.append(var)
+        
+        result = []
+        
+        def submit():
+            result.extend(var.get().strip() for var in variables)
+            dialog.destroy()
+        
+        button_frame = tk.Frame(dialog)
+        button_frame.grid(row=len(fields), column=0, columnspan=2, pady=10)
+        tk.Button(button_frame, text="OK", width=10, command=submit).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Cancel", width=10, command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        self.wait_window(dialog)
+        return result or None
+    
+    def show_bulk_results(self, success, message, results):
+        """Report the outcome of a bulk operation"""
+        if not success:
+            messagebox.showerror("Error", message)
+            return
+        
+        failures = [f"Asset {asset_id}: {reason}" for asset_id, ok, reason in results if not ok]
+        if failures:
+            shown = "\n".join(failures[:10])
+            if len(failures) > 10:
+                shown += f"\n... and {len(failures) - 10} more"
+            messagebox.showwarning("Bulk Update", f"{message}\n\n{shown}")
+        else:
+            messagebox.showinfo("Success", message)
+        
+        self.load_assets()
+    
+    def issue_selected_assets(self):
+        """Issue all selected assets to one user"""
+        asset_ids = self.get_selected_asset_ids()
+        if not asset_ids:
+            messagebox.showwarning("No Selection", "Please select the assets to issue")
+            return
+        
+        values = self.ask_bulk_values(
+            f"Issue {len(asset_ids)} Asset(s)",
+            [("Username", None), ("Department", None), ("Designation", None), ("Employee ID", None)]
+        )
+        if not values:
+            return
+        if not values[0]:
+            messagebox.showwarning("Missing Username", "Please enter the user to issue the assets to")
+            return
+        
+        user_data = {
+            "username": values[0],
+            "department": values[1] or None,
+            "designation": values[2] or None,
+            "employee_id": values[3] or None,
+            "issue_date": datetime.now().strftime("%Y-%m-%d")
+        }
+        self.show_bulk_results(
+            *self.asset_controller.bulk_move_to_active({asset_id: user_data for asset_id in asset_ids})
+        )
+    
+    def return_selected_assets(self):
+        """Return all selected assets to stock"""
+        asset_ids = self.get_selected_asset_ids()
+        if not asset_ids:
+            messagebox.showwarning("No Selection", "Please select the assets to return")
+            return
+        
+        values = self.ask_bulk_values(f"Return {len(asset_ids)} Asset(s) to Stock", [("Reason", None)])
+        if values is None:
+            return
+        
+        self.show_bulk_results(*self.asset_controller.bulk_move_to_stock(asset_ids, reason=values[0] or None))
+    
+    def update_selected_assets(self):
+        """Set one field to the same value on all selected assets"""
+        asset_ids = self.get_selected_asset_ids()
+        if not asset_ids:
+            messagebox.showwarning("No Selection", "Please select the assets to update")
+            return
+        
+        # Status is changed by issuing and returning, which check the assets' current status
+        fields = {
+            "Company": "company",
+            "Location": "location",
+            "Category": "category",
+            "Working Status": "working_status",
+            "Condition": "condition",
+            "Department": "department",
+            "Rack/Tray Number": "rack_tray_number",
+            "Service Center": "service_center",
+            "Supplier": "supplier",
+            "Audit": "audit",
+            "Remarks": "remarks"
+        }
+        values = self.ask_bulk_values(
+            f"Update {len(asset_ids)} Asset(s)",
+            [("Field", list(fields)), ("New Value", None)]
+        )
+        if not values:
+            return
+        if values[0] not in fields:
+            messagebox.showwarning("Missing Field", "Please choose the field to update")
+            return
+        
+        self.show_bulk_results(
+            *self.asset_controller.bulk_update_assets({fields[values[0]]: values[1] or None}, asset_ids)
+        )
+    
     def generate_asset_form(self, form_type):
         """Generate an asset form"""
         # Get selected item
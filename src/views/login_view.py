@@ -2,6 +2,8 @@
 Login View for IT Asset Management System
 Handles user authentication interface
 """
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 
@@ -66,7 +68,7 @@ class LoginView(tk.Frame):
         self.password_entry.grid(row=2, column=1, sticky="w", pady=(0, 20))
         
         # Add login button
-        login_button = tk.Button(
+        self.login_button = tk.Button(
             login_frame,
             text="Login",
             font=("Arial", 12),
@@ -76,7 +78,7 @@ class LoginView(tk.Frame):
             pady=5,
             command=self.login
         )
-        login_button.grid(row=3, column=0, columnspan=2, pady=(0, 10))
+        self.login_button.grid(row=3, column=0, columnspan=2, pady=(0, 10))
         
         # Add version information
         version_label = tk.Label(
@@ -104,5 +106,42 @@ class LoginView(tk.Frame):
             messagebox.showerror("Login Error", "Please enter both username and password")
             return
         
-        # Attempt to login
-        self.controller.login(username, password)
+        # Ignore repeated clicks while a login is being verified
+        if str(self.login_button['state']) == tk.DISABLED:
+            return
+        self.login_button.config(state=tk.DISABLED)
+        
+        # Password verification is slow by design, run it off the Tk thread
+        result = queue.Queue()
+        
+        def verify():
+            # Always answer, so the button is re-enabled even if the login fails unexpectedly
+            try:
+                result.put(self.controller.user_controller.login(username, password))
+            except Exception as e:
+                result.put(e)
+        
+        worker = threading.Thread(target=verify)
+        worker.daemon = True
+        worker.start()
+        
+        self.wait_for_login(result)
+    
+    def wait_for_login(self, result):
+        """
+        Poll for the login result and hand it to the application
+        
+        Args:
+            result (queue.Queue): Queue the worker thread puts the user (or the error) into
+        """
+        try:
+            user = result.get_nowait()
+        except queue.Empty:
+            self.after(50, lambda: self.wait_for_login(result))
+            return
+        
+        self.login_button.config(state=tk.NORMAL)
+        if isinstance(user, Exception):
+            messagebox.showerror("Login Error", f"Could not verify the login: {user}")
+            return
+        self.controller.complete_login(user)
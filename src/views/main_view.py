@@ -4,26 +4,28 @@ Central interface after login
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
-from src.views.asset_view import AssetView
-from src.views.report_view import ReportView
-from src.views.user_view import UserView
-from src.views.backup_view import BackupView
 from src.controllers.asset_controller import AssetController
 from src.controllers.report_controller import ReportController
 from src.controllers.user_controller import UserController
 from src.controllers.backup_controller import BackupController
+from src.utils.authorization import authorization, USER_MANAGE, BACKUP_MANAGE
 
 class MainView(tk.Frame):
-    def __init__(self, parent, controller):
+    def __init__(self, parent, controller, on_assets_loaded=None):
         """
         Initialize the main view
         
+        Only the asset view is built here; the other views are built the
+        first time they are shown.
+        
         Args:
             parent: Parent widget
             controller: Application controller
+            on_assets_loaded (function, optional): Called once the asset list has first been filled
         """
         super().__init__(parent)
         self.controller = controller
+        self.on_assets_loaded = on_assets_loaded
         
         # Initialize controllers with current user
         self.asset_controller = AssetController(self.controller.current_user)
@@ -116,7 +118,7 @@ class MainView(tk.Frame):
         self.report_button.pack(fill=tk.X, padx=10, pady=5)
         
         # Users button (only for administrators)
-        if self.controller.current_user.get('role') == 'administrator':
+        if authorization.has_permission(self.controller.current_user, USER_MANAGE):
             self.user_button = tk.Button(
                 nav_frame,
                 text="Users",
@@ -132,7 +134,7 @@ class MainView(tk.Frame):
             self.user_button.pack(fill=tk.X, padx=10, pady=5)
         
         # Backup button (only for administrators)
-        if self.controller.current_user.get('role') == 'administrator':
+        if authorization.has_permission(self.controller.current_user, BACKUP_MANAGE):
             self.backup_button = tk.Button(
                 nav_frame,
                 text="Backups",
@@ -166,16 +168,32 @@ class MainView(tk.Frame):
         self.content_frame = tk.Frame(self, bg="#f0f0f0")
         self.content_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
         
-        # Initialize frames dictionary
+        # Initialize frames dictionary, filled by create_frame()
         self.frames = {}
         
-        # Create frames for each view
-        self.frames["asset"] = AssetView(self.content_frame, self)
-        self.frames["report"] = ReportView(self.content_frame, self)
+    def create_frame(self, frame_name):
+        """
+        Build a view the first time it is shown
+        
+        Args:
+            frame_name (str): Name of the frame to create
         
-        if self.controller.current_user.get('role') == 'administrator':
-            self.frames["user"] = UserView(self.content_frame, self)
-            self.frames["backup"] = BackupView(self.content_frame, self)
+        Returns:
+            tk.Frame: The new view
+        """
+        if frame_name == "asset":
+            from src.views.asset_view import AssetView
+            return AssetView(self.content_frame, self, on_loaded=self.on_assets_loaded)
+        elif frame_name == "report":
+            from src.views.report_view import ReportView
+            return ReportView(self.content_frame, self)
+        elif frame_name == "user" and authorization.has_permission(self.controller.current_user, USER_MANAGE):
+            from src.views.user_view import UserView
+            return UserView(self.content_frame, self)
+        elif frame_name == "backup" and authorization.has_permission(self.controller.current_user, BACKUP_MANAGE):
+            from src.views.backup_view import BackupView
+            return BackupView(self.content_frame, self)
+        raise KeyError(frame_name)
     
     def show_frame(self, frame_name):
         """
@@ -198,7 +216,9 @@ class MainView(tk.Frame):
         if hasattr(self, 'backup_button'):
             self.backup_button.config(bg="#555555")
         
-        # Show the selected frame
+        # Show the selected frame, building it on first use
+        if frame_name not in self.frames:
+            self.frames[frame_name] = self.create_frame(frame_name)
         self.frames[frame_name].pack(fill=tk.BOTH, expand=True)
         
         # Highlight the selected button
@@ -81,45 +81,52 @@ class ReportView(tk.Frame):
         filter_frame = tk.LabelFrame(content_frame, text="Filters", padx=10, pady=10)
         filter_frame.pack(fill=tk.X, pady=10)
         
+        # Filter lists are filled with the values in use when opened
+        self.filter_combos = {}
+        
         # Company filter
         tk.Label(filter_frame, text="Company:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
         self.company_var = tk.StringVar()
-        ttk.Combobox(
+        self.filter_combos["company"] = ttk.Combobox(
             filter_frame, 
             textvariable=self.company_var,
-            values=["", "Meraki", "MICL", "SALES", "EDUCATION", "Steel"],
-            width=15
-        ).grid(row=0, column=1, sticky="w", padx=5, pady=5)
+            width=15,
+            postcommand=self.refresh_filter_values
+        )
+        self.filter_combos["company"].grid(row=0, column=1, sticky="w", padx=5, pady=5)
         
         # Location filter
         tk.Label(filter_frame, text="Location:").grid(row=0, column=2, sticky="w", padx=5, pady=5)
         self.location_var = tk.StringVar()
-        ttk.Combobox(
+        self.filter_combos["location"] = ttk.Combobox(
             filter_frame, 
             textvariable=self.location_var,
-            values=["", "SS7", "SS16", "Majan"],
-            width=15
-        ).grid(row=0, column=3, sticky="w", padx=5, pady=5)
+            width=15,
+            postcommand=self.refresh_filter_values
+        )
+        self.filter_combos["location"].grid(row=0, column=3, sticky="w", padx=5, pady=5)
         
         # Category filter
         tk.Label(filter_frame, text="Category:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
         self.category_var = tk.StringVar()
-        ttk.Combobox(
+        self.filter_combos["category"] = ttk.Combobox(
             filter_frame, 
             textvariable=self.category_var,
-            values=["", "Laptop", "Desktop", "Server", "Printer", "Network", "Mobile", "Other"],
-            width=15
-        ).grid(row=1, column=1, sticky="w", padx=5, pady=5)
+            width=15,
+            postcommand=self.refresh_filter_values
+        )
+        self.filter_combos["category"].grid(row=1, column=1, sticky="w", padx=5, pady=5)
         
         # Status filter
         tk.Label(filter_frame, text="Status:").grid(row=1, column=2, sticky="w", padx=5, pady=5)
         self.status_var = tk.StringVar()
-        ttk.Combobox(
+        self.filter_combos["status"] = ttk.Combobox(
             filter_frame, 
             textvariable=self.status_var,
-            values=["", "Active", "Stock", "Attention"],
-            width=15
-        ).grid(row=1, column=3, sticky="w", padx=5, pady=5)
+            width=15,
+            postcommand=self.refresh_filter_values
+        )
+        self.filter_combos["status"].grid(row=1, column=3, sticky="w", padx=5, pady=5)
         
         # Date range filters
         date_frame = tk.Frame(filter_frame)
@@ -198,6 +205,12 @@ class ReportView(tk.Frame):
         # Populate with sample data (would be replaced with actual data)
         self.load_report_history()
     
+    def refresh_filter_values(self):
+        """Fill the filter lists with the values in use (cached until the data changes)"""
+        values = self.report_controller.get_filter_values(tuple(self.filter_combos))
+        for field, combo in self.filter_combos.items():
+            combo.configure(values=[""] + [value for value, count in values.get(field, [])])
+    
     def generate_report(self):
         """Generate a report based on selected options"""
         # Get report type and export format